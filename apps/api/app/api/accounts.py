@@ -1,26 +1,91 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.api.caching import cached_json
+from app.api.pagination import PageLimit, paginate
+from app.db.session import AsyncDb, get_async_read_db, get_db, get_read_db
 from app.models.account import Account
 from app.models.card import CreditCardDetail
 from app.schemas.account import AccountCreate, AccountRead, CardCreate, CardRead
+from app.schemas.balance import BalanceSeries
+from app.services.balance_history import BUCKETS, DEFAULT_MAX_POINTS, balance_history
+from app.services.data_versions import ACCOUNTS, CARDS, bump_versions
+from app.services.summary import refresh_dashboard_summary
 
 router = APIRouter(prefix="", tags=["accounts"])
 
+MAX_HISTORY_POINTS = 5000
+MAX_HISTORY_ACCOUNTS = 50
+
 
 @router.post("/accounts", response_model=AccountRead)
 def create_account(payload: AccountCreate, db: Session = Depends(get_db)):
     account = Account(**payload.model_dump())
     db.add(account)
+    db.flush()
+    refresh_dashboard_summary(db)
+    bump_versions(db, ACCOUNTS)
     db.commit()
     db.refresh(account)
     return account
 
 
 @router.get("/accounts", response_model=list[AccountRead])
-def list_accounts(db: Session = Depends(get_db)):
-    return db.query(Account).order_by(Account.id.asc()).all()
+async def list_accounts(
+    request: Request,
+    limit: int = PageLimit,
+    after_id: int | None = None,
+    db: AsyncDb = Depends(get_async_read_db),
+):
+    def page(session: Session, response: Response):
+        query = session.query(Account)
+        if after_id is not None:
+            query = query.filter(Account.id > after_id)
+        rows = query.order_by(Account.id.asc()).limit(limit + 1).all()
+        return paginate(response, rows, limit, lambda account: str(account.id))
+
+    return await db.run_query(
+        lambda session: cached_json(request, session, [ACCOUNTS], list[AccountRead], lambda response: page(session, response))
+    )
+
+
+@router.get("/accounts/balances", response_model=list[BalanceSeries])
+def get_balance_histories(
+    account_id: list[int] = Query(min_length=1, max_length=MAX_HISTORY_ACCOUNTS),
+    bucket: str = Query(default="day", pattern=f"^({'|'.join(BUCKETS)})$"),
+    start: date | None = Query(default=None, alias="from"),
+    end: date | None = Query(default=None, alias="to"),
+    max_points: int = Query(default=DEFAULT_MAX_POINTS, ge=3, le=MAX_HISTORY_POINTS),
+    db: Session = Depends(get_read_db),
+):
+    """Balance history for several accounts in one round trip, e.g. for a stacked chart."""
+    account_ids = list(dict.fromkeys(account_id))
+    found = {row[0] for row in db.query(Account.id).filter(Account.id.in_(account_ids))}
+    missing = [account for account in account_ids if account not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Account not found: {missing[0]}")
+    if start and end and end < start:
+        raise HTTPException(status_code=400, detail="`to` must not be before `from`")
+    return balance_history(db, account_ids, bucket, start, end, max_points)
+
+
+@router.get("/accounts/{account_id}/balances", response_model=BalanceSeries)
+def get_balance_history(
+    account_id: int,
+    bucket: str = Query(default="day", pattern=f"^({'|'.join(BUCKETS)})$"),
+    start: date | None = Query(default=None, alias="from"),
+    end: date | None = Query(default=None, alias="to"),
+    max_points: int = Query(default=DEFAULT_MAX_POINTS, ge=3, le=MAX_HISTORY_POINTS),
+    db: Session = Depends(get_read_db),
+):
+    """Last/min/max balance per day, week or month, downsampled to at most max_points."""
+    if db.get(Account, account_id) is None:
+        raise HTTPException(status_code=404, detail="Account not found")
+    if start and end and end < start:
+        raise HTTPException(status_code=400, detail="`to` must not be before `from`")
+    return balance_history(db, [account_id], bucket, start, end, max_points)[0]
 
 
 @router.post("/cards", response_model=CardRead)
@@ -33,11 +98,28 @@ def create_card(payload: CardCreate, db: Session = Depends(get_db)):
 
     card = CreditCardDetail(**payload.model_dump())
     db.add(card)
+    db.flush()
+    refresh_dashboard_summary(db)
+    bump_versions(db, CARDS)
     db.commit()
     db.refresh(card)
     return card
 
 
 @router.get("/cards", response_model=list[CardRead])
-def list_cards(db: Session = Depends(get_db)):
-    return db.query(CreditCardDetail).order_by(CreditCardDetail.id.asc()).all()
+async def list_cards(
+    request: Request,
+    limit: int = PageLimit,
+    after_id: int | None = None,
+    db: AsyncDb = Depends(get_async_read_db),
+):
+    def page(session: Session, response: Response):
+        query = session.query(CreditCardDetail)
+        if after_id is not None:
+            query = query.filter(CreditCardDetail.id > after_id)
+        rows = query.order_by(CreditCardDetail.id.asc()).limit(limit + 1).all()
+        return paginate(response, rows, limit, lambda card: str(card.id))
+
+    return await db.run_query(
+        lambda session: cached_json(request, session, [CARDS], list[CardRead], lambda response: page(session, response))
+    )
@@ -0,0 +1,39 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db, get_read_db
+from app.schemas.analytics import RewardReplayRead, SpendingRow
+from app.services.reward_replay import replay_optimal_cards
+from app.services.spending import SPENDING_DIMENSIONS, spending_summary
+
+router = APIRouter(prefix="", tags=["analytics"])
+
+
+@router.post("/analytics/reward-replay", response_model=RewardReplayRead)
+def reward_replay(persist: bool = Query(default=False), db: Session = Depends(get_db)):
+    """Replay the ledger to find the best card per transaction and the reward missed."""
+    result = replay_optimal_cards(db, persist=persist)
+    if persist:
+        db.commit()
+    return result
+
+
+@router.get("/analytics/spending", response_model=list[SpendingRow])
+def get_spending(
+    group_by: list[str] = Query(default=["category"]),
+    start: date | None = Query(default=None, alias="from"),
+    end: date | None = Query(default=None, alias="to"),
+    account_id: list[int] | None = Query(default=None),
+    category: list[str] | None = Query(default=None),
+    merchant: list[str] | None = Query(default=None),
+    db: Session = Depends(get_read_db),
+):
+    """Spending totals grouped by any of month, account_id, category and merchant, from the rollup."""
+    unknown = [name for name in group_by if name not in SPENDING_DIMENSIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Cannot group by {unknown[0]}; use {', '.join(SPENDING_DIMENSIONS)}")
+    if start and end and end < start:
+        raise HTTPException(status_code=400, detail="`to` must not be before `from`")
+    return spending_summary(db, list(dict.fromkeys(group_by)), start, end, account_id, category, merchant)
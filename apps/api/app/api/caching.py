@@ -0,0 +1,96 @@
+"""ETags and a bounded response cache for read routes backed by versioned data sets.
+
+A cached route costs one data_versions lookup: a matching If-None-Match gets a 304, and
+otherwise the serialized body for (path, query, versions) is served from an LRU, so the
+route's own queries and serialization run only after a writer bumped one of its versions.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.services.data_versions import current_versions
+
+# Headers a route sets on its scratch response that belong to the cached payload.
+_RESPONSE_HEADERS_SKIPPED = {"content-length", "content-type"}
+
+
+class ResponseCache:
+    """Thread-safe LRU of serialized bodies and their extra headers."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[bytes, dict[str, str]]] = OrderedDict()
+
+    def get(self, key: Hashable) -> tuple[bytes, dict[str, str]] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, entry: tuple[bytes, dict[str, str]]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = ResponseCache(get_settings().response_cache_size)
+
+
+@lru_cache(maxsize=None)
+def _adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def cached_json(
+    request: Request,
+    db: Session,
+    depends_on: Iterable[str],
+    model: Any,
+    build: Callable[[Response], Any],
+    vary: Hashable = (),
+) -> Response:
+    """Serve `build(scratch_response)` validated as `model`, cached until a data set in `depends_on` changes.
+
+    `vary` adds inputs other than the query string that change the payload, such as today's date.
+    """
+    versions = current_versions(db, depends_on)
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())), versions, vary)
+    etag = '"' + hashlib.sha1(repr(key).encode()).hexdigest()[:24] + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    entry = response_cache.get(key)
+    if entry is None:
+        scratch = Response()
+        adapter = _adapter(model)
+        body = adapter.dump_json(adapter.validate_python(build(scratch), from_attributes=True))
+        extra = {name: value for name, value in scratch.headers.items() if name not in _RESPONSE_HEADERS_SKIPPED}
+        entry = (body, extra)
+        response_cache.put(key, entry)
+    body, extra = entry
+    return Response(content=body, media_type="application/json", headers={**extra, **headers})
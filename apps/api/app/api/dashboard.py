@@ -1,53 +1,73 @@
-from datetime import date
+from datetime import date, timedelta
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
-from app.models.account import Account
-from app.models.card import CreditCardDetail
-from app.schemas.dashboard import DashboardSummary, DueDateItem
-from app.services.due_dates import resolve_next_due_date
+from app.api.caching import cached_json
+from app.db.session import AsyncDb, get_async_read_db, get_read_db
+from app.schemas.dashboard import DashboardSummary, DueDateItem, NetWorthRead
+from app.services.data_versions import ACCOUNTS, CARDS
+from app.services.due_dates import due_dates_between, upcoming_due_dates
+from app.services.net_worth import net_worth_as_of, net_worth_between
+from app.services.summary import get_dashboard_summary
 
 router = APIRouter(prefix="", tags=["dashboard"])
 
+DEFAULT_DUE_DATE_WINDOW = timedelta(days=90)
+MAX_DUE_DATE_WINDOW = timedelta(days=3 * 366)
+DEFAULT_NET_WORTH_WINDOW = timedelta(days=365)
+
 
 @router.get("/dashboard/summary", response_model=DashboardSummary)
-def get_summary(db: Session = Depends(get_db)):
-    accounts = db.query(Account).all()
-    total_cash = sum(float(a.current_balance) for a in accounts if a.account_type in {"checking", "savings"})
-    total_investments = sum(float(a.current_balance) for a in accounts if a.account_type in {"investment", "retirement"})
-    total_card_debt = sum(abs(float(a.current_balance)) for a in accounts if a.account_type == "credit_card")
-    card_count = db.query(CreditCardDetail).count()
-
-    return DashboardSummary(
-        total_cash=round(total_cash, 2),
-        total_investments=round(total_investments, 2),
-        total_card_debt=round(total_card_debt, 2),
-        upcoming_due_count=card_count,
+async def get_summary(request: Request, db: AsyncDb = Depends(get_async_read_db)):
+    return await db.run_query(
+        lambda session: cached_json(
+            request, session, [ACCOUNTS, CARDS], DashboardSummary, lambda _: get_dashboard_summary(session)
+        )
     )
 
 
+@router.get("/dashboard/net-worth", response_model=NetWorthRead)
+async def get_net_worth(as_of: date | None = None, db: AsyncDb = Depends(get_async_read_db)):
+    """Net worth by bucket as of a day (default today), carrying each account's last snapshot forward."""
+    return await db.run_query(net_worth_as_of, as_of or date.today())
+
+
+@router.get("/dashboard/net-worth/history", response_model=list[NetWorthRead])
+def get_net_worth_history(
+    start: date | None = Query(default=None, alias="from"),
+    end: date | None = Query(default=None, alias="to"),
+    db: Session = Depends(get_read_db),
+):
+    """Net worth on `from` and on each later day up to `to` where it changes; defaults to the last year."""
+    end = end or date.today()
+    start = start or end - DEFAULT_NET_WORTH_WINDOW
+    if end < start:
+        raise HTTPException(status_code=400, detail="`to` must not be before `from`")
+    return net_worth_between(db, start, end)
+
+
 @router.get("/due-dates/upcoming", response_model=list[DueDateItem])
-def get_due_dates(db: Session = Depends(get_db)):
-    cards = db.query(CreditCardDetail).all()
+async def get_due_dates(request: Request, db: AsyncDb = Depends(get_async_read_db)):
     today = date.today()
-    result: list[DueDateItem] = []
-
-    for card in cards:
-        due = resolve_next_due_date(card.due_day, card.due_date_override)
-        days = (due - today).days
-        account = db.query(Account).filter(Account.id == card.account_id).first()
-        if not account:
-            continue
-        result.append(
-            DueDateItem(
-                card_account_id=card.account_id,
-                card_name=account.name,
-                due_date=due,
-                min_payment_due=float(card.min_payment_due),
-                days_remaining=days,
-            )
+    return await db.run(
+        lambda session: cached_json(
+            request, session, [ACCOUNTS, CARDS], list[DueDateItem], lambda _: upcoming_due_dates(session, today), vary=today
         )
+    )
+
 
-    return sorted(result, key=lambda item: item.days_remaining)
+@router.get("/due-dates", response_model=list[DueDateItem])
+def get_due_date_range(
+    start: date | None = Query(default=None, alias="from"),
+    end: date | None = Query(default=None, alias="to"),
+    db: Session = Depends(get_read_db),
+):
+    """All card due dates between `from` and `to` (inclusive); defaults to the next 90 days."""
+    start = start or date.today()
+    end = end or start + DEFAULT_DUE_DATE_WINDOW
+    if end < start:
+        raise HTTPException(status_code=400, detail="`to` must not be before `from`")
+    if end - start > MAX_DUE_DATE_WINDOW:
+        raise HTTPException(status_code=400, detail="Date range is limited to 3 years")
+    return due_dates_between(db, start, end)
@@ -0,0 +1,62 @@
+from datetime import date
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.db.session import ReadSessionLocal
+from app.services.exports import EXPORT_FORMATS, ExportUnavailable, stream_export
+
+router = APIRouter(prefix="", tags=["exports"])
+
+FormatQuery = Query(default="csv", alias="format", pattern=f"^({'|'.join(EXPORT_FORMATS)})$")
+
+
+def _streaming_export(kind: str, export_format: str, **filters) -> StreamingResponse:
+    start, end = filters.get("start"), filters.get("end")
+    if start and end and end < start:
+        raise HTTPException(status_code=400, detail="`to` must not be before `from`")
+    try:
+        body = stream_export(kind, export_format, ReadSessionLocal, **filters)
+    except ExportUnavailable as exc:
+        raise HTTPException(status_code=501, detail=str(exc))
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{kind}.{export_format}"'},
+    )
+
+
+@router.get("/exports/transactions")
+def export_transactions(
+    export_format: str = FormatQuery,
+    account_id: list[int] | None = Query(default=None),
+    start: date | None = Query(default=None, alias="from"),
+    end: date | None = Query(default=None, alias="to"),
+    category: str | None = None,
+    merchant: str | None = None,
+    min_amount: float | None = None,
+    max_amount: float | None = None,
+):
+    """Every matching transaction, oldest first, in the transactions import columns."""
+    return _streaming_export(
+        "transactions",
+        export_format,
+        account_ids=account_id,
+        start=start,
+        end=end,
+        category=category,
+        merchant=merchant,
+        min_amount=min_amount,
+        max_amount=max_amount,
+    )
+
+
+@router.get("/exports/balances")
+def export_balances(
+    export_format: str = FormatQuery,
+    account_id: list[int] | None = Query(default=None),
+    start: date | None = Query(default=None, alias="from"),
+    end: date | None = Query(default=None, alias="to"),
+):
+    """Every matching balance snapshot, oldest first, in the balances import columns."""
+    return _streaming_export("balances", export_format, account_ids=account_id, start=start, end=end)
@@ -1,19 +1,50 @@
-from fastapi import APIRouter, Depends, File, Form, UploadFile
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 
-from app.db.session import get_db
-from app.schemas.imports import ImportJobRead
-from app.services.csv_import import process_csv_import
+from app.db.session import AsyncDb, get_async_db
+from app.models.import_job import ImportJob
+from app.schemas.imports import ImportJobRead, ImportValidationReport
+from app.services.csv_import import IMPORT_TYPES, create_import_job, dry_run_csv_import
+from app.services.import_worker import spool_upload, submit_import
 
 router = APIRouter(prefix="", tags=["imports"])
 
 
-@router.post("/imports/csv", response_model=ImportJobRead)
+@router.post("/imports/csv", response_model=ImportJobRead, status_code=202)
 async def import_csv(
     file: UploadFile = File(...),
     import_type: str = Form(...),
     source_name: str = Form(default="manual_upload"),
-    db: Session = Depends(get_db),
+    db: AsyncDb = Depends(get_async_db),
 ):
-    payload = await file.read()
-    return process_csv_import(db=db, content=payload, import_type=import_type, source_name=source_name)
+    """Spool the upload to disk and queue it; poll GET /imports/{id} for progress."""
+    if import_type not in IMPORT_TYPES:
+        raise HTTPException(status_code=400, detail="import_type must be balances or transactions")
+    path = await run_in_threadpool(spool_upload, file.file)
+    try:
+        job = await db.run_query(create_import_job, import_type, source_name)
+        submit_import(job.id, path)
+    except Exception:
+        # The worker only takes ownership of the file once the job is queued.
+        path.unlink(missing_ok=True)
+        raise
+    return job
+
+
+@router.post("/imports/csv/dry-run", response_model=ImportValidationReport)
+async def dry_run_import_csv(file: UploadFile = File(...), import_type: str = Form(...)):
+    """Validate a CSV and report rejected rows without writing anything."""
+    if import_type not in IMPORT_TYPES:
+        raise HTTPException(status_code=400, detail="import_type must be balances or transactions")
+    try:
+        return await run_in_threadpool(dry_run_csv_import, file.file, import_type)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/imports/{job_id}", response_model=ImportJobRead)
+async def get_import(job_id: int, db: AsyncDb = Depends(get_async_db)):
+    job = await db.run_query(lambda session: session.get(ImportJob, job_id))
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+
+from app.api.pagination import PageLimit, paginate
+from app.db.session import get_db, get_read_db
+from app.db.upsert import upsert
+from app.models.merchant_rule import MerchantRule
+from app.schemas.merchant_rule import MerchantRuleBatch, MerchantRuleCreate, MerchantRuleRead, RecategorizeResult
+from app.services.data_versions import MERCHANT_RULES, TRANSACTIONS, bump_versions
+from app.services.categorizer import merchant_rule_index, normalize_pattern, recategorize_transactions
+
+router = APIRouter(prefix="", tags=["merchant-rules"])
+
+
+def _rule_values(payload: MerchantRuleCreate) -> dict:
+    pattern = normalize_pattern(payload.pattern)
+    if not pattern:
+        raise HTTPException(status_code=400, detail="Pattern must contain letters or digits")
+    category = payload.category.strip().lower() if payload.category else None
+    return {"pattern": pattern, "merchant": payload.merchant.strip(), "category": category or None, "priority": payload.priority}
+
+
+@router.post("/merchant-rules", response_model=MerchantRuleRead)
+def create_merchant_rule(payload: MerchantRuleCreate, db: Session = Depends(get_db)):
+    values = _rule_values(payload)
+    if db.query(MerchantRule.id).filter(MerchantRule.pattern == values["pattern"]).first():
+        raise HTTPException(status_code=409, detail=f"A rule for '{values['pattern']}' already exists")
+    rule = MerchantRule(**values)
+    db.add(rule)
+    bump_versions(db, MERCHANT_RULES)
+    db.commit()
+    db.refresh(rule)
+    merchant_rule_index.invalidate()
+    return rule
+
+
+@router.put("/merchant-rules")
+def load_merchant_rules(payload: MerchantRuleBatch, db: Session = Depends(get_db)):
+    """Create or replace rules in bulk, keyed on the normalized pattern."""
+    rows = {values["pattern"]: values for values in map(_rule_values, payload.items)}
+    upsert(db, MerchantRule.__table__, list(rows.values()), ["pattern"], ["merchant", "category", "priority"])
+    bump_versions(db, MERCHANT_RULES)
+    db.commit()
+    merchant_rule_index.invalidate()
+    return {"rules": len(rows), "message": "rules_loaded"}
+
+
+@router.get("/merchant-rules", response_model=list[MerchantRuleRead])
+def list_merchant_rules(
+    response: Response,
+    limit: int = PageLimit,
+    after_id: int | None = None,
+    db: Session = Depends(get_read_db),
+):
+    query = db.query(MerchantRule)
+    if after_id is not None:
+        query = query.filter(MerchantRule.id > after_id)
+    rows = query.order_by(MerchantRule.id.asc()).limit(limit + 1).all()
+    return paginate(response, rows, limit, lambda rule: str(rule.id))
+
+
+@router.delete("/merchant-rules/{rule_id}", status_code=204)
+def delete_merchant_rule(rule_id: int, db: Session = Depends(get_db)):
+    rule = db.get(MerchantRule, rule_id)
+    if rule is None:
+        raise HTTPException(status_code=404, detail="Merchant rule not found")
+    db.delete(rule)
+    bump_versions(db, MERCHANT_RULES)
+    db.commit()
+    merchant_rule_index.invalidate()
+    return Response(status_code=204)
+
+
+@router.post("/merchant-rules/recategorize", response_model=RecategorizeResult)
+def recategorize(overwrite: bool = Query(default=False), db: Session = Depends(get_db)):
+    """Re-run the rules over every stored transaction; overwrite=true also replaces existing values."""
+    result = recategorize_transactions(db, overwrite=overwrite)
+    if result["transactions_updated"]:
+        bump_versions(db, TRANSACTIONS)
+    db.commit()
+    return result
@@ -0,0 +1,41 @@
+import base64
+import binascii
+from collections.abc import Callable, Sequence
+from datetime import date
+from typing import TypeVar
+
+from fastapi import HTTPException, Query, Response
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+PageLimit = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+
+
+def encode_date_cursor(day: date, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{day.isoformat()}:{row_id}".encode()).decode().rstrip("=")
+
+
+def decode_date_cursor(cursor: str) -> tuple[date, int]:
+    """Inverse of encode_date_cursor; a malformed cursor is the client's error, not ours."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        day, row_id = raw.split(":")
+        return date.fromisoformat(day), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
+def paginate(response: Response, rows: Sequence[T], limit: int, cursor_for: Callable[[T], str]) -> Sequence[T]:
+    """Trim a page fetched with limit + 1 rows and advertise the next cursor, if any.
+
+    Clients keep following X-Next-Cursor until the header is absent.
+    """
+    if len(rows) <= limit:
+        return rows
+    page = rows[:limit]
+    response.headers[NEXT_CURSOR_HEADER] = cursor_for(page[-1])
+    return page
@@ -8,6 +8,7 @@ from app.services.plaid_provider import (
     create_link_token,
     exchange_public_token,
     sync_plaid_accounts,
+    sync_plaid_transactions,
 )
 
 router = APIRouter(prefix="", tags=["plaid"])
@@ -56,6 +57,17 @@ def sync_accounts(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/plaid/transactions/sync")
+def sync_transactions(db: Session = Depends(get_db)):
+    """Apply transaction changes since each linked item's last sync cursor."""
+    if not get_settings().plaid_enabled:
+        raise HTTPException(status_code=503, detail="Plaid is not configured.")
+    try:
+        return sync_plaid_transactions(db)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/plaid/status")
 def plaid_status():
     """Check if Plaid integration is enabled."""
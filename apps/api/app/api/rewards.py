@@ -1,30 +1,55 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
-from app.models.reward import RewardRule
-from app.schemas.reward import RecommendationRead, RewardRuleCreate
-from app.services.recommendation import get_best_card_for_category
+from app.db.session import get_db, get_read_db
+from app.models.reward import Offer, RewardRule
+from app.schemas.reward import OfferCreate, RecommendationBatchRequest, RecommendationRead, RewardRuleCreate
+from app.services.data_versions import REWARDS, bump_versions
+from app.services.recommendation import get_best_card_for_category, get_best_cards, reward_index
 
 router = APIRouter(prefix="", tags=["rewards"])
 
 
 @router.post("/rewards/rules")
 def create_reward_rule(payload: RewardRuleCreate, db: Session = Depends(get_db)):
-    rule = RewardRule(**payload.model_dump(), category=payload.category.strip().lower())
+    rule = RewardRule(**payload.model_dump(exclude={"category"}), category=payload.category.strip().lower())
     db.add(rule)
+    bump_versions(db, REWARDS)
     db.commit()
     db.refresh(rule)
+    reward_index.refresh(db, [rule.category])
     return {"id": rule.id, "message": "rule_created"}
 
 
+@router.post("/rewards/offers")
+def create_offer(payload: OfferCreate, db: Session = Depends(get_db)):
+    category = payload.category.strip().lower() if payload.category else None
+    offer = Offer(**payload.model_dump(exclude={"category"}), category=category)
+    db.add(offer)
+    bump_versions(db, REWARDS)
+    db.commit()
+    db.refresh(offer)
+    if category:
+        reward_index.refresh(db, [category])
+    else:
+        # A catch-all offer changes every category the card has rules for.
+        reward_index.invalidate()
+    return {"id": offer.id, "message": "offer_created"}
+
+
 @router.get("/recommendations/best-card", response_model=RecommendationRead)
 def best_card(
     category: str = Query(..., min_length=2),
     amount: float = Query(default=100.0, gt=0),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     recommendation = get_best_card_for_category(db, category=category, amount=amount)
     if not recommendation:
         raise HTTPException(status_code=404, detail="No reward rules found for this category")
     return recommendation
+
+
+@router.post("/recommendations/best-card/batch", response_model=list[RecommendationRead | None])
+def best_card_batch(payload: RecommendationBatchRequest, db: Session = Depends(get_read_db)):
+    """Score many (category, amount) pairs at once; results follow input order, null where no rule matches."""
+    return get_best_cards(db, [(item.category, item.amount) for item in payload.items])
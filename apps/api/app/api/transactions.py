@@ -0,0 +1,72 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import and_, or_, select
+
+from app.api.pagination import PageLimit, decode_date_cursor, encode_date_cursor, paginate
+from app.db.session import AsyncDb, get_async_read_db
+from app.models.transaction import Transaction
+from app.schemas.transaction import TransactionRead
+from app.services.search import search_transactions
+
+router = APIRouter(prefix="", tags=["transactions"])
+
+MAX_SEARCH_RESULTS = 200
+
+
+@router.get("/transactions", response_model=list[TransactionRead])
+async def list_transactions(
+    response: Response,
+    limit: int = PageLimit,
+    cursor: str | None = None,
+    account_id: int | None = None,
+    category: str | None = None,
+    merchant: str | None = None,
+    start: date | None = Query(default=None, alias="from"),
+    end: date | None = Query(default=None, alias="to"),
+    min_amount: float | None = None,
+    max_amount: float | None = None,
+    db: AsyncDb = Depends(get_async_read_db),
+):
+    """Newest first, keyset-paginated on (transaction_date, id) so deep pages cost the same as the first."""
+    if start and end and end < start:
+        raise HTTPException(status_code=400, detail="`to` must not be before `from`")
+
+    statement = select(Transaction)
+    if account_id is not None:
+        statement = statement.where(Transaction.account_id == account_id)
+    if category:
+        statement = statement.where(Transaction.category == category)
+    if merchant:
+        statement = statement.where(Transaction.merchant == merchant)
+    if start:
+        statement = statement.where(Transaction.transaction_date >= start)
+    if end:
+        statement = statement.where(Transaction.transaction_date <= end)
+    if min_amount is not None:
+        statement = statement.where(Transaction.amount >= min_amount)
+    if max_amount is not None:
+        statement = statement.where(Transaction.amount <= max_amount)
+    if cursor:
+        day, row_id = decode_date_cursor(cursor)
+        statement = statement.where(
+            or_(
+                Transaction.transaction_date < day,
+                and_(Transaction.transaction_date == day, Transaction.id < row_id),
+            )
+        )
+
+    statement = statement.order_by(Transaction.transaction_date.desc(), Transaction.id.desc()).limit(limit + 1)
+    rows = await db.run_query(lambda session: session.scalars(statement).all())
+    return paginate(response, rows, limit, lambda txn: encode_date_cursor(txn.transaction_date, txn.id))
+
+
+@router.get("/transactions/search", response_model=list[TransactionRead])
+async def search(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=50, ge=1, le=MAX_SEARCH_RESULTS),
+    account_id: int | None = None,
+    db: AsyncDb = Depends(get_async_read_db),
+):
+    """Ranked full-text matches on description, merchant and notes; `blue bot` finds "Blue Bottle"."""
+    return await db.run_query(search_transactions, q, limit, account_id)
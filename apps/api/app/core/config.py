@@ -5,13 +5,44 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     project_name: str = "Account Manager API"
     database_url: str = "sqlite:///./account_manager.db"
+    # Read-only replica for dashboard and listing routes; reads use the primary when unset
+    read_database_url: str | None = None
     cors_origins: str = "http://localhost:5173"
+    # Serve async routes through an AsyncEngine (aiosqlite / psycopg async) instead of worker threads
+    async_database: bool = False
+
+    # Connection pools (per engine) and statement caching
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0  # seconds to wait for a pooled connection
+    db_pool_recycle: int = 1800  # seconds before a connection is replaced
+    db_query_cache_size: int = 500  # compiled SQL kept by SQLAlchemy per engine
+    db_prepare_threshold: int | None = 5  # psycopg: server-side prepare after N executions; None disables
+
+    # SQLite file databases: WAL so reads don't wait on imports, and a separate read-only pool
+    sqlite_wal: bool = True
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_read_pool_size: int = 8
+
+    # Requests running more SQL statements than this are logged and counted as likely N+1s (see /metrics)
+    query_budget: int = 20
+
+    # Serialized GET responses kept per (route, query, data versions); see app/api/caching.py
+    response_cache_size: int = 512
+
+    # CSV imports run on a background pool from files spooled to disk
+    import_workers: int = 2
+    import_spool_dir: str | None = None  # defaults to <tmp>/account_manager_imports
 
     # Plaid (optional - set to enable bank linking)
     plaid_client_id: str | None = None
     plaid_secret: str | None = None
     plaid_env: str = "sandbox"  # sandbox | development | production
     plaid_encryption_key: str | None = None  # base64 Fernet key for encrypting access tokens
+    plaid_sync_concurrency: int = 8  # items fetched in parallel; also the HTTP pool size
+    plaid_request_timeout: float = 15.0  # seconds per Plaid HTTP call
+    plaid_max_retries: int = 3  # retries for 429/5xx/network errors, with exponential backoff
 
     @property
     def plaid_enabled(self) -> bool:
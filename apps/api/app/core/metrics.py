@@ -0,0 +1,280 @@
+"""In-process request, database and job metrics, exported in the Prometheus text format.
+
+MetricsMiddleware times every request under its route template and, through SQLAlchemy engine
+events, counts the statements and database time it caused. Requests over the query budget
+(likely N+1s) are counted and logged. Import and Plaid sync code report their throughput here,
+and pool gauges are read from the engines at scrape time. No client library is needed: the
+handful of counters and histograms below render themselves for GET /metrics.
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name, self.help, self.label_names = name, help, labels
+        self._values: dict[tuple, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] += amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, labels)} {_number(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    def set(self, *labels, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], buckets: tuple[float, ...]):
+        self.name, self.help, self.label_names, self.buckets = name, help, labels, buckets
+        # per label set: [count per bucket (last is +Inf)], sum
+        self._series: dict[tuple, tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels) -> None:
+        with self._lock:
+            counts, total = self._series.setdefault(labels, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[bisect_left(self.buckets, value)] += 1
+            total[0] += value
+
+    def count(self, *labels) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, "+Inf"), counts):
+                    cumulative += count
+                    le = f'le="{bound if bound == "+Inf" else _number(bound)}"'
+                    lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(round(total[0], 6))}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template.",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+REQUEST_STATEMENTS = Histogram(
+    "http_request_db_statements", "SQL statements executed per request.", ("method", "route"), STATEMENT_BUCKETS
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time spent executing SQL per request.", ("method", "route"), LATENCY_BUCKETS
+)
+OVER_QUERY_BUDGET = Counter(
+    "http_requests_over_query_budget_total",
+    "Requests that ran more SQL statements than the budget (likely N+1).",
+    ("method", "route"),
+)
+DB_STATEMENTS = Counter("db_statements_total", "SQL statements executed, including background work.", ("engine",))
+DB_SECONDS = Counter("db_statement_seconds_total", "Time spent executing SQL, including background work.", ("engine",))
+POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Connections handed out by the pool.", ("engine",))
+POOL_CONNECTS = Counter("db_pool_connections_opened_total", "New DBAPI connections opened by the pool.", ("engine",))
+IMPORT_JOBS = Counter("import_jobs_total", "Finished CSV import jobs.", ("import_type", "status"))
+IMPORT_ROWS = Counter("import_rows_total", "Rows written by CSV imports.", ("import_type",))
+IMPORT_SECONDS = Counter("import_seconds_total", "Wall time of CSV import jobs.", ("import_type",))
+IMPORT_LAST_RATE = Gauge("import_last_rows_per_second", "Throughput of the most recent import.", ("import_type",))
+SYNC_RUNS = Counter("plaid_sync_runs_total", "Plaid sync runs.", ("kind",))
+SYNC_ITEMS = Counter("plaid_sync_items_total", "Plaid items processed by sync runs.", ("kind", "outcome"))
+SYNC_SECONDS = Counter("plaid_sync_seconds_total", "Wall time of Plaid sync runs.", ("kind",))
+SYNC_CHANGES = Counter("plaid_sync_transactions_total", "Transaction changes applied from Plaid.", ("change",))
+POOL_GAUGES = {
+    "size": "db_pool_size",
+    "checkedout": "db_pool_checked_out",
+    "checkedin": "db_pool_checked_in",
+    "overflow": "db_pool_overflow",
+}
+
+METRICS = (
+    REQUEST_SECONDS,
+    REQUEST_STATEMENTS,
+    REQUEST_DB_SECONDS,
+    OVER_QUERY_BUDGET,
+    DB_STATEMENTS,
+    DB_SECONDS,
+    POOL_CHECKOUTS,
+    POOL_CONNECTS,
+    IMPORT_JOBS,
+    IMPORT_ROWS,
+    IMPORT_SECONDS,
+    IMPORT_LAST_RATE,
+    SYNC_RUNS,
+    SYNC_ITEMS,
+    SYNC_SECONDS,
+    SYNC_CHANGES,
+)
+
+
+@dataclass
+class RequestStats:
+    statements: int = 0
+    db_seconds: float = 0.0
+
+
+# Set per request by the middleware. Threadpool and run_sync calls copy the context, so they
+# share the same RequestStats object; work outside a request (import workers) sees None.
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+_engines: dict[str, Engine] = {}
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Count statements, DB time and pool activity on `engine` under the given label."""
+    if name in _engines or engine in _engines.values():
+        return
+    _engines[name] = engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, _cursor, _statement, _parameters, _context, _executemany):
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(conn, _cursor, _statement, _parameters, _context, _executemany):
+        elapsed = time.perf_counter() - conn.info["metrics_started"].pop()
+        DB_STATEMENTS.inc(name)
+        DB_SECONDS.inc(name, amount=elapsed)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _failed(context):
+        started = context.connection.info.get("metrics_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+    event.listen(engine.pool, "checkout", lambda *_args: POOL_CHECKOUTS.inc(name))
+    event.listen(engine.pool, "connect", lambda *_args: POOL_CONNECTS.inc(name))
+
+
+def record_import(import_type: str, status: str, rows: int, seconds: float) -> None:
+    IMPORT_JOBS.inc(import_type, status)
+    IMPORT_ROWS.inc(import_type, amount=rows)
+    IMPORT_SECONDS.inc(import_type, amount=seconds)
+    if seconds > 0:
+        IMPORT_LAST_RATE.set(import_type, value=rows / seconds)
+
+
+def record_sync(kind: str, synced: int, failed: int, seconds: float, changes: dict[str, int] | None = None) -> None:
+    SYNC_RUNS.inc(kind)
+    SYNC_ITEMS.inc(kind, "ok", amount=synced)
+    SYNC_ITEMS.inc(kind, "error", amount=failed)
+    SYNC_SECONDS.inc(kind, amount=seconds)
+    for change, count in (changes or {}).items():
+        SYNC_CHANGES.inc(change, amount=count)
+
+
+def _pool_lines() -> list[str]:
+    lines = []
+    for attribute, metric in POOL_GAUGES.items():
+        lines += [f"# HELP {metric} Connection pool {attribute} at scrape time.", f"# TYPE {metric} gauge"]
+        for name, engine in sorted(_engines.items()):
+            reading = getattr(engine.pool, attribute, None)
+            if callable(reading):
+                lines.append(f'{metric}{{engine="{name}"}} {reading()}')
+    return lines
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in METRICS:
+        lines += metric.render()
+    lines += _pool_lines()
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Pure ASGI, so streamed responses are timed to their last chunk and never buffered."""
+
+    def __init__(self, app, query_budget: int):
+        self.app = app
+        self.query_budget = query_budget
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_stats.reset(token)
+            elapsed = time.perf_counter() - started
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            REQUEST_SECONDS.observe(elapsed, method, route, status)
+            REQUEST_STATEMENTS.observe(stats.statements, method, route)
+            REQUEST_DB_SECONDS.observe(stats.db_seconds, method, route)
+            if stats.statements > self.query_budget:
+                OVER_QUERY_BUDGET.inc(method, route)
+                logger.warning(
+                    "%s %s ran %d SQL statements (budget %d); likely N+1",
+                    method,
+                    route,
+                    stats.statements,
+                    self.query_budget,
+                )
@@ -1,10 +1,13 @@
 from app.models.account import Account, Institution
 from app.models.balance import BalanceSnapshot
 from app.models.card import CreditCardDetail
+from app.models.data_version import DataVersion
 from app.models.import_job import ImportJob
-from app.models.offer import Offer
+from app.models.merchant_rule import MerchantRule
 from app.models.plaid_item import PlaidItem
-from app.models.reward import Recommendation, RewardProgram, RewardRule
+from app.models.reward import Offer, Recommendation, RewardProgram, RewardRule
+from app.models.rollup import DashboardSummaryRollup, NetWorthDaily, SpendingRollup
+from app.models.schema_migration import SchemaMigration
 from app.models.transaction import Transaction
 
 __all__ = [
@@ -19,4 +22,10 @@ __all__ = [
     "Recommendation",
     "ImportJob",
     "PlaidItem",
+    "MerchantRule",
+    "DashboardSummaryRollup",
+    "DataVersion",
+    "NetWorthDaily",
+    "SpendingRollup",
+    "SchemaMigration",
 ]
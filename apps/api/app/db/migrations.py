@@ -0,0 +1,101 @@
+"""Versioned schema management.
+
+Every file in apps/api/migrations is recorded in `schema_migrations` once applied, so a warm
+start costs one query. On Postgres the pending SQL files run in order, each in its own
+transaction. SQLite can't run those files (they use Postgres types and syntax), so there the
+models are the source of truth: missing tables, columns and indexes are created from
+`Base.metadata`, the Python counterparts of the data steps in SQLITE_DATA_MIGRATIONS run, and
+the pending versions are marked as applied.
+"""
+
+import logging
+from pathlib import Path
+
+from sqlalchemy import Engine, inspect, insert, select
+from sqlalchemy.schema import CreateColumn
+
+from app.db import base  # noqa: F401 - registers every model on Base.metadata
+from app.models.base import Base
+from app.models.schema_migration import SchemaMigration
+from app.services.fingerprint import backfill_fingerprints
+from app.services.search import ensure_search_index
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+# Serializes migration runs when several API containers boot at once.
+POSTGRES_LOCK_ID = 7_316_021
+# Versions whose SQL file also rewrites existing rows; on SQLite these run after the schema sync.
+SQLITE_DATA_MIGRATIONS = {"005_transaction_fingerprints": backfill_fingerprints}
+
+
+def migration_files(directory: Path = MIGRATIONS_DIR) -> dict[str, Path]:
+    """Version (file stem, e.g. `001_init`) -> path, in apply order."""
+    return {path.stem: path for path in sorted(directory.glob("*.sql"))}
+
+
+def pending_migrations(engine: Engine, directory: Path = MIGRATIONS_DIR) -> list[str]:
+    files = migration_files(directory)
+    if not inspect(engine).has_table(SchemaMigration.__tablename__):
+        return list(files)
+    with engine.connect() as connection:
+        applied = set(connection.scalars(select(SchemaMigration.version)))
+    return [version for version in files if version not in applied]
+
+
+def run_migrations(engine: Engine, directory: Path = MIGRATIONS_DIR) -> list[str]:
+    """Bring the schema up to date; returns the versions applied (empty on a warm start)."""
+    pending = pending_migrations(engine, directory)
+    if not pending:
+        return []
+    if engine.dialect.name == "postgresql":
+        applied = _apply_sql_files(engine, migration_files(directory), pending)
+    else:
+        _sync_schema_from_models(engine)
+        with engine.begin() as connection:
+            for version in pending:
+                if version in SQLITE_DATA_MIGRATIONS:
+                    SQLITE_DATA_MIGRATIONS[version](connection)
+            connection.execute(insert(SchemaMigration), [{"version": version} for version in pending])
+        applied = pending
+    ensure_search_index(engine)
+    logger.info("Applied schema migrations: %s", ", ".join(applied) or "none")
+    return applied
+
+
+def _apply_sql_files(engine: Engine, files: dict[str, Path], pending: list[str]) -> list[str]:
+    applied = []
+    SchemaMigration.__table__.create(engine, checkfirst=True)
+    for version in pending:
+        with engine.begin() as connection:
+            connection.exec_driver_sql(f"SELECT pg_advisory_xact_lock({POSTGRES_LOCK_ID})")
+            done = connection.scalar(select(SchemaMigration.version).where(SchemaMigration.version == version))
+            if done:  # another instance got there first
+                continue
+            # The driver cursor takes the file as-is: several statements, no bind parameters.
+            with connection.connection.cursor() as cursor:
+                cursor.execute(files[version].read_text())
+            connection.execute(insert(SchemaMigration).values(version=version))
+            applied.append(version)
+    return applied
+
+
+def _sync_schema_from_models(engine: Engine) -> None:
+    """create_all plus what it skips on existing tables: new columns and new indexes."""
+    Base.metadata.create_all(bind=engine)
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                if column.primary_key or (not column.nullable and column.server_default is None):
+                    raise RuntimeError(
+                        f"Cannot add {table.name}.{column.name} to an existing SQLite table: "
+                        "it needs to be nullable or have a server default"
+                    )
+                ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
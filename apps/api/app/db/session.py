@@ -1,19 +1,140 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from collections.abc import Callable
+from typing import Any, TypeVar
 
-from app.core.config import get_settings
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import Settings, get_settings
 
 settings = get_settings()
 
-# SQLite needs check_same_thread=False for FastAPI
-connect_args = {} if "sqlite" not in settings.database_url else {"check_same_thread": False}
-engine = create_engine(
-    settings.database_url,
-    connect_args=connect_args,
-    pool_pre_ping="sqlite" not in settings.database_url,
-)
+T = TypeVar("T")
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _is_sqlite_file(url: str) -> bool:
+    return _is_sqlite(url) and ":memory:" not in url and not url.rstrip("/").endswith(":")
+
+
+def engine_options(url: str, settings: Settings) -> dict:
+    """Pool and statement-cache settings shared by the write, read and async engines."""
+    options: dict[str, Any] = {"query_cache_size": settings.db_query_cache_size}
+    if _is_sqlite(url):
+        # SQLite needs check_same_thread=False for FastAPI
+        options["connect_args"] = {"check_same_thread": False}
+        if not _is_sqlite_file(url):
+            return options
+    else:
+        options["pool_pre_ping"] = True
+        # psycopg prepares a statement server-side after this many executions (0 = always, None = never).
+        options["connect_args"] = {"prepare_threshold": settings.db_prepare_threshold}
+    options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    return options
+
+
+def configure_sqlite(engine, settings: Settings, read_only: bool = False) -> None:
+    """Per-connection pragmas: WAL lets readers run while an import holds the write lock."""
+    if not _is_sqlite_file(str(engine.url)):
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, _record):
+        cursor = dbapi_connection.cursor()
+        if settings.sqlite_wal:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+
+engine = create_engine(settings.database_url, **engine_options(settings.database_url, settings))
+configure_sqlite(engine, settings)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Reads go to a replica when one is configured. On a SQLite file they get their own
+# query_only connection pool, so dashboards keep reading from the WAL during imports.
+read_database_url = settings.read_database_url or settings.database_url
+if settings.read_database_url or _is_sqlite_file(settings.database_url):
+    read_options = engine_options(read_database_url, settings)
+    if _is_sqlite(read_database_url):
+        read_options["pool_size"] = settings.sqlite_read_pool_size
+    read_engine = create_engine(read_database_url, **read_options)
+    configure_sqlite(read_engine, settings, read_only=True)
+else:
+    read_engine = engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+
+def async_database_url(url: str) -> str:
+    """The async-driver form of a sync URL: aiosqlite for SQLite, psycopg's async mode for Postgres."""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith(("postgresql:", "postgres:")):
+        return "postgresql+psycopg:" + url.split(":", 1)[1]
+    return url
+
+
+def _async_sessionmaker(url: str, read_only: bool = False):
+    # Imported lazily so aiosqlite is only needed when the async engine is switched on.
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(async_database_url(url), **engine_options(url, settings))
+    configure_sqlite(async_engine.sync_engine, settings, read_only=read_only)
+    return async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+AsyncSessionLocal = None
+AsyncReadSessionLocal = None
+if settings.async_database:
+    AsyncSessionLocal = _async_sessionmaker(settings.database_url)
+    AsyncReadSessionLocal = (
+        _async_sessionmaker(read_database_url, read_only=True) if read_engine is not engine else AsyncSessionLocal
+    )
+
+
+class AsyncDb:
+    """Runs Session-based service code from async routes without blocking the event loop.
+
+    Services stay written against a plain Session. `run_query` is for thin work, a few statements
+    and little Python: with ASYNC_DATABASE on, it goes through AsyncSession.run_sync, so the
+    SQL is awaited on the async driver. The Python in between still runs on the event loop
+    thread, so anything CPU-bound (NumPy, large result sets) goes through `run` instead,
+    which always uses a worker thread and a regular Session, exactly like a sync route.
+    """
+
+    def __init__(self, async_session=None, session_factory: Callable[[], Session] = SessionLocal) -> None:
+        self._async_session = async_session
+        self._session_factory = session_factory
+        self._session: Session | None = None
+
+    async def run_query(self, work: Callable[..., T], *args: Any) -> T:
+        if self._async_session is not None:
+            return await self._async_session.run_sync(work, *args)
+        return await self.run(work, *args)
+
+    async def run(self, work: Callable[..., T], *args: Any) -> T:
+        if self._session is None:
+            self._session = self._session_factory()
+        return await run_in_threadpool(work, self._session, *args)
+
+    async def close(self) -> None:
+        if self._async_session is not None:
+            await self._async_session.close()
+        if self._session is not None:
+            await run_in_threadpool(self._session.close)
+
 
 def get_db():
     db = SessionLocal()
@@ -21,3 +142,28 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Session for routes that only read; may lag the primary when a replica is configured."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    db = AsyncDb(AsyncSessionLocal() if AsyncSessionLocal is not None else None)
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def get_async_read_db():
+    db = AsyncDb(AsyncReadSessionLocal() if AsyncReadSessionLocal is not None else None, ReadSessionLocal)
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -0,0 +1,34 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+UPSERT_BATCH_SIZE = 5000
+
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def upsert(
+    db: Session,
+    table,
+    rows: list[dict],
+    index_elements: list[str],
+    update_columns: list[str],
+    increment_columns: list[str] = (),
+) -> None:
+    """INSERT ... ON CONFLICT (index_elements) DO UPDATE in executemany batches.
+
+    `update_columns` are overwritten from the incoming row and `increment_columns` have
+    the incoming value added to them (for additive rollups); when both are empty,
+    existing rows are left untouched (DO NOTHING).
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect not in _DIALECT_INSERTS:
+        raise NotImplementedError(f"Upsert is not supported on {dialect}")
+    statement = _DIALECT_INSERTS[dialect](table)
+    if update_columns or increment_columns:
+        set_ = {column: statement.excluded[column] for column in update_columns}
+        set_.update({column: table.c[column] + statement.excluded[column] for column in increment_columns})
+        statement = statement.on_conflict_do_update(index_elements=index_elements, set_=set_)
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=index_elements)
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        db.execute(statement, rows[start : start + UPSERT_BATCH_SIZE])
@@ -1,10 +1,27 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api import accounts, dashboard, imports, plaid, rewards
+from app.api import (
+    accounts,
+    analytics,
+    dashboard,
+    exports,
+    imports,
+    merchant_rules,
+    metrics,
+    plaid,
+    rewards,
+    transactions,
+)
+from app.api.pagination import NEXT_CURSOR_HEADER
 from app.core.config import get_settings
-from app.models.base import Base
-from app.db.session import engine
+from app.core.metrics import MetricsMiddleware, instrument_engine
+from app.db.migrations import run_migrations
+from app.db import session as db_session
+from app.db.session import SessionLocal, engine
+from app.services import import_worker
+from app.services.net_worth import backfill_net_worth_if_empty
+from app.services.spending import backfill_spending_if_empty
 
 settings = get_settings()
 
@@ -15,12 +32,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
+# Outermost, so latency includes CORS handling and every response is counted.
+app.add_middleware(MetricsMiddleware, query_budget=settings.query_budget)
+
+instrument_engine(engine, "primary")
+instrument_engine(db_session.read_engine, "read")
+if db_session.AsyncSessionLocal is not None:
+    instrument_engine(db_session.AsyncSessionLocal.kw["bind"].sync_engine, "async")
+    instrument_engine(db_session.AsyncReadSessionLocal.kw["bind"].sync_engine, "async_read")
 
 
 @app.on_event("startup")
 def startup():
-    Base.metadata.create_all(bind=engine)
+    # A warm start is one lookup in schema_migrations; rollups added by a migration start out empty.
+    if run_migrations(engine):
+        with SessionLocal() as db:
+            backfill_net_worth_if_empty(db)
+            backfill_spending_if_empty(db)
+    import_worker.recover_interrupted_jobs()
+
+
+@app.on_event("shutdown")
+def shutdown():
+    import_worker.shutdown(wait=False)
 
 
 @app.get("/health")
@@ -29,7 +65,12 @@ def health():
 
 
 app.include_router(accounts.router)
+app.include_router(analytics.router)
 app.include_router(dashboard.router)
+app.include_router(exports.router)
 app.include_router(imports.router)
+app.include_router(merchant_rules.router)
+app.include_router(metrics.router)
 app.include_router(plaid.router)
 app.include_router(rewards.router)
+app.include_router(transactions.router)
@@ -24,6 +24,9 @@ class Account(Base, TimestampMixin):
     currency: Mapped[str] = mapped_column(String(8), nullable=False, default="USD")
     current_balance: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
     is_active: Mapped[bool] = mapped_column(nullable=False, default=True)
+    # Set for accounts linked through Plaid; syncs match on plaid_account_id, never on name.
+    plaid_item_id: Mapped[int | None] = mapped_column(ForeignKey("plaid_items.id"), nullable=True, index=True)
+    plaid_account_id: Mapped[str | None] = mapped_column(String(64), nullable=True, unique=True, index=True)
 
     institution = relationship("Institution", back_populates="accounts")
     card_details = relationship("CreditCardDetail", back_populates="account", uselist=False)
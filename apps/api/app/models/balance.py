@@ -1,6 +1,6 @@
 from datetime import date
 
-from sqlalchemy import Date, ForeignKey, Numeric
+from sqlalchemy import Date, ForeignKey, Index, Numeric
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
@@ -8,9 +8,11 @@ from app.models.base import Base, TimestampMixin
 
 class BalanceSnapshot(Base, TimestampMixin):
     __tablename__ = "balance_snapshots"
+    # Balance history reads one account's snapshots in date order.
+    __table_args__ = (Index("ix_balance_snapshots_account_date", "account_id", "snapshot_date"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), nullable=False, index=True)
+    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), nullable=False)
     snapshot_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
     balance: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False)
 
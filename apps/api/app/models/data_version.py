@@ -0,0 +1,13 @@
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin
+
+
+class DataVersion(Base, TimestampMixin):
+    """Monotonic change counter per data set; read routes derive ETags from it (see app/api/caching.py)."""
+
+    __tablename__ = "data_versions"
+
+    name: Mapped[str] = mapped_column(String(40), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
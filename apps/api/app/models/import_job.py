@@ -1,4 +1,6 @@
-from sqlalchemy import String, Text
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Float, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base, TimestampMixin
@@ -12,3 +14,15 @@ class ImportJob(Base, TimestampMixin):
     import_type: Mapped[str] = mapped_column(String(60), nullable=False, index=True)
     status: Mapped[str] = mapped_column(String(40), nullable=False, default="pending", index=True)
     message: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # Progress, committed after every batch so GET /imports/{id} can poll it. The server
+    # defaults let the SQLite schema sync add these columns to an existing import_jobs table.
+    rows_total: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    rows_processed: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rows_rejected: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rows_duplicate: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rows_per_sec: Mapped[float | None] = mapped_column(Float, nullable=True)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Rejected rows grouped by (column, reason) with a sample of row numbers.
+    error_report: Mapped[list | None] = mapped_column(JSON, nullable=True)
@@ -0,0 +1,18 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin
+
+
+class MerchantRule(Base, TimestampMixin):
+    """Maps descriptions containing `pattern` (whole words, case-insensitive) to a canonical merchant and category."""
+
+    __tablename__ = "merchant_rules"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    # Stored normalized (see app/services/categorizer.py) so equivalent spellings collide.
+    pattern: Mapped[str] = mapped_column(String(120), nullable=False, unique=True)
+    merchant: Mapped[str] = mapped_column(String(120), nullable=False)
+    category: Mapped[str | None] = mapped_column(String(80), nullable=True)
+    # Higher wins when several rules match; ties go to the longer pattern.
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
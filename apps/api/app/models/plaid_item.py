@@ -15,3 +15,5 @@ class PlaidItem(Base, TimestampMixin):
     institution_name: Mapped[str] = mapped_column(String(120), nullable=False)
     access_token_encrypted: Mapped[str] = mapped_column(Text, nullable=False)
     is_active: Mapped[bool] = mapped_column(nullable=False, default=True)
+    # Opaque /transactions/sync cursor; NULL until the first transactions sync.
+    transactions_cursor: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -0,0 +1,45 @@
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin
+
+
+class DashboardSummaryRollup(Base, TimestampMixin):
+    """Single-row materialization of GET /dashboard/summary, refreshed by balance writers."""
+
+    __tablename__ = "dashboard_summary_rollup"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    total_cash: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    total_investments: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    total_card_debt: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    card_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class NetWorthDaily(Base, TimestampMixin):
+    """Total balance per dashboard bucket, stored only on the days it changes (see app/services/net_worth.py)."""
+
+    __tablename__ = "net_worth_daily"
+
+    bucket: Mapped[str] = mapped_column(String(16), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    total: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False)
+
+
+class SpendingRollup(Base, TimestampMixin):
+    """Transaction sums per account, month, category and merchant (see app/services/spending.py).
+
+    Missing categories and merchants are stored as '' so they can be part of the key.
+    """
+
+    __tablename__ = "spending_rollup"
+
+    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True, index=True)
+    category: Mapped[str] = mapped_column(String(80), primary_key=True, default="")
+    merchant: Mapped[str] = mapped_column(String(120), primary_key=True, default="")
+    amount: Mapped[float] = mapped_column(Numeric(16, 2), nullable=False, default=0)
+    outflow: Mapped[float] = mapped_column(Numeric(16, 2), nullable=False, default=0)
+    transaction_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -1,6 +1,6 @@
 from datetime import date
 
-from sqlalchemy import Date, ForeignKey, Numeric, String, Text
+from sqlalchemy import Date, ForeignKey, Index, Numeric, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
@@ -8,14 +8,26 @@ from app.models.base import Base, TimestampMixin
 
 class Transaction(Base, TimestampMixin):
     __tablename__ = "transactions"
+    # Keyset pagination walks (transaction_date, id) newest first, optionally within one
+    # account, category or merchant; each composite serves one of those filters.
+    __table_args__ = (
+        Index("ix_transactions_date_id", "transaction_date", "id"),
+        Index("ix_transactions_account_date_id", "account_id", "transaction_date", "id"),
+        Index("ix_transactions_category_date_id", "category", "transaction_date", "id"),
+        Index("ix_transactions_merchant_date_id", "merchant", "transaction_date", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), nullable=False, index=True)
-    transaction_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), nullable=False)
+    transaction_date: Mapped[date] = mapped_column(Date, nullable=False)
     description: Mapped[str] = mapped_column(String(255), nullable=False)
     amount: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False)
-    category: Mapped[str | None] = mapped_column(String(80), nullable=True, index=True)
+    category: Mapped[str | None] = mapped_column(String(80), nullable=True)
     merchant: Mapped[str | None] = mapped_column(String(120), nullable=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # See app/services/fingerprint.py; NULL for rows entered outside CSV imports.
+    fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True, unique=True, index=True)
+    # Provider transaction id (Plaid transaction_id) for rows that arrive through a bank link.
+    external_id: Mapped[str | None] = mapped_column(String(64), nullable=True, unique=True, index=True)
 
     account = relationship("Account", back_populates="transactions")
@@ -0,0 +1,42 @@
+from pydantic import BaseModel
+
+
+class ReplayTotals(BaseModel):
+    transactions: int
+    reward_earned: float
+    reward_optimal: float
+    reward_missed: float
+
+
+class ReplayMonth(ReplayTotals):
+    month: str
+
+
+class ReplayCategory(ReplayTotals):
+    category: str
+    best_account_id: int
+    best_card_name: str
+
+
+class ReplayCard(ReplayTotals):
+    account_id: int
+    card_name: str
+
+
+class SpendingRow(BaseModel):
+    """Dimensions not in group_by are null; null category or merchant within a grouped dimension means missing."""
+
+    month: str | None
+    account_id: int | None
+    category: str | None
+    merchant: str | None
+    amount: float
+    outflow: float
+    inflow: float
+    transaction_count: int
+
+
+class RewardReplayRead(ReplayTotals):
+    by_month: list[ReplayMonth]
+    by_category: list[ReplayCategory]
+    by_card: list[ReplayCard]
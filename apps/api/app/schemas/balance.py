@@ -0,0 +1,16 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class BalancePoint(BaseModel):
+    date: date
+    balance: float
+    min: float
+    max: float
+
+
+class BalanceSeries(BaseModel):
+    account_id: int
+    bucket: str
+    points: list[BalancePoint]
@@ -10,6 +10,14 @@ class DashboardSummary(BaseModel):
     upcoming_due_count: int
 
 
+class NetWorthRead(BaseModel):
+    as_of: date
+    cash: float
+    investments: float
+    card_debt: float
+    net_worth: float
+
+
 class DueDateItem(BaseModel):
     card_account_id: int
     card_name: str
@@ -1,11 +1,36 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
 
+class ImportRowErrors(BaseModel):
+    column: str
+    reason: str
+    count: int
+    rows: list[int]
+
+
 class ImportJobRead(BaseModel):
     id: int
     source_name: str
     import_type: str
     status: str
     message: str | None = None
+    rows_total: int | None = None
+    rows_processed: int = 0
+    rows_rejected: int = 0
+    rows_duplicate: int = 0
+    rows_per_sec: float | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    error_report: list[ImportRowErrors] | None = None
 
     model_config = {"from_attributes": True}
+
+
+class ImportValidationReport(BaseModel):
+    import_type: str
+    rows_total: int
+    rows_valid: int
+    rows_rejected: int
+    errors: list[ImportRowErrors]
@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+
+
+class MerchantRuleCreate(BaseModel):
+    pattern: str = Field(min_length=2, max_length=120, description="Words to find in descriptions, e.g. 'blue bottle'")
+    merchant: str = Field(min_length=1, max_length=120)
+    category: str | None = Field(default=None, max_length=80)
+    priority: int = 0
+
+
+class MerchantRuleBatch(BaseModel):
+    items: list[MerchantRuleCreate] = Field(min_length=1, max_length=10_000)
+
+
+class MerchantRuleRead(BaseModel):
+    id: int
+    pattern: str
+    merchant: str
+    category: str | None
+    priority: int
+
+    model_config = {"from_attributes": True}
+
+
+class RecategorizeResult(BaseModel):
+    transactions_scanned: int
+    transactions_updated: int
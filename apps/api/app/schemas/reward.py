@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class RewardRuleCreate(BaseModel):
@@ -10,6 +10,16 @@ class RewardRuleCreate(BaseModel):
     exclusions: str | None = None
 
 
+class OfferCreate(BaseModel):
+    account_id: int
+    title: str
+    merchant: str | None = None
+    category: str | None = None
+    bonus_multiplier: float = 0
+    valid_until: str | None = None
+    details: str | None = None
+
+
 class RecommendationRead(BaseModel):
     category: str
     account_id: int
@@ -19,5 +29,9 @@ class RecommendationRead(BaseModel):
 
 
 class RecommendationQuery(BaseModel):
-    category: str
-    amount: float = 100.0
+    category: str = Field(min_length=2)
+    amount: float = Field(default=100.0, gt=0)
+
+
+class RecommendationBatchRequest(BaseModel):
+    items: list[RecommendationQuery] = Field(min_length=1, max_length=1000)
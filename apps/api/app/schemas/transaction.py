@@ -0,0 +1,16 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class TransactionRead(BaseModel):
+    id: int
+    account_id: int
+    transaction_date: date
+    description: str
+    amount: float
+    category: str | None
+    merchant: str | None
+    notes: str | None
+
+    model_config = {"from_attributes": True}
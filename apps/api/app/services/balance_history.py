@@ -0,0 +1,112 @@
+"""Bucketed, downsampled balance history read back from balance snapshots."""
+
+from datetime import date
+
+import numpy as np
+from sqlalchemy import Float, cast, select
+from sqlalchemy.orm import Session
+
+from app.models.balance import BalanceSnapshot
+
+BUCKETS = ("day", "week", "month")
+DEFAULT_MAX_POINTS = 500
+
+# 1970-01-01, day 0 of datetime64[D], was a Thursday; weeks start on Monday.
+_EPOCH_WEEKDAY = 3
+
+
+def bucket_starts(days: np.ndarray, bucket: str) -> np.ndarray:
+    """First day of the day/week/month bucket containing each date."""
+    if bucket == "day":
+        return days
+    if bucket == "week":
+        return days - (days.astype(np.int64) + _EPOCH_WEEKDAY) % 7
+    return days.astype("datetime64[M]").astype("datetime64[D]")
+
+
+def bucket_series(days: np.ndarray, balances: np.ndarray, bucket: str) -> tuple[np.ndarray, ...]:
+    """Collapse a date-sorted series into (bucket start, last, min, max) per bucket."""
+    keys = bucket_starts(days, bucket)
+    boundaries = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(keys)])) - 1
+    return (
+        keys[starts],
+        balances[ends],
+        np.minimum.reduceat(balances, starts),
+        np.maximum.reduceat(balances, starts),
+    )
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices kept by Largest-Triangle-Three-Buckets downsampling to `threshold` points.
+
+    The first and last points are always kept; in between, each bucket keeps the point
+    forming the largest triangle with the previously kept point and the next bucket's mean.
+    """
+    n = len(x)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        raise ValueError("LTTB needs at least 3 points")
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for slot in range(threshold - 2):
+        lo, hi = edges[slot], edges[slot + 1]
+        next_lo, next_hi = hi, edges[slot + 2] if slot + 2 < len(edges) else n
+        mean_x, mean_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        areas = np.abs(
+            (x[previous] - mean_x) * (y[lo:hi] - y[previous]) - (x[previous] - x[lo:hi]) * (mean_y - y[previous])
+        )
+        previous = lo + int(areas.argmax())
+        kept[slot + 1] = previous
+    return kept
+
+
+def _downsample(starts, last, low, high, max_points: int) -> tuple[np.ndarray, ...]:
+    """LTTB on the closing balances; each kept point absorbs the min/max of the buckets it stands for."""
+    kept = lttb(starts.astype(np.int64).astype(np.float64), last, max_points)
+    if len(kept) == len(starts):
+        return starts, last, low, high
+    return starts[kept], last[kept], np.minimum.reduceat(low, kept), np.maximum.reduceat(high, kept)
+
+
+def _load_snapshots(db: Session, account_ids: list[int], start: date | None, end: date | None) -> list:
+    query = select(BalanceSnapshot.account_id, BalanceSnapshot.snapshot_date, cast(BalanceSnapshot.balance, Float)).where(
+        BalanceSnapshot.account_id.in_(account_ids)
+    )
+    if start:
+        query = query.where(BalanceSnapshot.snapshot_date >= start)
+    if end:
+        query = query.where(BalanceSnapshot.snapshot_date <= end)
+    # Later ids win within a day, so "last" is the most recently recorded snapshot.
+    order = (BalanceSnapshot.account_id, BalanceSnapshot.snapshot_date, BalanceSnapshot.id)
+    return db.execute(query.order_by(*order)).all()
+
+
+def balance_history(
+    db: Session,
+    account_ids: list[int],
+    bucket: str = "day",
+    start: date | None = None,
+    end: date | None = None,
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> list[dict]:
+    """One series per account (in the order given) from a single snapshot query."""
+    rows = _load_snapshots(db, account_ids, start, end)
+    series = {account_id: [] for account_id in account_ids}
+    if rows:
+        owners = np.array([row[0] for row in rows], dtype=np.int64)
+        days = np.array([row[1] for row in rows], dtype="datetime64[D]")
+        balances = np.array([row[2] for row in rows], dtype=np.float64)
+        splits = np.flatnonzero(owners[1:] != owners[:-1]) + 1
+        for lo, hi in zip(np.concatenate(([0], splits)).tolist(), np.concatenate((splits, [len(rows)])).tolist()):
+            buckets = _downsample(*bucket_series(days[lo:hi], balances[lo:hi], bucket), max_points)
+            series[int(owners[lo])] = [
+                {"date": day, "balance": round(last, 2), "min": round(low, 2), "max": round(high, 2)}
+                for day, last, low, high in zip(*(values.tolist() for values in buckets))
+            ]
+    return [{"account_id": account_id, "bucket": bucket, "points": points} for account_id, points in series.items()]
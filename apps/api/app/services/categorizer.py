@@ -0,0 +1,228 @@
+"""Merchant normalization and auto-categorization from MerchantRule patterns.
+
+All rules are compiled into one Aho-Corasick automaton, so matching a description costs
+time linear in its length however many rules there are. Text and patterns are reduced to
+space-separated uppercase words and padded with spaces, which makes every substring hit a
+whole-word match: "BLUE BOTTLE" matches "SQ *BLUE BOTTLE 1234" but "SHELL" skips "SHELLFISH".
+"""
+
+import re
+import threading
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.merchant_rule import MerchantRule
+from app.models.transaction import Transaction
+from app.services.data_versions import MERCHANT_RULES, current_versions
+from app.services.spending import record_spending_changes
+
+_NON_WORD = re.compile(r"[^0-9A-Z]+")
+
+RECATEGORIZE_CHUNK_SIZE = 10_000
+
+
+def normalize_pattern(text: str) -> str:
+    """Uppercase words separated by single spaces; punctuation and symbols act as separators."""
+    return _NON_WORD.sub(" ", text.upper()).strip()
+
+
+@dataclass(frozen=True)
+class RuleMatch:
+    rule_id: int
+    merchant: str
+    category: str | None
+
+
+class _Automaton:
+    """Aho-Corasick over characters; each state keeps only the best (lowest-index) pattern ending there."""
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        goto: list[dict[str, int]] = [{}]
+        best = [-1]
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                following = goto[state].get(char)
+                if following is None:
+                    following = len(goto)
+                    goto[state][char] = following
+                    goto.append({})
+                    best.append(-1)
+                state = following
+            if best[state] < 0:
+                best[state] = index
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in goto[state].items():
+                queue.append(following)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[following] = goto[fallback].get(char, 0) if goto[fallback].get(char) != following else 0
+                # Fold in matches that end here via the suffix link, so search never walks output chains.
+                inherited = best[fail[following]]
+                if inherited >= 0 and (best[following] < 0 or inherited < best[following]):
+                    best[following] = inherited
+        self._goto, self._fail, self._best = goto, fail, best
+
+    def best_match(self, text: str) -> int:
+        goto, fail, best = self._goto, self._fail, self._best
+        state, found = 0, -1
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            hit = best[state]
+            if hit >= 0 and (found < 0 or hit < found):
+                found = hit
+        return found
+
+
+class Categorizer:
+    def __init__(self, rules: Sequence[MerchantRule | tuple]) -> None:
+        # Rank once so "lower index wins" inside the automaton means priority, then longer pattern.
+        ranked = sorted(rules, key=lambda rule: (-rule.priority, -len(rule.pattern), rule.id))
+        self._matches = [RuleMatch(rule.id, rule.merchant, rule.category) for rule in ranked]
+        self._automaton = _Automaton([f" {rule.pattern} " for rule in ranked])
+
+    def match(self, text: str | None) -> RuleMatch | None:
+        if not text or not self._matches:
+            return None
+        index = self._automaton.best_match(f" {normalize_pattern(text)} ")
+        return self._matches[index] if index >= 0 else None
+
+    def match_many(self, descriptions: Sequence[str], merchants: Sequence[str | None]) -> list[RuleMatch | None]:
+        """Match descriptions, falling back to the merchant field; each distinct pair is matched once."""
+        if not len(descriptions) or not self._matches:
+            return [None] * len(descriptions)
+        pairs = np.array([f"{d}\x00{m or ''}" for d, m in zip(descriptions, merchants)], dtype=object)
+        distinct, inverse = np.unique(pairs, return_inverse=True)
+        matches = []
+        for pair in distinct.tolist():
+            description, merchant = pair.split("\x00", 1)
+            matches.append(self.match(description) or self.match(merchant))
+        return [matches[index] for index in inverse.tolist()]
+
+
+class MerchantRuleIndex:
+    """Process-local compiled rules, tagged with the MERCHANT_RULES data version they were read at.
+
+    get() compares the tag with the stored version (one primary-key read) and recompiles when
+    the database is newer, so rules written through any worker reach every categorizer. The
+    rule write routes also drop the index in their own process.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._categorizer: Categorizer | None = None
+        self._version = -1
+
+    def get(self, db: Session) -> Categorizer:
+        (version,) = current_versions(db, [MERCHANT_RULES])
+        categorizer = self._categorizer
+        if categorizer is None or version > self._version:
+            with self._lock:
+                if self._categorizer is None or version > self._version:
+                    rows = db.execute(
+                        select(MerchantRule.id, MerchantRule.pattern, MerchantRule.merchant, MerchantRule.category, MerchantRule.priority)
+                    ).all()
+                    self._categorizer = Categorizer(rows)
+                    self._version = version
+                categorizer = self._categorizer
+        return categorizer
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._categorizer = None
+            self._version = -1
+
+
+merchant_rule_index = MerchantRuleIndex()
+
+
+def categorize_columns(
+    db: Session, descriptions: np.ndarray, merchants: np.ndarray, categories: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Fill missing merchants and categories from the rules; values from the source are kept.
+
+    None and '' both count as missing, here and in categorize_rows() and recategorize_transactions().
+    """
+    matches = merchant_rule_index.get(db).match_many(descriptions.tolist(), merchants.tolist())
+    merchants, categories = merchants.copy(), categories.copy()
+    for index, match in enumerate(matches):
+        if match is None:
+            continue
+        merchants[index] = merchants[index] or match.merchant
+        categories[index] = categories[index] or match.category
+    return merchants, categories
+
+
+def categorize_rows(db: Session, rows: list[dict]) -> None:
+    """categorize_columns() for transaction row dicts, filling them in place."""
+    matches = merchant_rule_index.get(db).match_many(
+        [row["description"] for row in rows], [row["merchant"] for row in rows]
+    )
+    for row, match in zip(rows, matches):
+        if match is not None:
+            row["merchant"] = row["merchant"] or match.merchant
+            row["category"] = row["category"] or match.category
+
+
+def recategorize_transactions(db: Session, overwrite: bool = False, chunk_size: int = RECATEGORIZE_CHUNK_SIZE) -> dict:
+    """Apply the current rules to the stored ledger, keyset-walking it by id in chunks.
+
+    By default only missing merchants and categories are filled; overwrite=True replaces
+    them wherever a rule matches. Changed rows are written with one bulk UPDATE per chunk
+    and moved between spending rollup keys. The caller commits.
+    """
+    categorizer = merchant_rule_index.get(db)
+    scanned = updated = 0
+    after_id = 0
+    while True:
+        rows = db.execute(
+            select(
+                Transaction.id,
+                Transaction.account_id,
+                Transaction.transaction_date,
+                Transaction.amount,
+                Transaction.description,
+                Transaction.category,
+                Transaction.merchant,
+            )
+            .where(Transaction.id > after_id)
+            .order_by(Transaction.id)
+            .limit(chunk_size)
+        ).mappings().all()
+        if not rows:
+            break
+        scanned += len(rows)
+        after_id = rows[-1]["id"]
+
+        changes, before, after = [], [], []
+        matches = categorizer.match_many([row["description"] for row in rows], [row["merchant"] for row in rows])
+        for row, match in zip(rows, matches):
+            if match is None:
+                continue
+            merchant = match.merchant if overwrite or not row["merchant"] else row["merchant"]
+            category = row["category"]
+            # A merchant-only rule has no category to give, so it never clears one.
+            if match.category is not None and (overwrite or not category):
+                category = match.category
+            if (merchant, category) == (row["merchant"], row["category"]):
+                continue
+            changes.append({"id": row["id"], "merchant": merchant, "category": category})
+            before.append(row)
+            after.append({**row, "merchant": merchant, "category": category})
+        if changes:
+            db.execute(update(Transaction), changes)
+            record_spending_changes(db, added=after, removed=before)
+            updated += len(changes)
+    return {"transactions_scanned": scanned, "transactions_updated": updated}
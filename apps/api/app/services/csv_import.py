@@ -1,63 +1,492 @@
 import csv
 import io
-from datetime import datetime
+import time
+from collections.abc import Iterator
+from itertools import islice
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import BinaryIO
 
+import numpy as np
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 
+from app.core.metrics import record_import
 from app.models.account import Account
 from app.models.balance import BalanceSnapshot
 from app.models.import_job import ImportJob
 from app.models.transaction import Transaction
+from app.services.categorizer import categorize_columns
+from app.services.data_versions import ACCOUNTS, BALANCES, TRANSACTIONS, bump_versions
+from app.services.fingerprint import transaction_fingerprints
+from app.services.net_worth import latest_snapshot_id, record_balance_snapshots
+from app.services.spending import record_spending
+from app.services.summary import refresh_dashboard_summary
 
+IMPORT_TYPES = ("balances", "transactions")
 
-def process_csv_import(db: Session, content: bytes, import_type: str, source_name: str) -> ImportJob:
-    job = ImportJob(source_name=source_name, import_type=import_type, status="processing")
-    db.add(job)
-    db.flush()
+REQUIRED_COLUMNS = {
+    "balances": ("account_id", "snapshot_date", "balance"),
+    "transactions": ("account_id", "transaction_date", "description", "amount"),
+}
+OPTIONAL_COLUMNS = {"balances": (), "transactions": ("category", "merchant")}
+
+# Column widths from the models; longer values are rejected rather than truncated.
+TEXT_LIMITS = {"description": 255, "category": 80, "merchant": 120}
+# Numeric(14, 2) holds 12 integer digits.
+MAX_AMOUNT = 1e12
+# Row numbers kept per error group in the report.
+MAX_REPORTED_ROWS = 10
+
+# Fingerprints per IN (...) lookup; stays under SQLite's bound-parameter limit.
+DEDUPE_BATCH_SIZE = 900
+
+# Rows parsed, checked and written per step, and per executemany / COPY round trip. Large
+# enough to amortize round trips, small enough to keep each step's arrays in a few MB.
+BATCH_SIZE = 5000
+# Longest account_id, date or amount cell that is parsed; longer ones are rejected unread.
+MAX_FIELD_LENGTH = 64
+
+BALANCE_COLUMNS = ("account_id", "snapshot_date", "balance")
+TRANSACTION_COLUMNS = (
+    "account_id",
+    "transaction_date",
+    "description",
+    "amount",
+    "category",
+    "merchant",
+    "fingerprint",
+)
+
+
+@dataclass
+class ParsedCsv:
+    """Typed columns for the rows of one chunk that passed validation, plus their rejections.
+
+    Row numbers are 1-based and count data rows of the whole file, so row 1 is the first line
+    after the header whichever chunk it falls in.
+    """
+
+    import_type: str
+    rows_total: int
+    columns: dict[str, np.ndarray]
+    row_numbers: np.ndarray
+    errors: list[dict] = field(default_factory=list)
+    rows_duplicate: int = 0
+
+    @property
+    def rows_valid(self) -> int:
+        return len(self.row_numbers)
+
+    def _drop(self, mask: np.ndarray) -> None:
+        keep = ~mask
+        self.columns = {name: values[keep] for name, values in self.columns.items()}
+        self.row_numbers = self.row_numbers[keep]
+
+    def reject(self, column: str, reason: str, bad: np.ndarray) -> None:
+        """Drop rows flagged in `bad` (aligned with the current valid rows) and log them."""
+        if not bad.any():
+            return
+        _log_error(self.errors, column, reason, self.row_numbers[bad])
+        self._drop(bad)
+
+    def skip_duplicates(self, duplicate: np.ndarray) -> None:
+        """Drop rows that are already stored; they are counted, not reported as errors."""
+        self.rows_duplicate += int(duplicate.sum())
+        self._drop(duplicate)
+
+
+@dataclass
+class ImportReport:
+    """Running counts and the rejection report over all chunks of a file."""
+
+    import_type: str
+    rows_total: int = 0
+    rows_valid: int = 0
+    rows_duplicate: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    @property
+    def rows_rejected(self) -> int:
+        return self.rows_total - self.rows_valid - self.rows_duplicate
+
+    def add(self, chunk: ParsedCsv) -> None:
+        """Fold in a chunk once it is final; errors merge per (column, reason)."""
+        self.rows_total += chunk.rows_total
+        self.rows_valid += chunk.rows_valid
+        self.rows_duplicate += chunk.rows_duplicate
+        groups = {(error["column"], error["reason"]): error for error in self.errors}
+        for error in chunk.errors:
+            merged = groups.get((error["column"], error["reason"]))
+            if merged is None:
+                self.errors.append(error)
+            else:
+                merged["count"] += error["count"]
+                merged["rows"] = (merged["rows"] + error["rows"])[:MAX_REPORTED_ROWS]
+
+    def report(self) -> dict:
+        return {
+            "import_type": self.import_type,
+            "rows_total": self.rows_total,
+            "rows_valid": self.rows_valid,
+            "rows_rejected": self.rows_rejected,
+            "errors": self.errors,
+        }
+
+
+def _log_error(errors: list[dict], column: str, reason: str, row_numbers: np.ndarray) -> None:
+    errors.append(
+        {
+            "column": column,
+            "reason": reason,
+            "count": int(len(row_numbers)),
+            "rows": row_numbers[:MAX_REPORTED_ROWS].tolist(),
+        }
+    )
 
-    reader = csv.DictReader(io.StringIO(content.decode("utf-8")))
-    inserted = 0
 
+def _read_chunks(source: BinaryIO, import_type: str) -> Iterator[tuple[dict[str, np.ndarray], np.ndarray]]:
+    """Read the CSV in BATCH_SIZE-row chunks, each transposed into one array per wanted column.
+
+    Yields the columns and a mask of rows with the wrong number of fields. Only one chunk of
+    rows is held at a time, however large the file.
+    """
+    reader = csv.reader(io.TextIOWrapper(source, encoding="utf-8", newline=""))
+    header = [name.strip() for name in next(reader, [])]
+    missing = [name for name in REQUIRED_COLUMNS[import_type] if name not in header]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    width = len(header)
+    wanted = [
+        (name, header.index(name))
+        for name in REQUIRED_COLUMNS[import_type] + OPTIONAL_COLUMNS[import_type]
+        if name in header
+    ]
+    lines = filter(None, reader)
+    while rows := list(islice(lines, BATCH_SIZE)):
+        ragged = np.fromiter((len(row) != width for row in rows), dtype=bool, count=len(rows))
+        columns: dict[str, np.ndarray] = {}
+        for name, index in wanted:
+            values = [row[index] if index < len(row) else "" for row in rows]
+            if name in TEXT_LIMITS:
+                # Free text stays as object arrays; fixed-width unicode would size every cell to the longest one.
+                columns[name] = np.array(values, dtype=object)
+            else:
+                # These are fixed-width too, so an overlong cell is blanked (and so rejected) first.
+                values = [value if len(value) <= MAX_FIELD_LENGTH else "" for value in values]
+                columns[name] = np.array(values, dtype=str)
+        yield columns, ragged
+
+
+def _ascii_digits(values: np.ndarray) -> np.ndarray:
+    """isdigit() limited to 0-9: str.isdigit also accepts digits such as "²" that int() rejects."""
+    values = np.ascontiguousarray(values, dtype=str)
+    codes = values.view(np.uint32).reshape(len(values), values.dtype.itemsize // 4)
+    return np.char.isdigit(values) & (codes < 128).all(axis=1)
+
+
+def _parse_ids(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    stripped = np.char.strip(values)
+    valid = _ascii_digits(stripped) & (np.char.str_len(stripped) <= 18)
+    parsed = np.where(valid, stripped, "0").astype(np.int64)
+    return parsed, valid & (parsed > 0)
+
+
+def _date_or_nat(value: str) -> np.datetime64:
+    try:
+        return np.datetime64(value, "D")
+    except ValueError:
+        return np.datetime64("NaT", "D")
+
+
+def _parse_dates(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    stripped = np.char.strip(values)
+    # Only YYYY-MM-DD; NumPy alone would also accept "2024-03" or "2024-03-01T10:00".
+    shaped = np.char.str_len(stripped) == 10
+    candidates = np.where(shaped, stripped, "NaT")
     try:
-        if import_type == "balances":
-            for row in reader:
-                account = db.query(Account).filter(Account.id == int(row["account_id"])).first()
-                if not account:
-                    continue
-                db.add(
-                    BalanceSnapshot(
-                        account_id=account.id,
-                        snapshot_date=datetime.strptime(row["snapshot_date"], "%Y-%m-%d").date(),
-                        balance=float(row["balance"]),
-                    )
-                )
-                account.current_balance = float(row["balance"])
-                inserted += 1
-        elif import_type == "transactions":
-            for row in reader:
-                db.add(
-                    Transaction(
-                        account_id=int(row["account_id"]),
-                        transaction_date=datetime.strptime(row["transaction_date"], "%Y-%m-%d").date(),
-                        description=row["description"],
-                        amount=float(row["amount"]),
-                        category=row.get("category"),
-                        merchant=row.get("merchant"),
-                    )
-                )
-                inserted += 1
+        parsed = candidates.astype("datetime64[D]")
+    except ValueError:
+        # Slow path only for files that contain impossible dates such as 2024-02-30.
+        parsed = np.array([_date_or_nat(value) for value in candidates], dtype="datetime64[D]")
+    return parsed, shaped & ~np.isnat(parsed)
+
+
+def _float_or_nan(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return float("nan")
+
+
+def _parse_amounts(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    stripped = np.char.strip(values)
+    try:
+        parsed = stripped.astype(np.float64)
+    except ValueError:
+        parsed = np.array([_float_or_nan(value) for value in stripped], dtype=np.float64)
+    valid = np.isfinite(parsed) & (np.abs(parsed) < MAX_AMOUNT)
+    return np.round(parsed, 2), valid
+
+
+def _parse_chunk(import_type: str, raw: dict[str, np.ndarray], ragged: np.ndarray, first_row: int) -> ParsedCsv:
+    rows_total = len(ragged)
+    date_column = "snapshot_date" if import_type == "balances" else "transaction_date"
+    amount_column = "balance" if import_type == "balances" else "amount"
+
+    account_ids, ids_ok = _parse_ids(raw["account_id"])
+    dates, dates_ok = _parse_dates(raw[date_column])
+    amounts, amounts_ok = _parse_amounts(raw[amount_column])
+    columns = {"account_id": account_ids, date_column: dates, amount_column: amounts}
+
+    checks = [
+        ("*", "wrong number of fields", ~ragged),
+        ("account_id", "not a positive integer", ids_ok),
+        (date_column, "not a YYYY-MM-DD date", dates_ok),
+        (amount_column, "not a number", amounts_ok),
+    ]
+    for name, limit in TEXT_LIMITS.items():
+        if name not in raw:
+            if name in REQUIRED_COLUMNS[import_type] + OPTIONAL_COLUMNS[import_type]:
+                columns[name] = np.full(rows_total, None, dtype=object)
+            continue
+        values = raw[name]
+        lengths = np.fromiter(map(len, values), dtype=np.int64, count=rows_total)
+        if name in REQUIRED_COLUMNS[import_type]:
+            checks.append((name, "empty", lengths > 0))
+        else:
+            values = np.where(lengths > 0, values, None)
+        checks.append((name, f"longer than {limit} characters", lengths <= limit))
+        columns[name] = values
+
+    # Each rejected row is reported once, against the first check it fails.
+    rejected = np.zeros(rows_total, dtype=bool)
+    errors: list[dict] = []
+    row_numbers = np.arange(first_row, first_row + rows_total)
+    for name, reason, ok in checks:
+        bad = ~ok & ~rejected
+        if bad.any():
+            _log_error(errors, name, reason, row_numbers[bad])
+            rejected |= bad
+
+    keep = ~rejected
+    return ParsedCsv(
+        import_type=import_type,
+        rows_total=rows_total,
+        columns={name: values[keep] for name, values in columns.items()},
+        row_numbers=row_numbers[keep],
+        errors=errors,
+    )
+
+
+def parse_csv_chunks(source: bytes | BinaryIO, import_type: str) -> Iterator[ParsedCsv]:
+    """Parse and type-check a CSV column by column, BATCH_SIZE rows at a time.
+
+    Bad rows are dropped and reported, not fatal. A missing required column raises ValueError
+    before the first chunk.
+    """
+    if import_type not in IMPORT_TYPES:
+        raise ValueError("import_type must be balances or transactions")
+    stream = io.BytesIO(source) if isinstance(source, bytes) else source
+    first_row = 1
+    for raw, ragged in _read_chunks(stream, import_type):
+        yield _parse_chunk(import_type, raw, ragged, first_row)
+        first_row += len(ragged)
+
+
+def dry_run_csv_import(source: bytes | BinaryIO, import_type: str) -> dict:
+    """Validate a file without touching the database and return the rejection report."""
+    report = ImportReport(import_type)
+    for parsed in parse_csv_chunks(source, import_type):
+        report.add(parsed)
+    return report.report()
+
+
+def _drop_unknown_accounts(db: Session, parsed: ParsedCsv) -> None:
+    account_ids = parsed.columns["account_id"]
+    referenced = np.unique(account_ids).tolist()
+    if referenced:
+        known = list(db.execute(select(Account.id).where(Account.id.in_(referenced))).scalars())
+    else:
+        known = []
+    parsed.reject("account_id", "unknown account", ~np.isin(account_ids, known))
+
+
+def _drop_duplicate_transactions(db: Session, parsed: ParsedCsv, seen: dict[int, int]) -> None:
+    """Fingerprint the rows and skip those whose fingerprint is already indexed.
+
+    Earlier chunks of the same import are already inserted, so they are found here too.
+    """
+    fingerprints = transaction_fingerprints(
+        parsed.columns["account_id"],
+        parsed.columns["transaction_date"],
+        parsed.columns["amount"],
+        parsed.columns["description"],
+        seen,
+    )
+    parsed.columns["fingerprint"] = fingerprints
+    stored: set[str] = set()
+    for start in range(0, len(fingerprints), DEDUPE_BATCH_SIZE):
+        batch = fingerprints[start : start + DEDUPE_BATCH_SIZE].tolist()
+        stored.update(db.execute(select(Transaction.fingerprint).where(Transaction.fingerprint.in_(batch))).scalars())
+    if stored:
+        parsed.skip_duplicates(np.fromiter((fp in stored for fp in fingerprints), dtype=bool, count=len(fingerprints)))
+
+
+def _copy_rows(db: Session, table, columns: tuple[str, ...], rows: list[tuple]) -> None:
+    """Stream rows through Postgres COPY on the session's own connection."""
+    raw = db.connection().connection.driver_connection
+    statement = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN"
+    with raw.cursor() as cursor, cursor.copy(statement) as copy:
+        for row in rows:
+            copy.write_row(row)
+
+
+def _bulk_insert(db: Session, table, columns: tuple[str, ...], rows: list[tuple]) -> None:
+    """Write rows in BATCH_SIZE chunks, via COPY on Postgres and executemany elsewhere."""
+    use_copy = db.get_bind().dialect.name == "postgresql"
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start : start + BATCH_SIZE]
+        if use_copy:
+            _copy_rows(db, table, columns, batch)
         else:
-            raise ValueError("import_type must be balances or transactions")
+            db.execute(insert(table), [dict(zip(columns, row)) for row in batch])
+
+
+def _rows(parsed: ParsedCsv, columns: tuple[str, ...]) -> list[tuple]:
+    return list(zip(*(parsed.columns[name].tolist() for name in columns)))
+
+
+class _Progress:
+    """Written-row count and throughput since the job started."""
+
+    def __init__(self):
+        self.rows = 0
+        self.started = time.perf_counter()
+
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.rows / elapsed if elapsed > 0 else 0.0
 
+
+class _BalanceLoader:
+    """Inserts snapshot chunks and moves each account's balance to its latest row so far."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        # account_id -> (snapshot_date, balance) of its latest row so far; later rows win ties.
+        self.latest: dict[int, tuple[date, float]] = {}
+
+    def load(self, parsed: ParsedCsv) -> int:
+        rows = _rows(parsed, BALANCE_COLUMNS)
+        if not rows:
+            return 0
+        since_id = latest_snapshot_id(self.db)
+        _bulk_insert(self.db, BalanceSnapshot.__table__, BALANCE_COLUMNS, rows)
+        touched = set()
+        for account_id, day, balance in rows:
+            touched.add(account_id)
+            current = self.latest.get(account_id)
+            if current is None or day >= current[0]:
+                self.latest[account_id] = (day, balance)
+        self.db.execute(
+            update(Account),
+            [{"id": account_id, "current_balance": self.latest[account_id][1]} for account_id in sorted(touched)],
+        )
+        refresh_dashboard_summary(self.db)
+        record_balance_snapshots(self.db, since_id)
+        bump_versions(self.db, ACCOUNTS, BALANCES)
+        return len(rows)
+
+
+class _TransactionLoader:
+    """Dedupes, categorizes and inserts transaction chunks, rolling each into spending as it goes."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.seen: dict[int, int] = {}
+
+    def load(self, parsed: ParsedCsv) -> int:
+        _drop_duplicate_transactions(self.db, parsed, self.seen)
+        columns = parsed.columns
+        columns["merchant"], columns["category"] = categorize_columns(
+            self.db, columns["description"], columns["merchant"], columns["category"]
+        )
+        rows = _rows(parsed, TRANSACTION_COLUMNS)
+        if not rows:
+            return 0
+        _bulk_insert(self.db, Transaction.__table__, TRANSACTION_COLUMNS, rows)
+        record_spending(
+            self.db, *(columns[name] for name in ("account_id", "transaction_date", "amount", "category", "merchant"))
+        )
+        bump_versions(self.db, TRANSACTIONS)
+        return len(rows)
+
+
+def create_import_job(db: Session, import_type: str, source_name: str) -> ImportJob:
+    """Persist a queued job so the caller can hand its id back before any parsing starts."""
+    job = ImportJob(source_name=source_name, import_type=import_type, status="queued")
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def _publish(job: ImportJob, report: ImportReport, progress: _Progress) -> None:
+    job.rows_total = report.rows_total
+    job.rows_processed = progress.rows
+    job.rows_rejected = report.rows_rejected
+    job.rows_duplicate = report.rows_duplicate
+    job.rows_per_sec = round(progress.rate(), 1)
+    # Copies, so the JSON column sees a new value while later chunks keep merging into the report.
+    job.error_report = [dict(error) for error in report.errors] or None
+
+
+def run_import_job(db: Session, job: ImportJob, source: bytes | BinaryIO) -> ImportJob:
+    """Parse and load a CSV chunk by chunk for an existing job.
+
+    Each chunk commits on its own together with its rollups, versions and the job's counters,
+    so pollers see progress and no transaction holds SQLite's write lock for the whole file.
+    A failed import keeps the chunks committed before it; re-importing the file is safe, since
+    transaction fingerprints skip the rows that already landed and a repeated balance snapshot
+    leaves every balance and the net-worth rollup unchanged.
+    """
+    job.status = "processing"
+    job.started_at = datetime.now(timezone.utc)
+    db.commit()
+    progress = _Progress()
+
+    try:
+        report = ImportReport(job.import_type)
+        loader = _BalanceLoader(db) if job.import_type == "balances" else _TransactionLoader(db)
+        for parsed in parse_csv_chunks(source, job.import_type):
+            _drop_unknown_accounts(db, parsed)
+            written = loader.load(parsed)
+            report.add(parsed)
+            progress.rows += written
+            _publish(job, report, progress)
+            db.commit()
+
+        _publish(job, report, progress)
         job.status = "completed"
-        job.message = f"Imported {inserted} rows."
-        db.commit()
-        db.refresh(job)
-        return job
+        job.message = (
+            f"Imported {progress.rows} rows ({job.rows_rejected} rejected, {job.rows_duplicate} duplicates skipped) "
+            f"at {job.rows_per_sec:,.0f} rows/sec."
+        )
     except Exception as exc:
         db.rollback()
-        failed = ImportJob(source_name=source_name, import_type=import_type, status="failed", message=str(exc))
-        db.add(failed)
-        db.commit()
-        db.refresh(failed)
-        return failed
+        job.status = "failed"
+        job.message = f"{exc} ({job.rows_processed} rows committed before the failure are kept)"
+
+    job.finished_at = datetime.now(timezone.utc)
+    db.commit()
+    db.refresh(job)
+    record_import(job.import_type, job.status, job.rows_processed, time.perf_counter() - progress.started)
+    return job
+
+
+def process_csv_import(db: Session, content: bytes, import_type: str, source_name: str) -> ImportJob:
+    """Create and run an import job synchronously (scripts and tests)."""
+    job = create_import_job(db, import_type=import_type, source_name=source_name)
+    return run_import_job(db, job, content)
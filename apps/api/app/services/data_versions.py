@@ -0,0 +1,35 @@
+"""Per-data-set version counters, bumped inside every writer's transaction."""
+
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.upsert import upsert
+from app.models.data_version import DataVersion
+
+ACCOUNTS = "accounts"
+CARDS = "cards"
+BALANCES = "balances"
+TRANSACTIONS = "transactions"
+REWARDS = "rewards"
+MERCHANT_RULES = "merchant_rules"
+
+
+def bump_versions(db: Session, *names: str) -> None:
+    """Mark data sets as changed; the caller commits together with the change itself."""
+    upsert(
+        db,
+        DataVersion.__table__,
+        [{"name": name, "version": 1} for name in sorted(set(names))],
+        ["name"],
+        update_columns=[],
+        increment_columns=["version"],
+    )
+
+
+def current_versions(db: Session, names: Iterable[str]) -> tuple[int, ...]:
+    """Versions in the order given, from one primary-key lookup; never-written sets are 0."""
+    names = list(names)
+    stored = dict(db.execute(select(DataVersion.name, DataVersion.version).where(DataVersion.name.in_(names))).all())
+    return tuple(stored.get(name, 0) for name in names)
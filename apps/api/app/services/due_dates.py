@@ -1,15 +1,100 @@
 from datetime import date
 
-from dateutil.relativedelta import relativedelta
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
+from app.models.account import Account
+from app.models.card import CreditCardDetail
 
-def resolve_next_due_date(due_day: int, due_date_override: date | None = None) -> date:
-    if due_date_override:
-        return due_date_override
 
-    today = date.today()
-    safe_due_day = max(1, min(28, due_day))
-    current_cycle = today.replace(day=safe_due_day)
-    if current_cycle >= today:
-        return current_cycle
-    return (today + relativedelta(months=1)).replace(day=safe_due_day)
+def due_schedule(due_days: np.ndarray, start: date, months: int) -> np.ndarray:
+    """Due dates for every card (rows) over `months` cycles starting at start's month (columns).
+
+    Due days past the end of a month land on its last day, so a day-31 card is due
+    Feb 28/29, Apr 30, and so on.
+    """
+    first_month = np.datetime64(start, "M")
+    offsets = np.arange(months)
+    month_starts = (first_month + offsets).astype("datetime64[D]")
+    month_lengths = ((first_month + offsets + 1).astype("datetime64[D]") - month_starts).astype(np.int64)
+    days = np.clip(np.asarray(due_days, dtype=np.int64)[:, None], 1, month_lengths[None, :])
+    return month_starts[None, :] + (days - 1)
+
+
+def _apply_overrides(schedule: np.ndarray, start: date, overrides: list[date | None]) -> None:
+    """A due_date_override replaces the regular cycle in its own month."""
+    first_month = np.datetime64(start, "M")
+    for card, override in enumerate(overrides):
+        if override is None:
+            continue
+        cycle = int((np.datetime64(override, "M") - first_month).astype(np.int64))
+        if 0 <= cycle < schedule.shape[1]:
+            schedule[card, cycle] = np.datetime64(override, "D")
+
+
+def _next_due(schedule: np.ndarray, today: date) -> np.ndarray:
+    """Per card, the first of its two scheduled cycles that is not already past."""
+    return np.where(schedule[:, 0] >= np.datetime64(today, "D"), schedule[:, 0], schedule[:, 1])
+
+
+def resolve_next_due_date(due_day: int, due_date_override: date | None = None, today: date | None = None) -> date:
+    """Same rule as upcoming_due_dates(), so a past override falls back to the regular cycle."""
+    today = today or date.today()
+    schedule = due_schedule(np.array([due_day]), today, 2)
+    _apply_overrides(schedule, today, [due_date_override])
+    return _next_due(schedule, today)[0].item()
+
+
+def _load_cards(db: Session) -> list:
+    return db.execute(
+        select(
+            CreditCardDetail.account_id,
+            Account.name,
+            CreditCardDetail.due_day,
+            CreditCardDetail.due_date_override,
+            CreditCardDetail.min_payment_due,
+        )
+        .join(Account, CreditCardDetail.account_id == Account.id)
+        .order_by(CreditCardDetail.id)
+    ).all()
+
+
+def _items(cards: list, card_index: np.ndarray, due: np.ndarray, today: date) -> list[dict]:
+    days_remaining = (due - np.datetime64(today, "D")).astype(np.int64)
+    items = [
+        {
+            "card_account_id": cards[index].account_id,
+            "card_name": cards[index].name,
+            "due_date": due_date,
+            "min_payment_due": float(cards[index].min_payment_due),
+            "days_remaining": days,
+        }
+        for index, due_date, days in zip(card_index.tolist(), due.tolist(), days_remaining.tolist())
+    ]
+    return sorted(items, key=lambda item: (item["due_date"], item["card_account_id"]))
+
+
+def upcoming_due_dates(db: Session, today: date | None = None) -> list[dict]:
+    """The next due date of every card, from one joined query and one vectorized pass."""
+    today = today or date.today()
+    cards = _load_cards(db)
+    if not cards:
+        return []
+    schedule = due_schedule(np.array([card.due_day for card in cards]), today, 2)
+    _apply_overrides(schedule, today, [card.due_date_override for card in cards])
+    return _items(cards, np.arange(len(cards)), _next_due(schedule, today), today)
+
+
+def due_dates_between(db: Session, start: date, end: date, today: date | None = None) -> list[dict]:
+    """Every card's due dates in [start, end], for calendar views."""
+    today = today or date.today()
+    cards = _load_cards(db)
+    if not cards:
+        return []
+    months = int((np.datetime64(end, "M") - np.datetime64(start, "M")).astype(np.int64)) + 1
+    schedule = due_schedule(np.array([card.due_day for card in cards]), start, months)
+    _apply_overrides(schedule, start, [card.due_date_override for card in cards])
+    in_range = (schedule >= np.datetime64(start, "D")) & (schedule <= np.datetime64(end, "D"))
+    card_index, cycle = np.nonzero(in_range)
+    return _items(cards, card_index, schedule[card_index, cycle], today)
@@ -0,0 +1,182 @@
+"""Streaming exports of transactions and balance snapshots in the CSV import schema.
+
+Rows come off a server-side cursor (`yield_per`) in EXPORT_BATCH_SIZE partitions and each
+partition is encoded and yielded before the next is fetched, so memory stays flat however many
+rows match and the first bytes go out as soon as the first partition is read. The generators
+open their own session: a request-scoped one is closed before a streamed body is finished.
+"""
+
+import csv
+import io
+import json
+from collections.abc import Callable, Iterator, Sequence
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app.models.balance import BalanceSnapshot
+from app.models.transaction import Transaction
+from app.services.csv_import import OPTIONAL_COLUMNS, REQUIRED_COLUMNS
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+# Rows fetched and encoded per step; also the Parquet row group size.
+EXPORT_BATCH_SIZE = 10_000
+
+# Same names and order as the import templates, so an export can be re-imported as-is.
+EXPORT_COLUMNS = {kind: REQUIRED_COLUMNS[kind] + OPTIONAL_COLUMNS[kind] for kind in REQUIRED_COLUMNS}
+_MODELS = {"transactions": Transaction, "balances": BalanceSnapshot}
+_DATE_COLUMNS = {"transactions": "transaction_date", "balances": "snapshot_date"}
+_AMOUNT_COLUMNS = {"transactions": "amount", "balances": "balance"}
+
+
+class ExportUnavailable(RuntimeError):
+    """The requested format needs a package that is not installed."""
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def export_statement(
+    kind: str,
+    account_ids: Sequence[int] | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    category: str | None = None,
+    merchant: str | None = None,
+    min_amount: float | None = None,
+    max_amount: float | None = None,
+) -> Select:
+    """Oldest first on (date, id), the order the keyset indexes already provide."""
+    model = _MODELS[kind]
+    date_column = getattr(model, _DATE_COLUMNS[kind])
+    amount_column = getattr(model, _AMOUNT_COLUMNS[kind])
+    statement = select(*(getattr(model, name) for name in EXPORT_COLUMNS[kind]))
+    if account_ids:
+        statement = statement.where(model.account_id.in_(account_ids))
+    if start:
+        statement = statement.where(date_column >= start)
+    if end:
+        statement = statement.where(date_column <= end)
+    if category:
+        statement = statement.where(model.category == category)
+    if merchant:
+        statement = statement.where(model.merchant == merchant)
+    if min_amount is not None:
+        statement = statement.where(amount_column >= min_amount)
+    if max_amount is not None:
+        statement = statement.where(amount_column <= max_amount)
+    return statement.order_by(date_column, model.id)
+
+
+def _batches(session_factory: Callable[[], Session], statement: Select) -> Iterator[list[tuple]]:
+    with session_factory() as db:
+        result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def _json_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def _encode_csv(columns: tuple[str, ...], batches: Iterator[list[tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    yield buffer.getvalue().encode()
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode()
+
+
+def _encode_ndjson(columns: tuple[str, ...], batches: Iterator[list[tuple]]) -> Iterator[bytes]:
+    for batch in batches:
+        lines = [json.dumps(dict(zip(columns, map(_json_value, row))), separators=(",", ":")) for row in batch]
+        yield ("\n".join(lines) + "\n").encode()
+
+
+class _Drain:
+    """Write-only file the Parquet writer fills; the generator empties it after each row group."""
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self.chunks.append(chunk)
+        self.position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+def _parquet_schema(kind: str):
+    import pyarrow as pa
+
+    types = {
+        "account_id": pa.int64(),
+        _DATE_COLUMNS[kind]: pa.date32(),
+        _AMOUNT_COLUMNS[kind]: pa.decimal128(14, 2),
+    }
+    return pa.schema([(name, types.get(name, pa.string())) for name in EXPORT_COLUMNS[kind]])
+
+
+def _encode_parquet(kind: str, batches: Iterator[list[tuple]]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema(kind)
+    sink = _Drain()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for batch in batches:
+            arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*batch), schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.take()
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+def stream_export(kind: str, export_format: str, session_factory: Callable[[], Session], **filters) -> Iterator[bytes]:
+    """Encoded chunks for StreamingResponse; raises ExportUnavailable up front, before any bytes."""
+    if export_format == "parquet" and not parquet_available():
+        raise ExportUnavailable("Parquet export needs pyarrow, which is not installed")
+    batches = _batches(session_factory, export_statement(kind, **filters))
+    if export_format == "parquet":
+        return _encode_parquet(kind, batches)
+    if export_format == "ndjson":
+        return _encode_ndjson(EXPORT_COLUMNS[kind], batches)
+    return _encode_csv(EXPORT_COLUMNS[kind], batches)
@@ -0,0 +1,82 @@
+"""Content fingerprints that make transaction re-imports idempotent."""
+
+import hashlib
+
+import numpy as np
+from sqlalchemy import Connection, Float, bindparam, cast, select, update
+
+from app.models.transaction import Transaction
+
+# Rows read and updated per step of the backfill.
+BACKFILL_BATCH_SIZE = 5000
+
+
+def normalize_description(description: str) -> str:
+    """Uppercase and collapse whitespace so cosmetic export differences hash the same."""
+    return " ".join(description.upper().split())
+
+
+def transaction_fingerprints(
+    account_ids: np.ndarray,
+    dates: np.ndarray,
+    amounts: np.ndarray,
+    descriptions: np.ndarray,
+    seen: dict[int, int] | None = None,
+) -> np.ndarray:
+    """SHA-256 over account, date, amount, normalized description and an occurrence ordinal.
+
+    The ordinal numbers identical rows within one file (0, 1, ...), so two real
+    same-day charges stay distinct while a re-sent overlap reproduces the same keys.
+    The SQL backfill in migrations/005_transaction_fingerprints.sql mirrors this format.
+    Pass the same `seen` dict for every chunk of a file to keep counting across chunks;
+    it holds one small int per distinct key rather than the keys themselves.
+    """
+    seen = {} if seen is None else seen
+    fingerprints = []
+    for account_id, day, amount, description in zip(
+        account_ids.tolist(), dates.tolist(), amounts.tolist(), descriptions.tolist()
+    ):
+        # "+ 0.0" turns -0.0 into 0.0 so it formats like the SQL backfill.
+        key = f"{account_id}|{day.isoformat()}|{amount + 0.0:.2f}|{normalize_description(description)}"
+        # A 64-bit hash collision would only bump one row's ordinal.
+        slot = hash(key)
+        ordinal = seen.get(slot, 0)
+        seen[slot] = ordinal + 1
+        fingerprints.append(hashlib.sha256(f"{key}|{ordinal}".encode()).hexdigest())
+    return np.array(fingerprints, dtype=object)
+
+
+def backfill_fingerprints(connection: Connection) -> int:
+    """Fingerprint rows stored before fingerprints existed; returns the number updated.
+
+    Identical rows are numbered in id order, like the SQL backfill in
+    migrations/005_transaction_fingerprints.sql, so re-importing a statement loaded before the
+    upgrade finds every one of its rows.
+    """
+    table = Transaction.__table__
+    statement = update(table).where(table.c.id == bindparam("row_id")).values(fingerprint=bindparam("new_fingerprint"))
+    seen: dict[int, int] = {}
+    after_id = updated = 0
+    while True:
+        rows = connection.execute(
+            select(table.c.id, table.c.account_id, table.c.transaction_date, cast(table.c.amount, Float), table.c.description)
+            .where(table.c.fingerprint.is_(None), table.c.id > after_id)
+            .order_by(table.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            return updated
+        ids, account_ids, dates, amounts, descriptions = zip(*rows)
+        fingerprints = transaction_fingerprints(
+            np.array(account_ids, dtype=np.int64),
+            np.array(dates, dtype="datetime64[D]"),
+            np.array(amounts, dtype=np.float64),
+            np.array(descriptions, dtype=object),
+            seen,
+        )
+        connection.execute(
+            statement,
+            [{"row_id": row_id, "new_fingerprint": fp} for row_id, fp in zip(ids, fingerprints.tolist())],
+        )
+        after_id = ids[-1]
+        updated += len(rows)
@@ -0,0 +1,101 @@
+"""Background worker pool for CSV imports spooled to disk by the API."""
+
+import logging
+import shutil
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO
+
+from sqlalchemy import update
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.import_job import ImportJob
+from app.services.csv_import import run_import_job
+
+logger = logging.getLogger(__name__)
+
+SPOOL_CHUNK_SIZE = 1 << 20
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _spool_dir() -> Path:
+    configured = get_settings().import_spool_dir
+    path = Path(configured) if configured else Path(tempfile.gettempdir()) / "account_manager_imports"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def spool_upload(upload: BinaryIO) -> Path:
+    """Copy an upload to a spool file in fixed-size chunks and return its path."""
+    with tempfile.NamedTemporaryFile(dir=_spool_dir(), suffix=".csv", delete=False) as spool:
+        shutil.copyfileobj(upload, spool, SPOOL_CHUNK_SIZE)
+    return Path(spool.name)
+
+
+def recover_interrupted_jobs() -> int:
+    """Fail jobs a previous process left queued or processing, and delete its spool files.
+
+    The pool lives in memory, so those jobs will never run; call this at startup, before
+    anything is queued. Returns the number of jobs marked failed.
+    """
+    with SessionLocal() as db:
+        result = db.execute(
+            update(ImportJob)
+            .where(ImportJob.status.in_(("queued", "processing")))
+            .values(
+                status="failed",
+                message="Interrupted by a server restart; upload the file again.",
+                finished_at=datetime.now(timezone.utc),
+            )
+        )
+        db.commit()
+    for path in _spool_dir().glob("*.csv"):
+        path.unlink(missing_ok=True)
+    if result.rowcount:
+        logger.warning("Marked %s interrupted import jobs as failed", result.rowcount)
+    return result.rowcount
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_settings().import_workers,
+                thread_name_prefix="csv-import",
+            )
+        return _executor
+
+
+def _run(job_id: int, path: Path) -> None:
+    db = SessionLocal()
+    try:
+        job = db.get(ImportJob, job_id)
+        if job is None:
+            return
+        with path.open("rb") as source:
+            run_import_job(db, job, source)
+    except Exception:
+        logger.exception("Import job %s crashed", job_id)
+    finally:
+        db.close()
+        path.unlink(missing_ok=True)
+
+
+def submit_import(job_id: int, path: Path) -> Future:
+    """Queue a spooled file for processing; the worker owns and deletes the file."""
+    return _get_executor().submit(_run, job_id, path)
+
+
+def shutdown(wait: bool = True) -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
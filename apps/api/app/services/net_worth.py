@@ -0,0 +1,240 @@
+"""Daily net worth per balance bucket, kept current from balance snapshots as they are written.
+
+An account's balance on day D is its latest snapshot on or before D (later ids win within a
+day). The net_worth_daily table stores each bucket's total only on days where it changes, so a
+point-in-time read is one "latest row on or before" index lookup per bucket.
+"""
+
+from datetime import date
+
+import numpy as np
+from sqlalchemy import Float, and_, cast, delete, func, select, text
+from sqlalchemy.orm import Session
+
+from app.db.upsert import upsert
+from app.models.account import Account
+from app.models.balance import BalanceSnapshot
+from app.models.rollup import NetWorthDaily
+from app.services.data_versions import BALANCES, bump_versions
+from app.services.summary import ACCOUNT_TYPE_BUCKETS
+
+NET_WORTH_BUCKETS = ("cash", "investments", "card_debt")
+# Transaction-scoped Postgres advisory lock held by snapshot writers (see latest_snapshot_id).
+POSTGRES_LOCK_ID = 7_316_015
+
+
+def _lock_writers(db: Session) -> None:
+    """Serialize snapshot writers until commit.
+
+    pysqlite only opens a transaction at the first write, so on SQLite a plain SELECT would read
+    the mark outside the writer lock. Bumping BALANCES (which every snapshot writer does anyway)
+    takes that lock first, and a concurrent writer waits for this one's commit.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": POSTGRES_LOCK_ID})
+    else:
+        bump_versions(db, BALANCES)
+
+
+def latest_snapshot_id(db: Session) -> int:
+    """High-water mark to pass to record_balance_snapshots() after inserting snapshots.
+
+    Takes the writer lock first. The stored totals are read, shifted in Python and written
+    back, and only snapshots above the mark count as new, so two writers interleaving would
+    lose or double-count each other's change. With the lock, the next writer starts from
+    what this one committed.
+    """
+    _lock_writers(db)
+    return db.execute(select(func.max(BalanceSnapshot.id))).scalar() or 0
+
+
+def _step(days: np.ndarray, ids: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Change points (day, value) of one account's balance, keeping the highest id per day."""
+    if not len(days):
+        return days, values
+    order = np.lexsort((ids, days))
+    days, values = days[order], values[order]
+    last = np.append(days[1:] != days[:-1], True)
+    return days[last], values[last]
+
+
+def _value_at(step_days: np.ndarray, step_values: np.ndarray, days: np.ndarray, carry: float) -> np.ndarray:
+    """Evaluate a step function at `days`; days before its first change take `carry`."""
+    if not len(step_days):
+        return np.full(len(days), carry, dtype=np.float64)
+    index = np.searchsorted(step_days, days, side="right") - 1
+    return np.where(index >= 0, step_values[np.maximum(index, 0)], carry)
+
+
+def _carry_in(db: Session, account_ids: list[int], before: date) -> dict[int, float]:
+    """Each account's balance just before `before`, from its latest earlier snapshot."""
+    latest_day = (
+        select(BalanceSnapshot.account_id, func.max(BalanceSnapshot.snapshot_date).label("day"))
+        .where(BalanceSnapshot.account_id.in_(account_ids), BalanceSnapshot.snapshot_date < before)
+        .group_by(BalanceSnapshot.account_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(BalanceSnapshot.account_id, cast(BalanceSnapshot.balance, Float))
+        .join(
+            latest_day,
+            and_(
+                BalanceSnapshot.account_id == latest_day.c.account_id,
+                BalanceSnapshot.snapshot_date == latest_day.c.day,
+            ),
+        )
+        .order_by(BalanceSnapshot.id)
+    )
+    return dict(rows.all())
+
+
+def _bucket_deltas(db: Session, since_id: int) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """Per bucket, the days on which snapshots newer than since_id change the total, and by how much."""
+    changed = db.execute(
+        select(BalanceSnapshot.account_id, Account.account_type)
+        .join(Account, BalanceSnapshot.account_id == Account.id)
+        .where(BalanceSnapshot.id > since_id)
+        .distinct()
+    ).all()
+    buckets = {account_id: ACCOUNT_TYPE_BUCKETS.get(account_type) for account_id, account_type in changed}
+    account_ids = [account_id for account_id, bucket in buckets.items() if bucket]
+    if not account_ids:
+        return {}
+    since = db.execute(
+        select(func.min(BalanceSnapshot.snapshot_date)).where(
+            BalanceSnapshot.id > since_id, BalanceSnapshot.account_id.in_(account_ids)
+        )
+    ).scalar_one()
+    rows = db.execute(
+        select(BalanceSnapshot.account_id, BalanceSnapshot.snapshot_date, BalanceSnapshot.id, cast(BalanceSnapshot.balance, Float))
+        .where(BalanceSnapshot.account_id.in_(account_ids), BalanceSnapshot.snapshot_date >= since)
+        .order_by(BalanceSnapshot.account_id)
+    ).all()
+    carry = _carry_in(db, account_ids, since)
+
+    owners = np.array([row[0] for row in rows], dtype=np.int64)
+    days = np.array([row[1] for row in rows], dtype="datetime64[D]")
+    ids = np.array([row[2] for row in rows], dtype=np.int64)
+    balances = np.array([row[3] for row in rows], dtype=np.float64)
+
+    deltas: dict[str, list[tuple[np.ndarray, np.ndarray]]] = {}
+    splits = np.flatnonzero(owners[1:] != owners[:-1]) + 1
+    for lo, hi in zip(np.concatenate(([0], splits)).tolist(), np.concatenate((splits, [len(rows)])).tolist()):
+        account_id = int(owners[lo])
+        bucket = buckets[account_id]
+        old = ids[lo:hi] <= since_id
+        start = carry.get(account_id, 0.0)
+        change_days = np.unique(days[lo:hi])
+        before = _value_at(*_step(days[lo:hi][old], ids[lo:hi][old], balances[lo:hi][old]), change_days, start)
+        after = _value_at(*_step(days[lo:hi], ids[lo:hi], balances[lo:hi]), change_days, start)
+        if bucket == "card_debt":
+            # Card debt is reported as a positive amount owed, as on the dashboard summary.
+            before, after, start = np.abs(before), np.abs(after), abs(start)
+        difference = after - before
+        steps = np.diff(difference, prepend=0.0)
+        moved = np.abs(steps) >= 0.005
+        deltas.setdefault(bucket, []).append((change_days[moved], steps[moved]))
+
+    merged = {}
+    for bucket, parts in deltas.items():
+        step_days = np.concatenate([part[0] for part in parts])
+        if not len(step_days):
+            continue
+        distinct, inverse = np.unique(step_days, return_inverse=True)
+        merged[bucket] = (distinct, np.bincount(inverse, weights=np.concatenate([part[1] for part in parts])))
+    return merged
+
+
+def _apply_bucket_deltas(db: Session, bucket: str, step_days: np.ndarray, steps: np.ndarray) -> None:
+    """Add a step function to one bucket's stored totals from its first changed day onwards."""
+    first = step_days[0].item()
+    carry = db.execute(
+        select(cast(NetWorthDaily.total, Float))
+        .where(NetWorthDaily.bucket == bucket, NetWorthDaily.day < first)
+        .order_by(NetWorthDaily.day.desc())
+        .limit(1)
+    ).scalar()
+    stored = db.execute(
+        select(NetWorthDaily.day, cast(NetWorthDaily.total, Float))
+        .where(NetWorthDaily.bucket == bucket, NetWorthDaily.day >= first)
+        .order_by(NetWorthDaily.day)
+    ).all()
+    stored_days = np.array([row[0] for row in stored], dtype="datetime64[D]")
+    stored_totals = np.array([row[1] for row in stored], dtype=np.float64)
+
+    days = np.union1d(stored_days, step_days)
+    totals = _value_at(stored_days, stored_totals, days, carry or 0.0) + _value_at(step_days, np.cumsum(steps), days, 0.0)
+    upsert(
+        db,
+        NetWorthDaily.__table__,
+        [{"bucket": bucket, "day": day, "total": round(total, 2)} for day, total in zip(days.tolist(), totals.tolist())],
+        index_elements=["bucket", "day"],
+        update_columns=["total"],
+    )
+
+
+def record_balance_snapshots(db: Session, since_id: int) -> None:
+    """Fold snapshots with id > since_id into net_worth_daily; the caller commits.
+
+    Only days from the earliest new snapshot onwards are read and rewritten, so appending
+    today's balances touches a handful of rows however long the history is.
+    """
+    for bucket, (step_days, steps) in _bucket_deltas(db, since_id).items():
+        _apply_bucket_deltas(db, bucket, step_days, steps)
+
+
+def rebuild_net_worth(db: Session) -> None:
+    """Recompute the whole rollup from every snapshot, e.g. after upgrading an existing database."""
+    _lock_writers(db)
+    db.execute(delete(NetWorthDaily))
+    record_balance_snapshots(db, since_id=0)
+
+
+def backfill_net_worth_if_empty(db: Session) -> None:
+    """Build the rollup once for databases that have snapshots but predate it."""
+    has_rollup = db.execute(select(NetWorthDaily.day).limit(1)).first()
+    if has_rollup is None and db.execute(select(BalanceSnapshot.id).limit(1)).first():
+        rebuild_net_worth(db)
+        db.commit()
+
+
+def _net_worth(totals: dict[str, float]) -> dict:
+    cash, investments, card_debt = (round(totals.get(bucket) or 0.0, 2) for bucket in NET_WORTH_BUCKETS)
+    return {
+        "cash": cash,
+        "investments": investments,
+        "card_debt": card_debt,
+        "net_worth": round(cash + investments - card_debt, 2),
+    }
+
+
+def net_worth_as_of(db: Session, as_of: date) -> dict:
+    """Bucket totals on `as_of`, in one statement of per-bucket index lookups."""
+    lookups = [
+        select(cast(NetWorthDaily.total, Float))
+        .where(NetWorthDaily.bucket == bucket, NetWorthDaily.day <= as_of)
+        .order_by(NetWorthDaily.day.desc())
+        .limit(1)
+        .scalar_subquery()
+        .label(bucket)
+        for bucket in NET_WORTH_BUCKETS
+    ]
+    row = db.execute(select(*lookups)).one()
+    return {"as_of": as_of, **_net_worth(row._asdict())}
+
+
+def net_worth_between(db: Session, start: date, end: date) -> list[dict]:
+    """Net worth on `start` and on every later day up to `end` where any bucket changes."""
+    points = [net_worth_as_of(db, start)]
+    totals = {bucket: points[0][bucket] for bucket in NET_WORTH_BUCKETS}
+    rows = db.execute(
+        select(NetWorthDaily.day, NetWorthDaily.bucket, cast(NetWorthDaily.total, Float))
+        .where(NetWorthDaily.day > start, NetWorthDaily.day <= end)
+        .order_by(NetWorthDaily.day)
+    )
+    for day, bucket, total in rows:
+        totals[bucket] = total
+        if points[-1]["as_of"] != day:
+            points.append({"as_of": day})
+        points[-1].update(_net_worth(totals))
+    return points
@@ -1,25 +1,59 @@
 """Plaid provider adapter - creates link tokens, exchanges public tokens, syncs accounts."""
 
-import plaid
-from plaid.api import plaid_api
-from plaid.model.link_token_create_request import LinkTokenCreateRequest
-from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
-from plaid.model.products import Products
-from plaid.model.country_code import CountryCode
-from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
-from plaid.model.accounts_get_request import AccountsGetRequest
+import json
+import random
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import lru_cache, partial
+
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
+from app.core.metrics import record_sync
+from app.db.upsert import upsert
 from app.models.account import Account, Institution
+from app.models.balance import BalanceSnapshot
 from app.models.plaid_item import PlaidItem
+from app.models.transaction import Transaction
+from app.services.categorizer import categorize_rows
+from app.services.data_versions import ACCOUNTS, BALANCES, TRANSACTIONS, bump_versions
+from app.services.net_worth import latest_snapshot_id, record_balance_snapshots
+from app.services.spending import record_spending_changes
+from app.services.summary import refresh_dashboard_summary
 
 settings = get_settings()
 
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+RETRY_BASE_DELAY = 0.5  # seconds; doubled per attempt, with jitter
+TRANSACTIONS_SYNC_PAGE_SIZE = 500  # Plaid's maximum
+# Pagination restarts from the item's saved cursor when Plaid reports this error.
+MUTATION_DURING_PAGINATION = "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION"
+MAX_PAGINATION_RESTARTS = 3
+# External ids per IN (...) statement; stays under SQLite's bound-parameter limit.
+ID_BATCH_SIZE = 900
+PLAID_ACCOUNT_TYPES = {
+    "depository": "checking",
+    "credit": "credit_card",
+    "loan": "loan",
+    "investment": "investment",
+}
+
 
+@lru_cache
 def _get_plaid_client():
+    """One shared client per process; its urllib3 pool is sized for concurrent syncs.
+
+    The SDK is imported here and in the request helpers rather than at module load: its
+    generated model tree is most of the API's import time and is dead weight without Plaid.
+    """
     if not settings.plaid_enabled:
         raise RuntimeError("Plaid is not configured. Set PLAID_CLIENT_ID and PLAID_SECRET.")
+    import plaid
+    from plaid.api import plaid_api
+
     env = plaid.Environment.Sandbox
     if settings.plaid_env == "development":
         env = plaid.Environment.Development
@@ -32,30 +66,77 @@ def _get_plaid_client():
             "secret": settings.plaid_secret,
         },
     )
+    configuration.connection_pool_maxsize = settings.plaid_sync_concurrency
     api_client = plaid.ApiClient(configuration)
     return plaid_api.PlaidApi(api_client)
 
 
-def _encrypt_token(plain: str) -> str:
+@lru_cache
+def _get_cipher():
+    from cryptography.fernet import Fernet
+
     key = settings.plaid_encryption_key
-    if not key:
+    return Fernet(key.encode() if isinstance(key, str) else key)
+
+
+def _encrypt_token(plain: str) -> str:
+    if not settings.plaid_encryption_key:
         return plain
-    from cryptography.fernet import Fernet
-    f = Fernet(key.encode() if isinstance(key, str) else key)
-    return f.encrypt(plain.encode()).decode()
+    return _get_cipher().encrypt(plain.encode()).decode()
 
 
 def _decrypt_token(encrypted: str) -> str:
-    key = settings.plaid_encryption_key
-    if not key:
+    if not settings.plaid_encryption_key:
         return encrypted
-    from cryptography.fernet import Fernet
-    f = Fernet(key.encode() if isinstance(key, str) else key)
-    return f.decrypt(encrypted.encode()).decode()
+    return _get_cipher().decrypt(encrypted.encode()).decode()
+
+
+def _is_retryable(exc: Exception) -> bool:
+    import urllib3
+    from plaid.exceptions import ApiException
+
+    if isinstance(exc, ApiException):
+        return exc.status in RETRYABLE_STATUSES
+    return isinstance(exc, (urllib3.exceptions.HTTPError, ConnectionError, TimeoutError))
+
+
+def _call_with_retry(operation: Callable, request):
+    """Call a Plaid endpoint with a per-request timeout, retrying transient failures."""
+    for attempt in range(settings.plaid_max_retries + 1):
+        try:
+            return operation(request, _request_timeout=settings.plaid_request_timeout)
+        except Exception as exc:
+            if attempt == settings.plaid_max_retries or not _is_retryable(exc):
+                raise
+            time.sleep(RETRY_BASE_DELAY * 2**attempt * (1 + random.random()))
+
+
+def _fan_out(items: list[PlaidItem], calls: list[Callable[[], object]]) -> list[tuple[PlaidItem, object, Exception | None]]:
+    """Run one prepared network call per item on a bounded thread pool.
+
+    Calls must not touch the session; results come back in item order so the caller
+    can apply them from a single thread.
+    """
+    if not items:
+        return []
+    with ThreadPoolExecutor(
+        max_workers=min(settings.plaid_sync_concurrency, len(items)), thread_name_prefix="plaid-sync"
+    ) as pool:
+        futures = [pool.submit(call) for call in calls]
+    results = []
+    for item, future in zip(items, futures):
+        error = future.exception()
+        results.append((item, None if error else future.result(), error))
+    return results
 
 
 def create_link_token() -> str:
     """Create a Plaid Link token for initializing the Link UI."""
+    from plaid.model.country_code import CountryCode
+    from plaid.model.link_token_create_request import LinkTokenCreateRequest
+    from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
+    from plaid.model.products import Products
+
     client = _get_plaid_client()
     request = LinkTokenCreateRequest(
         user=LinkTokenCreateRequestUser(client_user_id="account_manager_user"),
@@ -68,11 +149,34 @@ def create_link_token() -> str:
     return response.link_token
 
 
+def _new_account(item: PlaidItem, acct) -> Account:
+    """Local account for a Plaid account; card balances are stored negative (money owed)."""
+    plaid_type = getattr(acct.type, "value", str(acct.type)) if getattr(acct, "type", None) else "depository"
+    account_type = PLAID_ACCOUNT_TYPES.get(plaid_type, "checking")
+    balance = 0.0
+    if acct.balances and acct.balances.current is not None:
+        balance = float(acct.balances.current)
+    if account_type == "credit_card" and balance > 0:
+        balance = -balance
+    return Account(
+        institution_id=item.institution_id,
+        plaid_item_id=item.id,
+        plaid_account_id=acct.account_id,
+        name=acct.name or f"{item.institution_name} Account",
+        account_type=account_type,
+        currency=getattr(acct.balances, "iso_currency_code", None) or "USD",
+        current_balance=balance,
+    )
+
+
 def exchange_public_token(db: Session, public_token: str) -> dict:
     """
     Exchange public token for access token, create PlaidItem, sync accounts.
     Returns created accounts info.
     """
+    from plaid.model.accounts_get_request import AccountsGetRequest
+    from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
+
     client = _get_plaid_client()
     request = ItemPublicTokenExchangeRequest(public_token=public_token)
     response = client.item_public_token_exchange(request)
@@ -106,65 +210,319 @@ def exchange_public_token(db: Session, public_token: str) -> dict:
     db.add(plaid_item)
     db.flush()
 
-    type_map = {
-        "depository": "checking",
-        "credit": "credit_card",
-        "loan": "loan",
-        "investment": "investment",
-    }
-
     created = []
     for acct in acct_response.accounts:
-        plaid_type = getattr(acct.type, "value", str(acct.type)) if acct.type else "depository"
-        our_type = type_map.get(plaid_type, "checking")
-        bal = 0.0
-        if acct.balances and acct.balances.current is not None:
-            bal = float(acct.balances.current)
-        if our_type == "credit_card" and bal > 0:
-            bal = -bal
-
-        account = Account(
-            institution_id=institution.id,
-            name=acct.name or f"{institution_name} Account",
-            account_type=our_type,
-            currency=getattr(acct.balances, "iso_currency_code", None) or "USD",
-            current_balance=bal,
-        )
+        account = _new_account(plaid_item, acct)
         db.add(account)
         db.flush()
-        created.append({"id": account.id, "name": account.name, "type": our_type, "balance": bal})
+        created.append(
+            {"id": account.id, "name": account.name, "type": account.account_type, "balance": account.current_balance}
+        )
 
+    _snapshot_balances(db, [{"id": account["id"], "current_balance": account["balance"]} for account in created])
+    refresh_dashboard_summary(db)
+    bump_versions(db, ACCOUNTS, BALANCES)
     db.commit()
     return {"item_id": item_id, "institution": institution_name, "accounts": created}
 
 
+def _fetch_accounts(access_token: str) -> list:
+    from plaid.model.accounts_get_request import AccountsGetRequest
+
+    client = _get_plaid_client()
+    return _call_with_retry(client.accounts_get, AccountsGetRequest(access_token=access_token)).accounts
+
+
+def _link_remote_accounts(db: Session, remote: list[tuple[PlaidItem, list]]) -> dict[str, tuple[int, str]]:
+    """Local (id, account_type) for every Plaid account_id, in at most two queries for all items.
+
+    Accounts linked before plaid_account_id existed are matched once by institution and
+    name, and get their Plaid ids written back so later syncs never fall back to names.
+    """
+    if not remote:
+        return {}
+    linked = {
+        plaid_account_id: (account_id, account_type)
+        for account_id, plaid_account_id, account_type in db.execute(
+            select(Account.id, Account.plaid_account_id, Account.account_type).where(
+                Account.plaid_item_id.in_([item.id for item, _ in remote])
+            )
+        )
+    }
+    unlinked = [(item, acct) for item, accounts in remote for acct in accounts if acct.account_id not in linked]
+    if not unlinked:
+        return linked
+
+    by_name = {
+        (institution_id, name): (account_id, account_type)
+        for account_id, institution_id, name, account_type in db.execute(
+            select(Account.id, Account.institution_id, Account.name, Account.account_type).where(
+                Account.institution_id.in_({item.institution_id for item, _ in unlinked}),
+                Account.plaid_account_id.is_(None),
+            )
+        )
+    }
+    backfill = []
+    for item, acct in unlinked:
+        match = by_name.pop((item.institution_id, acct.name), None)
+        if match:
+            linked[acct.account_id] = match
+            backfill.append({"id": match[0], "plaid_item_id": item.id, "plaid_account_id": acct.account_id})
+    if backfill:
+        db.execute(update(Account), backfill)
+    return linked
+
+
+def _create_missing_accounts(db: Session, remote: list[tuple[PlaidItem, list]], linked: dict[str, tuple[int, str]]) -> None:
+    """Create local accounts for Plaid accounts opened after their item was linked, and add them to `linked`."""
+    created = [_new_account(item, acct) for item, accounts in remote for acct in accounts if acct.account_id not in linked]
+    if not created:
+        return
+    db.add_all(created)
+    db.flush()
+    for account in created:
+        linked[account.plaid_account_id] = (account.id, account.account_type)
+    _snapshot_balances(db, [{"id": account.id, "current_balance": account.current_balance} for account in created])
+    refresh_dashboard_summary(db)
+    bump_versions(db, ACCOUNTS, BALANCES)
+
+
+def _snapshot_balances(db: Session, balances: list[dict]) -> None:
+    """Record today's balances as snapshots and fold them into the net-worth rollup."""
+    if not balances:
+        return
+    since_id = latest_snapshot_id(db)
+    today = date.today()
+    db.execute(
+        insert(BalanceSnapshot),
+        [{"account_id": row["id"], "snapshot_date": today, "balance": row["current_balance"]} for row in balances],
+    )
+    record_balance_snapshots(db, since_id)
+
+
 def sync_plaid_accounts(db: Session) -> dict:
-    """Sync balances from all linked Plaid items."""
+    """Sync balances from all linked Plaid items, fetching items concurrently.
+
+    Remote accounts are matched on plaid_account_id and all balances are written with
+    one bulk UPDATE, so database round trips do not grow with the number of accounts.
+    """
+    started = time.perf_counter()
     items = db.query(PlaidItem).filter(PlaidItem.is_active == True).all()
-    updated = 0
     errors = []
+    remote = []
+
+    calls = [partial(_fetch_accounts, _decrypt_token(item.access_token_encrypted)) for item in items]
+    for item, remote_accounts, error in _fan_out(items, calls):
+        if error:
+            errors.append({"item_id": item.item_id, "error": str(error)})
+        else:
+            remote.append((item, remote_accounts))
+
+    linked = _link_remote_accounts(db, remote)
+    balances = []
+    for _, remote_accounts in remote:
+        for acct in remote_accounts:
+            match = linked.get(acct.account_id)
+            if match and acct.balances and acct.balances.current is not None:
+                account_id, account_type = match
+                bal = float(acct.balances.current)
+                if account_type == "credit_card" and bal > 0:
+                    bal = -bal
+                balances.append({"id": account_id, "current_balance": bal})
+
+    if balances:
+        db.execute(update(Account), balances)
+        _snapshot_balances(db, balances)
+        refresh_dashboard_summary(db)
+        bump_versions(db, ACCOUNTS, BALANCES)
+    db.commit()
+    record_sync("accounts", len(items) - len(errors), len(errors), time.perf_counter() - started)
+    return {"accounts_updated": len(balances), "errors": errors}
+
 
-    for item in items:
+def _plaid_error_code(exc: Exception) -> str | None:
+    from plaid.exceptions import ApiException
+
+    if not isinstance(exc, ApiException) or not exc.body:
+        return None
+    try:
+        return json.loads(exc.body).get("error_code")
+    except (ValueError, AttributeError):
+        return None
+
+
+def _collect_transaction_pages(access_token: str, cursor: str | None) -> dict:
+    from plaid.model.transactions_sync_request import TransactionsSyncRequest
+
+    client = _get_plaid_client()
+    deltas = {"added": [], "modified": [], "removed": [], "accounts": [], "next_cursor": cursor}
+    while True:
+        fields = {"access_token": access_token, "count": TRANSACTIONS_SYNC_PAGE_SIZE}
+        if deltas["next_cursor"]:
+            fields["cursor"] = deltas["next_cursor"]
+        response = _call_with_retry(client.transactions_sync, TransactionsSyncRequest(**fields))
+        deltas["added"].extend(response.added)
+        deltas["modified"].extend(response.modified)
+        deltas["removed"].extend(response.removed)
+        deltas["accounts"] = response.accounts or deltas["accounts"]
+        deltas["next_cursor"] = response.next_cursor
+        if not response.has_more:
+            return deltas
+
+
+def _fetch_transaction_deltas(access_token: str, cursor: str | None) -> dict:
+    """Page through /transactions/sync from `cursor` and collect every delta.
+
+    Nothing is applied until all pages are in, so a failure part-way leaves the stored
+    cursor (and the ledger) where they were.
+    """
+    from plaid.exceptions import ApiException
+
+    restarts = 0
+    while True:
         try:
-            token = _decrypt_token(item.access_token_encrypted)
-            client = _get_plaid_client()
-            request = AccountsGetRequest(access_token=token)
-            response = client.accounts_get(request)
-
-            for acct in response.accounts:
-                our = (
-                    db.query(Account)
-                    .filter(Account.institution_id == item.institution_id, Account.name == acct.name)
-                    .first()
-                )
-                if our and acct.balances and acct.balances.current is not None:
-                    bal = float(acct.balances.current)
-                    if our.account_type == "credit_card" and bal > 0:
-                        bal = -bal
-                    our.current_balance = bal
-                    updated += 1
-        except Exception as e:
-            errors.append({"item_id": item.item_id, "error": str(e)})
+            return _collect_transaction_pages(access_token, cursor)
+        except ApiException as exc:
+            restarts += 1
+            if _plaid_error_code(exc) != MUTATION_DURING_PAGINATION or restarts > MAX_PAGINATION_RESTARTS:
+                raise
+
+
+def _transaction_row(txn, account_id: int) -> dict:
+    category = None
+    pfc = getattr(txn, "personal_finance_category", None)
+    if pfc and getattr(pfc, "primary", None):
+        category = pfc.primary.lower()
+    elif getattr(txn, "category", None):
+        category = txn.category[0].lower()
+    merchant = getattr(txn, "merchant_name", None)
+    return {
+        "external_id": txn.transaction_id,
+        "account_id": account_id,
+        "transaction_date": txn.date,
+        "description": (txn.name or "")[:255],
+        # Plaid reports money leaving the account as positive; the ledger stores it negative.
+        "amount": round(-float(txn.amount), 2),
+        "category": category[:80] if category else None,
+        "merchant": merchant[:120] if merchant else None,
+    }
+
+
+def _stored_transactions(db: Session, external_ids: list[str]) -> list:
+    """Current ledger rows for the given Plaid transaction ids, before a sync overwrites them."""
+    stored = []
+    for start in range(0, len(external_ids), ID_BATCH_SIZE):
+        stored += db.execute(
+            select(
+                Transaction.account_id,
+                Transaction.transaction_date,
+                Transaction.amount,
+                Transaction.category,
+                Transaction.merchant,
+            ).where(Transaction.external_id.in_(external_ids[start : start + ID_BATCH_SIZE]))
+        ).mappings().all()
+    return stored
+
+
+def _lock_item(db: Session, item: PlaidItem) -> str | None:
+    """Lock the item's row until commit and return the cursor stored there now.
+
+    The no-op UPDATE takes the row lock on Postgres and the write lock on SQLite, so a
+    concurrent sync of the same item waits here and then sees what this one committed.
+    """
+    db.execute(
+        update(PlaidItem)
+        .where(PlaidItem.id == item.id)
+        .values(transactions_cursor=PlaidItem.transactions_cursor)
+        .execution_options(synchronize_session=False)
+    )
+    db.refresh(item, ["transactions_cursor"])
+    return item.transactions_cursor
+
+
+def _apply_transaction_deltas(db: Session, item: PlaidItem, deltas: dict, linked: dict[str, tuple[int, str]]) -> dict:
+    """Upsert and delete one item's deltas; the cursor only advances when none had to be skipped.
+
+    A transaction can show up in `added` and again in `modified` (or `removed`) across pages,
+    so rows are keyed by external_id, the last version wins, and removed ids are dropped:
+    one upsert statement may not touch the same key twice. The item stays locked from before
+    the stored rows are read, and deltas fetched from a cursor that another sync has since
+    moved past are dropped, so the spending rollup sees each change once.
+    """
+    fetched_from = item.transactions_cursor
+    if _lock_item(db, item) != fetched_from:
+        return {"added": 0, "modified": 0, "removed": 0, "skipped": 0}
+    removed_ids = [removed.transaction_id for removed in deltas["removed"]]
+    gone = set(removed_ids)
+    latest = {}
+    skipped = 0
+    for txn in deltas["added"] + deltas["modified"]:
+        match = linked.get(txn.account_id)
+        if match is None:
+            skipped += 1
+        elif txn.transaction_id not in gone:
+            latest[txn.transaction_id] = _transaction_row(txn, match[0])
+    rows = list(latest.values())
+    categorize_rows(db, rows)
+    record_spending_changes(db, added=rows, removed=_stored_transactions(db, [row["external_id"] for row in rows] + removed_ids))
+    upsert(
+        db,
+        Transaction.__table__,
+        rows,
+        index_elements=["external_id"],
+        update_columns=["account_id", "transaction_date", "description", "amount", "category", "merchant"],
+    )
+
+    for start in range(0, len(removed_ids), ID_BATCH_SIZE):
+        db.execute(delete(Transaction).where(Transaction.external_id.in_(removed_ids[start : start + ID_BATCH_SIZE])))
+
+    if not skipped:
+        # Plaid never resends deltas from before the cursor, so it stays put until every
+        # transaction has an account to land in; re-applying the same deltas is idempotent.
+        item.transactions_cursor = deltas["next_cursor"]
+    return {
+        "added": len(deltas["added"]),
+        "modified": len(deltas["modified"]),
+        "removed": len(removed_ids),
+        "skipped": skipped,
+    }
+
+
+def sync_plaid_transactions(db: Session) -> dict:
+    """Pull only what changed since each item's stored cursor and apply it to the ledger.
+
+    Items are fetched concurrently. Plaid accounts with no local account yet are created
+    first; added/modified rows are bulk-upserted on Transaction.external_id, removed ones
+    deleted, and every item's new cursor is committed together with its deltas.
+    """
+    started = time.perf_counter()
+    # Id order, so concurrent syncs lock items in the same order.
+    items = db.query(PlaidItem).filter(PlaidItem.is_active == True).order_by(PlaidItem.id).all()
+    totals = {"items_synced": 0, "added": 0, "modified": 0, "removed": 0, "skipped": 0}
+    errors = []
+
+    calls = [
+        partial(_fetch_transaction_deltas, _decrypt_token(item.access_token_encrypted), item.transactions_cursor)
+        for item in items
+    ]
+    fetched = []
+    for item, deltas, error in _fan_out(items, calls):
+        if error:
+            errors.append({"item_id": item.item_id, "error": str(error)})
+        else:
+            fetched.append((item, deltas))
+
+    remote = [(item, deltas["accounts"]) for item, deltas in fetched]
+    linked = _link_remote_accounts(db, remote)
+    _create_missing_accounts(db, remote, linked)
+    for item, deltas in fetched:
+        for key, value in _apply_transaction_deltas(db, item, deltas, linked).items():
+            totals[key] += value
+        totals["items_synced"] += 1
 
+    if totals["added"] or totals["modified"] or totals["removed"]:
+        bump_versions(db, TRANSACTIONS)
     db.commit()
-    return {"accounts_updated": updated, "errors": errors}
+    changes = {change: totals[change] for change in ("added", "modified", "removed")}
+    record_sync("transactions", totals["items_synced"], len(errors), time.perf_counter() - started, changes)
+    return {**totals, "errors": errors}
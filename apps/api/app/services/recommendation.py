@@ -1,41 +1,156 @@
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from decimal import Decimal
+
+import numpy as np
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models.account import Account
 from app.models.reward import Offer, RewardRule
+from app.services.data_versions import REWARDS, current_versions
+
+
+@dataclass(frozen=True)
+class RankedCard:
+    account_id: int
+    card_name: str
+    base_multiplier: Decimal
+    bonus: float
+    multiplier: float
+
+
+class RewardIndex:
+    """Process-local category -> cards ranked by effective multiplier (base rule + best offer).
+
+    Built lazily from one rule query and one offer query and tagged with the REWARDS data
+    version it was read at. Every lookup compares that tag with the stored version, one
+    primary-key read, and reloads when the database is newer. That picks up writes made by
+    other workers and processes, and a lagging replica catching up. Write routes in this
+    process refresh just the categories they touched.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ranked: dict[str, list[RankedCard]] | None = None
+        self._version = -1
+
+    def _load(self, db: Session, categories: list[str] | None = None) -> dict[str, list[RankedCard]]:
+        rules = select(RewardRule.category, RewardRule.multiplier, Account.id, Account.name).join(
+            Account, RewardRule.account_id == Account.id
+        )
+        if categories is not None:
+            rules = rules.where(RewardRule.category.in_(categories))
+        rule_rows = db.execute(rules.order_by(RewardRule.id)).all()
+
+        account_ids = {row.id for row in rule_rows}
+        bonuses: dict[tuple[int, str | None], float] = {}
+        if account_ids:
+            offer_rows = db.execute(
+                select(Offer.account_id, Offer.category, Offer.bonus_multiplier).where(Offer.account_id.in_(account_ids))
+            )
+            for account_id, category, bonus in offer_rows:
+                key = (account_id, category)
+                bonuses[key] = max(bonuses.get(key, float(bonus)), float(bonus))
+
+        ranked: dict[str, list[RankedCard]] = {category: [] for category in categories or ()}
+        for category, base, account_id, name in rule_rows:
+            # Offers without a category apply to every category on that card.
+            matching = [bonuses[key] for key in ((account_id, category), (account_id, None)) if key in bonuses]
+            bonus = max(matching) if matching else 0.0
+            ranked.setdefault(category, []).append(RankedCard(account_id, name, base, bonus, float(base) + bonus))
+        for cards in ranked.values():
+            # Stable sort keeps rule order among equal multipliers.
+            cards.sort(key=lambda card: card.multiplier, reverse=True)
+        return ranked
+
+    def snapshot(self, db: Session) -> dict[str, list[RankedCard]]:
+        """The whole index, (re)loading it first if needed. Treat the result as read-only.
+
+        Versions only grow, so a session that lags behind the loaded version (a replica) keeps
+        the newer index instead of reloading an older one.
+        """
+        (version,) = current_versions(db, [REWARDS])
+        ranked = self._ranked
+        if ranked is None or version > self._version:
+            with self._lock:
+                if self._ranked is None or version > self._version:
+                    self._ranked = self._load(db)
+                    self._version = version
+                ranked = self._ranked
+        return ranked
+
+    def ranked(self, db: Session, category: str) -> list[RankedCard]:
+        return self.snapshot(db).get(category, [])
+
+    def refresh(self, db: Session, categories: Iterable[str]) -> None:
+        """Reload only the given categories after this process committed one rule or offer write.
+
+        If anyone else has bumped REWARDS since the index was loaded, the index is dropped
+        instead and the next lookup reloads it whole.
+        """
+        (version,) = current_versions(db, [REWARDS])
+        with self._lock:
+            if self._ranked is None:
+                return
+            if version != self._version + 1:
+                self._ranked = None
+                return
+            updated = dict(self._ranked)
+            for category, cards in self._load(db, sorted(set(categories))).items():
+                if cards:
+                    updated[category] = cards
+                else:
+                    updated.pop(category, None)
+            self._ranked = updated
+            self._version = version
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._ranked = None
+            self._version = -1
+
+
+reward_index = RewardIndex()
+
+
+def get_best_cards(db: Session, pairs: list[tuple[str, float]]) -> list[dict | None]:
+    """Best card for each (category, amount) pair, in input order; None where no rule matches.
+
+    Each distinct category is looked up once and all expected returns are scored in one
+    array operation, so a cart of hundreds of lines costs a handful of dict probes.
+    """
+    if not pairs:
+        return []
+    categories = np.array([category.strip().lower() for category, _ in pairs])
+    amounts = np.array([amount for _, amount in pairs], dtype=np.float64)
+    distinct, inverse = np.unique(categories, return_inverse=True)
+
+    names = distinct.tolist()
+    best = [next(iter(reward_index.ranked(db, category)), None) for category in names]
+    multipliers = np.array([card.multiplier if card else np.nan for card in best], dtype=np.float64)
+    expected = np.round(amounts * multipliers[inverse], 2)
+
+    results: list[dict | None] = []
+    for slot, expected_return in zip(inverse.tolist(), expected.tolist()):
+        card = best[slot]
+        if card is None:
+            results.append(None)
+            continue
+        results.append(
+            {
+                "category": names[slot],
+                "account_id": card.account_id,
+                "card_name": card.card_name,
+                "expected_return": expected_return,
+                "rationale": (
+                    f"{card.multiplier:.2f}x effective return ({card.base_multiplier} base + {card.bonus} offer bonus)."
+                ),
+            }
+        )
+    return results
 
 
 def get_best_card_for_category(db: Session, category: str, amount: float) -> dict | None:
-    normalized = category.strip().lower()
-    rule_rows = db.execute(
-        select(RewardRule, Account).join(Account, RewardRule.account_id == Account.id).where(RewardRule.category == normalized)
-    ).all()
-
-    if not rule_rows:
-        return None
-
-    best = None
-    for rule, account in rule_rows:
-        offer = db.execute(
-            select(Offer)
-            .where(Offer.account_id == account.id)
-            .where((Offer.category == normalized) | (Offer.category.is_(None)))
-            .order_by(Offer.bonus_multiplier.desc())
-        ).scalars().first()
-
-        bonus = float(offer.bonus_multiplier) if offer else 0.0
-        multiplier = float(rule.multiplier) + bonus
-        expected_return = round(amount * multiplier, 2)
-        rationale = f"{multiplier:.2f}x effective return ({rule.multiplier} base + {bonus} offer bonus)."
-
-        candidate = {
-            "category": normalized,
-            "account_id": account.id,
-            "card_name": account.name,
-            "expected_return": expected_return,
-            "rationale": rationale,
-        }
-        if best is None or candidate["expected_return"] > best["expected_return"]:
-            best = candidate
-
-    return best
+    return get_best_cards(db, [(category, amount)])[0]
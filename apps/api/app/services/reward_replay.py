@@ -0,0 +1,143 @@
+"""Replay the transaction ledger against reward rules and offers to find missed rewards."""
+
+from collections import defaultdict
+
+import numpy as np
+from sqlalchemy import Float, String, cast, delete, func, select
+from sqlalchemy.orm import Session
+
+from app.models.account import Account
+from app.models.reward import Recommendation
+from app.models.transaction import Transaction
+from app.services.recommendation import reward_index
+
+REPLAY_CHUNK_SIZE = 50_000
+
+_METRICS = ("transactions", "reward_earned", "reward_optimal", "reward_missed")
+
+
+class _Totals:
+    """Running sums of the replay metrics per group key, fed one chunk at a time."""
+
+    def __init__(self) -> None:
+        self.sums: dict = defaultdict(lambda: np.zeros(len(_METRICS)))
+
+    def add(self, keys: np.ndarray, earned: np.ndarray, optimal: np.ndarray) -> None:
+        distinct, inverse = np.unique(keys, return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(distinct))
+        earned_sums = np.bincount(inverse, weights=earned, minlength=len(distinct))
+        optimal_sums = np.bincount(inverse, weights=optimal, minlength=len(distinct))
+        for key, count, earned_sum, optimal_sum in zip(
+            distinct.tolist(), counts.tolist(), earned_sums.tolist(), optimal_sums.tolist()
+        ):
+            self.sums[key] += (count, earned_sum, optimal_sum, optimal_sum - earned_sum)
+
+    def rows(self, key_name: str, label=lambda key: key) -> list[dict]:
+        return [{key_name: label(key), **_metric_values(values)} for key, values in sorted(self.sums.items())]
+
+
+def _metric_values(values: np.ndarray) -> dict:
+    return {"transactions": int(values[0]), **{name: round(float(v), 2) for name, v in zip(_METRICS[1:], values[1:])}}
+
+
+def _multiplier_matrix(db: Session) -> tuple[list[str], list[int], np.ndarray]:
+    """Effective multiplier of every card (columns) in every rule category (rows); 0 where no rule applies."""
+    ranked = reward_index.snapshot(db)
+    categories = sorted(ranked)
+    card_ids = sorted({card.account_id for cards in ranked.values() for card in cards})
+    column = {account_id: index for index, account_id in enumerate(card_ids)}
+    matrix = np.zeros((len(categories), len(card_ids)))
+    for row, category in enumerate(categories):
+        for card in ranked[category]:
+            matrix[row, column[card.account_id]] = max(matrix[row, column[card.account_id]], card.multiplier)
+    return categories, card_ids, matrix
+
+
+def _lookup(values: np.ndarray, mapping: dict, missing: int = -1) -> np.ndarray:
+    """Map array values through a dict, converting each distinct value only once."""
+    distinct, inverse = np.unique(values, return_inverse=True)
+    return np.array([mapping.get(value, missing) for value in distinct.tolist()], dtype=np.int64)[inverse]
+
+
+def replay_optimal_cards(db: Session, persist: bool = False, chunk_size: int = REPLAY_CHUNK_SIZE) -> dict:
+    """Score every spending transaction against the best card for its category.
+
+    Spending is a negative amount; refunds, payments and categories without any reward
+    rule are skipped. The ledger is streamed in `chunk_size` partitions, so memory stays
+    flat regardless of its size. With persist=True, the best card per category is written
+    to the recommendations table, replacing earlier rows for those categories; the caller commits.
+    """
+    categories, card_ids, matrix = _multiplier_matrix(db)
+    summary = {"transactions": 0, "reward_earned": 0.0, "reward_optimal": 0.0, "reward_missed": 0.0}
+    result = {**summary, "by_month": [], "by_category": [], "by_card": []}
+    if not categories:
+        return result
+
+    category_row = {category: row for row, category in enumerate(categories)}
+    card_column = {account_id: column for column, account_id in enumerate(card_ids)}
+    best_column = matrix.argmax(axis=1)
+    best_multiplier = matrix.max(axis=1)
+
+    by_month, by_category, by_card = _Totals(), _Totals(), _Totals()
+    normalized_category = func.lower(Transaction.category)
+    # Casting in SQL skips per-row Decimal and date objects; NumPy parses the
+    # ISO date strings and float columns in bulk instead.
+    statement = (
+        select(
+            Transaction.account_id,
+            cast(Transaction.transaction_date, String),
+            cast(Transaction.amount, Float),
+            normalized_category,
+        )
+        .where(Transaction.amount < 0, normalized_category.in_(categories))
+        .execution_options(yield_per=chunk_size)
+    )
+    for partition in db.connection().execute(statement).partitions():
+        account_ids, dates, amounts, row_categories = (np.array(column) for column in zip(*partition))
+        rows = _lookup(row_categories, category_row)
+        columns = _lookup(account_ids, card_column)
+        spend = -amounts
+
+        used = np.where(columns >= 0, matrix[rows, np.maximum(columns, 0)], 0.0)
+        earned = spend * used
+        optimal = spend * best_multiplier[rows]
+        months = dates.astype("datetime64[D]").astype("datetime64[M]")
+
+        by_month.add(months, earned, optimal)
+        by_category.add(rows, earned, optimal)
+        by_card.add(account_ids.astype(np.int64), earned, optimal)
+
+    names = dict(db.execute(select(Account.id, Account.name).where(Account.id.in_(list(by_card.sums) + card_ids))).all())
+    for values in by_category.sums.values():
+        for name, value in zip(summary, values):
+            summary[name] += value
+    result.update(_metric_values(np.array(list(summary.values()))))
+
+    result["by_month"] = by_month.rows("month", lambda month: month.strftime("%Y-%m"))
+    result["by_category"] = by_category.rows("category", lambda row: categories[row])
+    for entry in result["by_category"]:
+        best = card_ids[best_column[category_row[entry["category"]]]]
+        entry.update(best_account_id=best, best_card_name=names.get(best, ""))
+    result["by_card"] = by_card.rows("account_id")
+    for entry in result["by_card"]:
+        entry["card_name"] = names.get(entry["account_id"], "")
+
+    if persist:
+        _persist_recommendations(db, result["by_category"])
+    return result
+
+
+def _persist_recommendations(db: Session, by_category: list[dict]) -> None:
+    db.execute(delete(Recommendation).where(Recommendation.category.in_([entry["category"] for entry in by_category])))
+    db.add_all(
+        Recommendation(
+            category=entry["category"],
+            account_id=entry["best_account_id"],
+            expected_return=entry["reward_optimal"],
+            rationale=(
+                f"Ledger replay of {entry['transactions']} transactions: {entry['reward_missed']:.2f} "
+                f"missed versus the cards actually used."
+            ),
+        )
+        for entry in by_category
+    )
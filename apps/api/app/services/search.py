@@ -0,0 +1,117 @@
+"""Full-text search over transaction description, merchant and notes.
+
+SQLite keeps an FTS5 external-content table in step with `transactions` through triggers;
+Postgres uses a generated tsvector column with a GIN index (migration 013). Either way the
+index is maintained by the database on every write path, including COPY and bulk upserts.
+"""
+
+import re
+
+from sqlalchemy import column, desc, func, literal_column, select, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.transaction import Transaction
+
+FTS_TABLE = "transactions_fts"
+# Relative weight of description, merchant and notes matches when ranking.
+FTS_WEIGHTS = (2.0, 3.0, 1.0)
+
+_SQLITE_INDEX = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        description, merchant, notes,
+        content='transactions', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, description, merchant, notes)
+        VALUES (new.id, new.description, new.merchant, new.notes);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description, merchant, notes)
+        VALUES ('delete', old.id, old.description, old.merchant, old.notes);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF description, merchant, notes ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description, merchant, notes)
+        VALUES ('delete', old.id, old.description, old.merchant, old.notes);
+        INSERT INTO {FTS_TABLE}(rowid, description, merchant, notes)
+        VALUES (new.id, new.description, new.merchant, new.notes);
+    END""",
+]
+
+_POSTGRES_INDEX = [
+    """ALTER TABLE transactions ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(merchant, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+        || setweight(to_tsvector('simple', coalesce(notes, '')), 'C')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_transactions_search_vector ON transactions USING GIN (search_vector)",
+]
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """Create the search index if it is missing, filling it from existing rows. Safe to run on every startup."""
+    with engine.begin() as connection:
+        if engine.dialect.name == "postgresql":
+            for statement in _POSTGRES_INDEX:
+                connection.execute(text(statement))
+        elif engine.dialect.name == "sqlite":
+            # Triggers go away with the transactions table, so their absence means the
+            # FTS content may be stale (or empty) and has to be rebuilt.
+            triggers_present = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = :name"),
+                {"name": f"{FTS_TABLE}_ai"},
+            ).first()
+            for statement in _SQLITE_INDEX:
+                connection.execute(text(statement))
+            if not triggers_present:
+                connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def drop_search_triggers(engine: Engine) -> None:
+    """Stop per-row index upkeep on SQLite ahead of a bulk load.
+
+    The next ensure_search_index call sees the triggers missing, recreates them and rebuilds
+    the index in one pass, which is far cheaper than a trigger firing for every inserted row.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as connection:
+        for suffix in ("ai", "ad", "au"):
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}"))
+
+
+def search_terms(query: str) -> list[str]:
+    """Words of the query, lowercased; punctuation never reaches the FTS query syntax."""
+    return [term.lower() for term in _TERM.findall(query)]
+
+
+def search_transactions(db: Session, query: str, limit: int, account_id: int | None = None) -> list[Transaction]:
+    """Best matches first; every term must match a word or the start of one."""
+    terms = search_terms(query)
+    if not terms:
+        return []
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        fts = table(FTS_TABLE, column("rowid"))
+        match = " ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(str(weight) for weight in FTS_WEIGHTS)
+        statement = (
+            select(Transaction)
+            .join(fts, fts.c.rowid == Transaction.id)
+            .where(text(f"{FTS_TABLE} MATCH :match").bindparams(match=match))
+            .order_by(text(f"bm25({FTS_TABLE}, {weights})"))
+        )
+    elif dialect == "postgresql":
+        vector = literal_column("transactions.search_vector")
+        tsquery = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        statement = select(Transaction).where(vector.op("@@")(tsquery)).order_by(desc(func.ts_rank(vector, tsquery)))
+    else:
+        raise NotImplementedError(f"Full-text search is not supported on {dialect}")
+
+    if account_id is not None:
+        statement = statement.where(Transaction.account_id == account_id)
+    statement = statement.order_by(Transaction.transaction_date.desc(), Transaction.id.desc()).limit(limit)
+    return list(db.scalars(statement))
@@ -0,0 +1,232 @@
+"""Monthly spending rollup kept current by the transaction writers, and the queries it serves.
+
+Every writer that adds, changes or removes transactions passes the affected rows through
+here, so GET /analytics/spending never has to group the raw ledger for whole months.
+"""
+
+from collections.abc import Mapping, Sequence
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import Float, String, and_, case, cast, delete, func, select
+from sqlalchemy.orm import Session
+
+from app.db.upsert import upsert
+from app.models.rollup import SpendingRollup
+from app.models.transaction import Transaction
+
+SPENDING_DIMENSIONS = ("month", "account_id", "category", "merchant")
+SPENDING_KEY = ["account_id", "month", "category", "merchant"]
+REBUILD_CHUNK_SIZE = 50_000
+
+_MEASURES = ("amount", "outflow", "transaction_count")
+
+
+def _text_key(values: Sequence[str | None]) -> np.ndarray:
+    return np.array(["" if value is None else value for value in values], dtype=object)
+
+
+def spending_rollup_rows(
+    account_ids: Sequence[int],
+    dates: Sequence,
+    amounts: Sequence[float],
+    categories: Sequence[str | None],
+    merchants: Sequence[str | None],
+    weights: Sequence[int] | None = None,
+) -> list[dict]:
+    """Sum transactions into rollup rows; a weight of -1 takes a transaction back out."""
+    amounts = np.asarray(amounts, dtype=np.float64)
+    if not len(amounts):
+        return []
+    weights = np.ones(len(amounts)) if weights is None else np.asarray(weights, dtype=np.float64)
+    months = np.asarray(dates, dtype="datetime64[D]").astype("datetime64[M]").astype("datetime64[D]")
+    columns = (np.asarray(account_ids, dtype=np.int64), months, _text_key(categories), _text_key(merchants))
+
+    distinct, codes = zip(*(np.unique(column, return_inverse=True) for column in columns))
+    key = np.ravel_multi_index(codes, tuple(len(values) for values in distinct))
+    groups, inverse = np.unique(key, return_inverse=True)
+    sums = [
+        np.bincount(inverse, weights=values * weights, minlength=len(groups))
+        for values in (amounts, np.maximum(-amounts, 0.0), np.ones(len(amounts)))
+    ]
+    positions = np.unravel_index(groups, tuple(len(values) for values in distinct))
+    keys = zip(*(values[position].tolist() for values, position in zip(distinct, positions)))
+    return [
+        {
+            "account_id": account_id,
+            "month": month,
+            "category": category,
+            "merchant": merchant,
+            "amount": round(amount, 2),
+            "outflow": round(outflow, 2),
+            "transaction_count": int(round(count)),
+        }
+        for (account_id, month, category, merchant), amount, outflow, count in zip(
+            keys, *(values.tolist() for values in sums)
+        )
+    ]
+
+
+def record_spending(
+    db: Session,
+    account_ids: Sequence[int],
+    dates: Sequence,
+    amounts: Sequence[float],
+    categories: Sequence[str | None],
+    merchants: Sequence[str | None],
+    weights: Sequence[int] | None = None,
+) -> None:
+    """Add (or, with negative weights, subtract) transactions to the rollup; the caller commits."""
+    rows = spending_rollup_rows(account_ids, dates, amounts, categories, merchants, weights)
+    upsert(db, SpendingRollup.__table__, rows, SPENDING_KEY, update_columns=[], increment_columns=list(_MEASURES))
+    if weights is not None and min(weights, default=1) < 0:
+        db.execute(
+            delete(SpendingRollup).where(
+                SpendingRollup.transaction_count <= 0,
+                SpendingRollup.account_id.in_({row["account_id"] for row in rows}),
+            )
+        )
+
+
+def record_spending_changes(db: Session, added: Sequence[Mapping], removed: Sequence[Mapping]) -> None:
+    """Apply row-level ledger edits: `removed` holds the old versions of changed or deleted rows."""
+    rows = [*added, *removed]
+    if not rows:
+        return
+    record_spending(
+        db,
+        [row["account_id"] for row in rows],
+        [row["transaction_date"] for row in rows],
+        [float(row["amount"]) for row in rows],
+        [row["category"] for row in rows],
+        [row["merchant"] for row in rows],
+        weights=[1] * len(added) + [-1] * len(removed),
+    )
+
+
+def rebuild_spending(db: Session, chunk_size: int = REBUILD_CHUNK_SIZE) -> None:
+    """Recompute the whole rollup from the ledger, streaming it in chunks."""
+    db.execute(delete(SpendingRollup))
+    statement = select(
+        Transaction.account_id,
+        cast(Transaction.transaction_date, String),
+        cast(Transaction.amount, Float),
+        Transaction.category,
+        Transaction.merchant,
+    ).execution_options(yield_per=chunk_size)
+    for partition in db.connection().execute(statement).partitions():
+        record_spending(db, *zip(*partition))
+
+
+def backfill_spending_if_empty(db: Session) -> None:
+    """Build the rollup once for databases whose ledger predates it."""
+    has_rollup = db.execute(select(SpendingRollup.account_id).limit(1)).first()
+    if has_rollup is None and db.execute(select(Transaction.id).limit(1)).first():
+        rebuild_spending(db)
+        db.commit()
+
+
+def _month_end(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+
+
+def _split_range(start: date | None, end: date | None) -> tuple[tuple[date | None, date | None] | None, list]:
+    """Whole months served by the rollup, plus up to two partial months read from the ledger."""
+    edges = []
+    first_full, last_full = start, end
+    if start and start.day != 1:
+        edges.append((start, min(end, _month_end(start)) if end else _month_end(start)))
+        first_full = _month_end(start) + timedelta(days=1)
+    if end and end != _month_end(end):
+        if not edges or edges[0][1] < end:
+            edges.append((max(start, end.replace(day=1)) if start else end.replace(day=1), end))
+        last_full = end.replace(day=1) - timedelta(days=1)
+    if first_full and last_full and first_full > last_full:
+        return None, edges
+    return (first_full, last_full.replace(day=1) if last_full else None), edges
+
+
+def _filters(category_column, merchant_column, account_column, account_ids, categories, merchants) -> list:
+    filters = []
+    if account_ids:
+        filters.append(account_column.in_(account_ids))
+    if categories:
+        filters.append(category_column.in_(categories))
+    if merchants:
+        filters.append(merchant_column.in_(merchants))
+    return filters
+
+
+def spending_summary(
+    db: Session,
+    group_by: Sequence[str],
+    start: date | None = None,
+    end: date | None = None,
+    account_ids: Sequence[int] | None = None,
+    categories: Sequence[str] | None = None,
+    merchants: Sequence[str] | None = None,
+) -> list[dict]:
+    """Totals per combination of `group_by` dimensions for transactions dated in [start, end].
+
+    Whole months come from the rollup; a range that starts or ends mid-month adds at most two
+    month-bounded ledger queries. Use '' to filter on a missing category or merchant.
+    """
+    totals: dict[tuple, np.ndarray] = {}
+
+    def add(keys: tuple, values) -> None:
+        totals[keys] = totals.get(keys, np.zeros(3)) + np.array([float(value or 0) for value in values])
+
+    months, edges = _split_range(start, end)
+    if months is not None:
+        columns = {name: getattr(SpendingRollup, name) for name in SPENDING_DIMENSIONS}
+        query = select(
+            *(columns[name] for name in group_by),
+            *(func.sum(cast(getattr(SpendingRollup, measure), Float)) for measure in _MEASURES),
+        ).where(*_filters(columns["category"], columns["merchant"], columns["account_id"], account_ids, categories, merchants))
+        if months[0]:
+            query = query.where(SpendingRollup.month >= months[0])
+        if months[1]:
+            query = query.where(SpendingRollup.month <= months[1])
+        for row in db.execute(query.group_by(*(columns[name] for name in group_by))):
+            add(tuple(row[: len(group_by)]), row[len(group_by) :])
+
+    category = func.coalesce(Transaction.category, "")
+    merchant = func.coalesce(Transaction.merchant, "")
+    amount = cast(Transaction.amount, Float)
+    for edge_start, edge_end in edges:
+        columns = {"account_id": Transaction.account_id, "category": category, "merchant": merchant}
+        grouped = [columns[name] for name in group_by if name != "month"]
+        query = select(
+            *grouped,
+            func.sum(amount),
+            func.sum(case((amount < 0, -amount), else_=0.0)),
+            func.count(Transaction.id),
+        ).where(
+            and_(Transaction.transaction_date >= edge_start, Transaction.transaction_date <= edge_end),
+            *_filters(category, merchant, Transaction.account_id, account_ids, categories, merchants),
+        )
+        if grouped:
+            query = query.group_by(*grouped)
+        for row in db.execute(query):
+            values = dict(zip([name for name in group_by if name != "month"], row[: len(grouped)]))
+            values["month"] = edge_start.replace(day=1)
+            if row[-1]:
+                add(tuple(values[name] for name in group_by), row[len(grouped) :])
+
+    results = []
+    for keys, (amount_sum, outflow, count) in totals.items():
+        entry = {name: None for name in SPENDING_DIMENSIONS}
+        entry.update(zip(group_by, keys))
+        if entry["month"] is not None:
+            entry["month"] = entry["month"].strftime("%Y-%m")
+        entry["category"] = entry["category"] or None
+        entry["merchant"] = entry["merchant"] or None
+        entry.update(
+            amount=round(amount_sum, 2),
+            outflow=round(outflow, 2),
+            inflow=round(amount_sum + outflow, 2),
+            transaction_count=int(count),
+        )
+        if entry["transaction_count"]:
+            results.append(entry)
+    return sorted(results, key=lambda entry: (entry["month"] or "", -entry["outflow"]))
@@ -0,0 +1,73 @@
+"""Dashboard totals, materialized into one row that every balance writer refreshes."""
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.upsert import upsert
+from app.models.account import Account
+from app.models.card import CreditCardDetail
+from app.models.rollup import DashboardSummaryRollup
+
+ACCOUNT_TYPE_BUCKETS = {
+    "checking": "cash",
+    "savings": "cash",
+    "investment": "investments",
+    "retirement": "investments",
+    "credit_card": "card_debt",
+}
+
+SUMMARY_ROW_ID = 1
+
+
+def compute_dashboard_summary(db: Session) -> dict:
+    """Aggregate balances per account_type in SQL and bucket the handful of result rows."""
+    totals = {"cash": 0.0, "investments": 0.0, "card_debt": 0.0}
+    rows = db.execute(
+        select(
+            Account.account_type,
+            func.sum(Account.current_balance),
+            func.sum(func.abs(Account.current_balance)),
+        ).group_by(Account.account_type)
+    )
+    for account_type, balance, absolute in rows:
+        bucket = ACCOUNT_TYPE_BUCKETS.get(account_type)
+        if bucket:
+            # Card debt is reported as a positive amount owed.
+            totals[bucket] += float(absolute if bucket == "card_debt" else balance)
+    card_count = db.execute(select(func.count(CreditCardDetail.id))).scalar_one()
+
+    return {
+        "total_cash": round(totals["cash"], 2),
+        "total_investments": round(totals["investments"], 2),
+        "total_card_debt": round(totals["card_debt"], 2),
+        "upcoming_due_count": card_count,
+    }
+
+
+def refresh_dashboard_summary(db: Session) -> None:
+    """Recompute the materialized row inside the caller's transaction; the caller commits.
+
+    The row is locked (FOR UPDATE) before aggregating, so concurrent writers refresh it one
+    after another and each aggregate sees the balances the previous one committed. SQLite
+    already serializes writers.
+    """
+    upsert(db, DashboardSummaryRollup.__table__, [{"id": SUMMARY_ROW_ID}], index_elements=["id"], update_columns=[])
+    row = db.get(DashboardSummaryRollup, SUMMARY_ROW_ID, with_for_update=True, populate_existing=True)
+    summary = compute_dashboard_summary(db)
+    row.total_cash = summary["total_cash"]
+    row.total_investments = summary["total_investments"]
+    row.total_card_debt = summary["total_card_debt"]
+    row.card_count = summary["upcoming_due_count"]
+
+
+def get_dashboard_summary(db: Session) -> dict:
+    """Single-row lookup; falls back to the live aggregate until the first refresh."""
+    row = db.get(DashboardSummaryRollup, SUMMARY_ROW_ID)
+    if row is None:
+        return compute_dashboard_summary(db)
+    return {
+        "total_cash": float(row.total_cash),
+        "total_investments": float(row.total_investments),
+        "total_card_debt": float(row.total_card_debt),
+        "upcoming_due_count": row.card_count,
+    }
@@ -0,0 +1,6 @@
+ALTER TABLE import_jobs ADD COLUMN IF NOT EXISTS rows_total INT;
+ALTER TABLE import_jobs ADD COLUMN IF NOT EXISTS rows_processed INT NOT NULL DEFAULT 0;
+ALTER TABLE import_jobs ADD COLUMN IF NOT EXISTS rows_rejected INT NOT NULL DEFAULT 0;
+ALTER TABLE import_jobs ADD COLUMN IF NOT EXISTS rows_per_sec DOUBLE PRECISION;
+ALTER TABLE import_jobs ADD COLUMN IF NOT EXISTS started_at TIMESTAMPTZ;
+ALTER TABLE import_jobs ADD COLUMN IF NOT EXISTS finished_at TIMESTAMPTZ;
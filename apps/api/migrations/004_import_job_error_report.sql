@@ -0,0 +1 @@
+ALTER TABLE import_jobs ADD COLUMN IF NOT EXISTS error_report JSON;
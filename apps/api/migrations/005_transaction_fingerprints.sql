@@ -0,0 +1,23 @@
+ALTER TABLE transactions ADD COLUMN IF NOT EXISTS fingerprint VARCHAR(64);
+ALTER TABLE import_jobs ADD COLUMN IF NOT EXISTS rows_duplicate INT NOT NULL DEFAULT 0;
+
+-- Backfill existing rows with the same key format as app/services/fingerprint.py.
+UPDATE transactions AS t
+SET fingerprint = encode(sha256(convert_to(k.key || '|' || k.ordinal, 'UTF8')), 'hex')
+FROM (
+  SELECT
+    id,
+    key,
+    ROW_NUMBER() OVER (PARTITION BY key ORDER BY id) - 1 AS ordinal
+  FROM (
+    SELECT
+      id,
+      account_id || '|' || transaction_date::text || '|' || amount::text || '|'
+        || regexp_replace(upper(btrim(description)), '\s+', ' ', 'g') AS key
+    FROM transactions
+    WHERE fingerprint IS NULL
+  ) AS keyed
+) AS k
+WHERE t.id = k.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_transactions_fingerprint ON transactions(fingerprint);
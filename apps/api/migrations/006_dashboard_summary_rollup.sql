@@ -0,0 +1,9 @@
+CREATE TABLE IF NOT EXISTS dashboard_summary_rollup (
+  id INT PRIMARY KEY,
+  total_cash NUMERIC(14,2) NOT NULL DEFAULT 0,
+  total_investments NUMERIC(14,2) NOT NULL DEFAULT 0,
+  total_card_debt NUMERIC(14,2) NOT NULL DEFAULT 0,
+  card_count INT NOT NULL DEFAULT 0,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
@@ -0,0 +1,4 @@
+ALTER TABLE plaid_items ADD COLUMN IF NOT EXISTS transactions_cursor TEXT;
+ALTER TABLE transactions ADD COLUMN IF NOT EXISTS external_id VARCHAR(64);
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_transactions_external_id ON transactions(external_id);
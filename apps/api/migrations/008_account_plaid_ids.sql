@@ -0,0 +1,5 @@
+ALTER TABLE accounts ADD COLUMN IF NOT EXISTS plaid_item_id INT REFERENCES plaid_items(id);
+ALTER TABLE accounts ADD COLUMN IF NOT EXISTS plaid_account_id VARCHAR(64);
+
+CREATE INDEX IF NOT EXISTS ix_accounts_plaid_item_id ON accounts(plaid_item_id);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_accounts_plaid_account_id ON accounts(plaid_account_id);
@@ -0,0 +1,10 @@
+-- Keyset pagination over (transaction_date, id), alone or scoped to one account, category or merchant.
+CREATE INDEX IF NOT EXISTS ix_transactions_date_id ON transactions(transaction_date, id);
+CREATE INDEX IF NOT EXISTS ix_transactions_account_date_id ON transactions(account_id, transaction_date, id);
+CREATE INDEX IF NOT EXISTS ix_transactions_category_date_id ON transactions(category, transaction_date, id);
+CREATE INDEX IF NOT EXISTS ix_transactions_merchant_date_id ON transactions(merchant, transaction_date, id);
+
+-- Superseded by the composites above (created by earlier create_all runs).
+DROP INDEX IF EXISTS ix_transactions_account_id;
+DROP INDEX IF EXISTS ix_transactions_transaction_date;
+DROP INDEX IF EXISTS ix_transactions_category;
@@ -0,0 +1,4 @@
+CREATE INDEX IF NOT EXISTS ix_balance_snapshots_account_date ON balance_snapshots(account_id, snapshot_date);
+
+-- Superseded by the composite above (created by earlier create_all runs).
+DROP INDEX IF EXISTS ix_balance_snapshots_account_id;
@@ -0,0 +1,9 @@
+-- Per-bucket totals on change days only; the API builds it from existing snapshots on first startup.
+CREATE TABLE IF NOT EXISTS net_worth_daily (
+  bucket VARCHAR(16) NOT NULL,
+  day DATE NOT NULL,
+  total NUMERIC(14,2) NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (bucket, day)
+);
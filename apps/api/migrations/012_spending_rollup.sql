@@ -0,0 +1,28 @@
+-- Monthly sums per account, category and merchant; '' stands in for a missing category or merchant.
+CREATE TABLE IF NOT EXISTS spending_rollup (
+  account_id INT NOT NULL REFERENCES accounts(id),
+  month DATE NOT NULL,
+  category VARCHAR(80) NOT NULL DEFAULT '',
+  merchant VARCHAR(120) NOT NULL DEFAULT '',
+  amount NUMERIC(16,2) NOT NULL DEFAULT 0,
+  outflow NUMERIC(16,2) NOT NULL DEFAULT 0,
+  transaction_count INT NOT NULL DEFAULT 0,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (account_id, month, category, merchant)
+);
+
+CREATE INDEX IF NOT EXISTS ix_spending_rollup_month ON spending_rollup(month);
+
+INSERT INTO spending_rollup (account_id, month, category, merchant, amount, outflow, transaction_count)
+SELECT
+  account_id,
+  date_trunc('month', transaction_date)::date,
+  COALESCE(category, ''),
+  COALESCE(merchant, ''),
+  SUM(amount),
+  SUM(CASE WHEN amount < 0 THEN -amount ELSE 0 END),
+  COUNT(*)
+FROM transactions
+GROUP BY 1, 2, 3, 4
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,8 @@
+-- Full-text search; mirrors app/services/search.py, which also applies it at startup.
+ALTER TABLE transactions ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+  setweight(to_tsvector('simple', coalesce(merchant, '')), 'A')
+  || setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+  || setweight(to_tsvector('simple', coalesce(notes, '')), 'C')
+) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_transactions_search_vector ON transactions USING GIN (search_vector);
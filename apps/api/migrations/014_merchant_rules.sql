@@ -0,0 +1,9 @@
+CREATE TABLE IF NOT EXISTS merchant_rules (
+  id SERIAL PRIMARY KEY,
+  pattern VARCHAR(120) UNIQUE NOT NULL,
+  merchant VARCHAR(120) NOT NULL,
+  category VARCHAR(80),
+  priority INT NOT NULL DEFAULT 0,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
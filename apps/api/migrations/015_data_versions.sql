@@ -0,0 +1,6 @@
+CREATE TABLE IF NOT EXISTS data_versions (
+  name VARCHAR(40) PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 0,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
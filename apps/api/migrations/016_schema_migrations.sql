@@ -0,0 +1,5 @@
+-- Applied migration files; the API checks this at startup instead of running create_all.
+CREATE TABLE IF NOT EXISTS schema_migrations (
+  version VARCHAR(120) PRIMARY KEY,
+  applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
@@ -0,0 +1,28 @@
+import os
+import tempfile
+
+import pytest
+
+# Point the app at a throwaway SQLite file before app.db.session builds its engine.
+_db_dir = tempfile.mkdtemp(prefix="account_manager_test_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.db import base  # noqa: E402,F401 - registers every model on Base.metadata
+from app.api.caching import response_cache  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.services.categorizer import merchant_rule_index  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    # Process-local caches would outlive the recreated tables (data versions restart at 0).
+    merchant_rule_index.invalidate()
+    response_cache.clear()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,57 @@
+import asyncio
+import os
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api import dashboard
+from app.db import session as db_session
+from app.db.session import async_database_url
+from app.main import app
+
+
+def test_async_routes_run_on_the_async_engine(db, monkeypatch):
+    async_engine = create_async_engine(async_database_url(os.environ["DATABASE_URL"]))
+    async_session = async_sessionmaker(async_engine, expire_on_commit=False)
+    monkeypatch.setattr(db_session, "AsyncSessionLocal", async_session)
+    monkeypatch.setattr(db_session, "AsyncReadSessionLocal", async_session)
+    with TestClient(app) as client:
+        client.post("/accounts", json={"name": "Checking", "account_type": "checking", "current_balance": 25})
+        accounts = client.get("/accounts").json()
+        summary = client.get("/dashboard/summary").json()
+        transactions = client.get("/transactions")
+    pooled = async_engine.sync_engine.pool.checkedin()
+    asyncio.run(async_engine.dispose())
+
+    assert [account["name"] for account in accounts] == ["Checking"]
+    assert summary["total_cash"] == 25.0
+    assert transactions.status_code == 200 and transactions.json() == []
+    assert pooled >= 1
+
+
+def test_cpu_bound_services_stay_off_the_event_loop(db, monkeypatch):
+    async_engine = create_async_engine(async_database_url(os.environ["DATABASE_URL"]))
+    monkeypatch.setattr(db_session, "AsyncReadSessionLocal", async_sessionmaker(async_engine, expire_on_commit=False))
+    on_loop = []
+
+    def upcoming_due_dates(session, today):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return []
+
+    monkeypatch.setattr(dashboard, "upcoming_due_dates", upcoming_due_dates)
+    with TestClient(app) as client:
+        response = client.get("/due-dates/upcoming")
+    asyncio.run(async_engine.dispose())
+
+    assert response.status_code == 200
+    assert on_loop == [False]
+
+
+def test_async_database_urls():
+    assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert async_database_url("postgresql://u:p@db/app") == "postgresql+psycopg://u:p@db/app"
+    assert async_database_url("postgresql+psycopg://u:p@db/app") == "postgresql+psycopg://u:p@db/app"
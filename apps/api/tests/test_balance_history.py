@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.balance_history import lttb
+from app.services.csv_import import process_csv_import
+
+
+def _import_balances(db, rows):
+    content = "account_id,snapshot_date,balance\n" + "\n".join(f"{a},{d},{b}" for a, d, b in rows)
+    process_csv_import(db, content.encode(), "balances", "bank.csv")
+
+
+def test_balances_bucket_last_min_max(db):
+    with TestClient(app) as client:
+        checking = client.post("/accounts", json={"name": "Checking", "account_type": "checking"}).json()["id"]
+        savings = client.post("/accounts", json={"name": "Savings", "account_type": "savings"}).json()["id"]
+        _import_balances(
+            db,
+            [
+                (checking, "2024-01-29", 100),  # Monday
+                (checking, "2024-01-31", 40),
+                (checking, "2024-02-01", 70),
+                (checking, "2024-02-01", 75),  # later row on the same day wins
+                (checking, "2024-02-05", 90),  # next Monday
+                (savings, "2024-01-15", 500),
+            ],
+        )
+
+        weekly = client.get(f"/accounts/{checking}/balances?bucket=week").json()
+        monthly = client.get(f"/accounts/balances?account_id={savings}&account_id={checking}&bucket=month").json()
+        missing = client.get("/accounts/999/balances")
+
+    assert weekly["points"] == [
+        {"date": "2024-01-29", "balance": 75.0, "min": 40.0, "max": 100.0},
+        {"date": "2024-02-05", "balance": 90.0, "min": 90.0, "max": 90.0},
+    ]
+    assert [series["account_id"] for series in monthly] == [savings, checking]
+    assert monthly[1]["points"] == [
+        {"date": "2024-01-01", "balance": 40.0, "min": 40.0, "max": 100.0},
+        {"date": "2024-02-01", "balance": 90.0, "min": 70.0, "max": 90.0},
+    ]
+    assert missing.status_code == 404
+
+
+def test_long_histories_are_downsampled_to_max_points(db):
+    x = np.arange(1000, dtype=np.float64)
+    y = np.sin(x / 50)
+    kept = lttb(x, y, 100)
+    assert len(kept) == 100 and kept[0] == 0 and kept[-1] == 999
+    assert np.all(np.diff(kept) > 0)
+
+    with TestClient(app) as client:
+        account = client.post("/accounts", json={"name": "Checking", "account_type": "checking"}).json()["id"]
+        start = date(2015, 1, 1)
+        _import_balances(db, [(account, start + timedelta(days=day), day % 97) for day in range(3650)])
+        points = client.get(f"/accounts/{account}/balances?max_points=200").json()["points"]
+
+    assert len(points) == 200
+    assert (points[0]["date"], points[-1]["date"]) == ("2015-01-01", str(start + timedelta(days=3649)))
+    assert min(point["min"] for point in points) == 0 and max(point["max"] for point in points) == 96
@@ -0,0 +1,47 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.db.session import engine, read_engine
+from app.main import app
+
+
+class _StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        for bound in {engine, read_engine}:
+            event.listen(bound, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        for bound in {engine, read_engine}:
+            event.remove(bound, "before_cursor_execute", self)
+
+
+def test_read_routes_revalidate_with_etags_and_serve_unchanged_data_from_cache(db):
+    with TestClient(app) as client:
+        client.post("/accounts", json={"name": "Checking", "account_type": "checking", "current_balance": 10})
+        first = client.get("/accounts")
+        etag = first.headers["ETag"]
+
+        not_modified = client.get("/accounts", headers={"If-None-Match": etag})
+        with _StatementCounter() as statements:
+            cached = client.get("/accounts")
+        other_page = client.get("/accounts?limit=1")
+
+        client.post("/accounts", json={"name": "Savings", "account_type": "savings"})
+        changed = client.get("/accounts", headers={"If-None-Match": etag})
+        summary = client.get("/dashboard/summary")
+
+    assert first.status_code == 200 and first.headers["Cache-Control"] == "no-cache"
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert cached.json() == first.json()
+    assert statements.count == 1  # the data_versions lookup only
+    assert other_page.headers["ETag"] != etag
+    assert changed.status_code == 200 and [row["name"] for row in changed.json()] == ["Checking", "Savings"]
+    assert changed.headers["ETag"] != etag
+    assert summary.json()["total_cash"] == 10.0
@@ -0,0 +1,96 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.merchant_rule import MerchantRule
+from app.models.rollup import SpendingRollup
+from app.models.transaction import Transaction
+from app.services.categorizer import Categorizer, categorize_columns, categorize_rows
+from app.services.data_versions import MERCHANT_RULES, bump_versions
+from app.services.csv_import import process_csv_import
+
+
+def _rule(rule_id, pattern, merchant, category, priority=0):
+    return type("Rule", (), dict(id=rule_id, pattern=pattern, merchant=merchant, category=category, priority=priority))
+
+
+def test_matcher_prefers_priority_then_longer_patterns_on_word_boundaries():
+    categorizer = Categorizer(
+        [
+            _rule(1, "BLUE", "Blue Apron", "groceries"),
+            _rule(2, "BLUE BOTTLE", "Blue Bottle", "dining"),
+            _rule(3, "SHELL", "Shell", "gas"),
+            _rule(4, "AMZN", "Amazon", "shopping"),
+            _rule(5, "AMZN PRIME VIDEO", "Prime Video", "streaming"),
+            _rule(6, "PRIME", "Amazon Prime", "subscriptions", priority=1),
+        ]
+    )
+    assert categorizer.match("SQ *BLUE BOTTLE 1234").merchant == "Blue Bottle"
+    assert categorizer.match("blue apron meal kit").merchant == "Blue Apron"
+    assert categorizer.match("SHELLFISH SHACK") is None
+    assert categorizer.match("Shell Oil 5731").category == "gas"
+    assert categorizer.match("AMZN Mktp US*2K4").merchant == "Amazon"
+    assert categorizer.match("AMZN PRIME VIDEO*1A2").merchant == "Amazon Prime"
+
+    many = Categorizer([_rule(i, f"MERCHANT {i}", f"Merchant {i}", "misc") for i in range(1, 20_001)])
+    assert many.match("POS MERCHANT 12345 SF CA").merchant == "Merchant 12345"
+    assert many.match("POS MERCHANT 20001") is None
+
+
+def test_rules_fill_imports_and_recategorize_history(db):
+    header = "account_id,transaction_date,description,amount,category,merchant\n"
+    with TestClient(app) as client:
+        account = client.post("/accounts", json={"name": "Card", "account_type": "credit_card"}).json()["id"]
+        process_csv_import(db, (header + f"{account},2024-01-02,SQ *BLUE BOTTLE 1234,-5.00,,\n").encode(), "transactions", "a.csv")
+
+        client.post("/merchant-rules", json={"pattern": "sq *blue bottle", "merchant": "Blue Bottle", "category": "Dining"})
+        duplicate = client.post("/merchant-rules", json={"pattern": "SQ BLUE  BOTTLE", "merchant": "x"})
+        client.put("/merchant-rules", json={"items": [{"pattern": "uber trip", "merchant": "Uber", "category": "travel"}]})
+        content = header + f"{account},2024-01-03,UBER *TRIP HELP.UBER.COM,-20.00,,\n{account},2024-01-04,UBER TRIP,-9.00,rides,\n"
+        process_csv_import(db, content.encode(), "transactions", "b.csv")
+
+        result = client.post("/merchant-rules/recategorize").json()
+
+    assert duplicate.status_code == 409
+    rows = {row.description: (row.merchant, row.category) for row in db.query(Transaction)}
+    assert rows == {
+        "SQ *BLUE BOTTLE 1234": ("Blue Bottle", "dining"),
+        "UBER *TRIP HELP.UBER.COM": ("Uber", "travel"),
+        "UBER TRIP": ("Uber", "rides"),
+    }
+    assert result == {"transactions_scanned": 3, "transactions_updated": 1}
+    spending = {(r.category, r.merchant): float(r.outflow) for r in db.query(SpendingRollup)}
+    assert spending == {("dining", "Blue Bottle"): 5.0, ("travel", "Uber"): 20.0, ("rides", "Uber"): 9.0}
+
+
+def test_rules_written_by_another_worker_are_picked_up_and_empty_values_count_as_missing(db):
+    descriptions = np.array(["SQ *BLUE BOTTLE 1234"], dtype=object)
+    assert categorize_columns(db, descriptions, np.array([None], dtype=object), np.array([None], dtype=object))[0][0] is None
+
+    # Written the way another worker would: this process's index is never invalidated.
+    db.add(MerchantRule(pattern="BLUE BOTTLE", merchant="Blue Bottle", category="dining", priority=0))
+    bump_versions(db, MERCHANT_RULES)
+    db.commit()
+
+    merchants, categories = categorize_columns(db, descriptions, np.array([""], dtype=object), np.array([None], dtype=object))
+    rows = [{"description": descriptions[0], "merchant": "", "category": None}]
+    categorize_rows(db, rows)
+    assert (merchants[0], categories[0]) == ("Blue Bottle", "dining")
+    assert (rows[0]["merchant"], rows[0]["category"]) == ("Blue Bottle", "dining")
+
+
+def test_overwriting_with_a_merchant_only_rule_keeps_the_category(db):
+    header = "account_id,transaction_date,description,amount,category,merchant\n"
+    with TestClient(app) as client:
+        account = client.post("/accounts", json={"name": "Card", "account_type": "credit_card"}).json()["id"]
+        content = header + f"{account},2024-01-02,SQ *BLUE BOTTLE 1234,-5.00,coffee,Square\n"
+        process_csv_import(db, content.encode(), "transactions", "a.csv")
+        client.post("/merchant-rules", json={"pattern": "blue bottle", "merchant": "Blue Bottle"})
+
+        result = client.post("/merchant-rules/recategorize?overwrite=true").json()
+
+    assert result["transactions_updated"] == 1
+    row = db.query(Transaction).one()
+    assert (row.merchant, row.category) == ("Blue Bottle", "coffee")
+    spending = {(r.category, r.merchant): float(r.outflow) for r in db.query(SpendingRollup)}
+    assert spending == {("coffee", "Blue Bottle"): 5.0}
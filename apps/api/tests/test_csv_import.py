@@ -0,0 +1,258 @@
+import time
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.account import Account
+from app.models.balance import BalanceSnapshot
+from app.models.transaction import Transaction
+from app.services.csv_import import process_csv_import
+
+
+def _account(db, name="Checking", account_type="checking"):
+    account = Account(name=name, account_type=account_type, currency="USD", current_balance=0)
+    db.add(account)
+    db.commit()
+    return account
+
+
+def test_balance_import_uses_latest_snapshot_per_account(db):
+    account = _account(db)
+    content = (
+        "account_id,snapshot_date,balance\n"
+        f"{account.id},2024-03-01,100.00\n"
+        f"{account.id},2024-03-05,250.50\n"
+        f"{account.id},2024-03-02,175.00\n"
+        "999,2024-03-01,1.00\n"
+    ).encode()
+
+    job = process_csv_import(db, content, "balances", "bank.csv")
+
+    assert job.status == "completed"
+    assert job.message.startswith("Imported 3 rows (1 rejected, 0 duplicates skipped)")
+    assert "rows/sec" in job.message
+    assert db.query(BalanceSnapshot).count() == 3
+    db.refresh(account)
+    assert account.current_balance == Decimal("250.50")
+
+
+def test_transaction_import_skips_unknown_accounts(db):
+    account = _account(db, "Travel Card", "credit_card")
+    content = (
+        "account_id,transaction_date,description,amount,category,merchant\n"
+        f"{account.id},2024-03-01,Coffee,-4.50,dining,Blue Bottle\n"
+        "999,2024-03-01,Ghost,-1.00,,\n"
+    ).encode()
+
+    job = process_csv_import(db, content, "transactions", "card.csv")
+
+    assert job.status == "completed"
+    rows = db.query(Transaction).all()
+    assert [(row.description, row.merchant) for row in rows] == [("Coffee", "Blue Bottle")]
+
+
+def test_upload_is_queued_and_progress_is_pollable(db):
+    account = _account(db)
+    content = f"account_id,snapshot_date,balance\n{account.id},2024-03-01,42.00\n".encode()
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/imports/csv",
+            files={"file": ("bank.csv", content, "text/csv")},
+            data={"import_type": "balances", "source_name": "bank.csv"},
+        )
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "queued"
+
+        for _ in range(50):
+            job = client.get(f"/imports/{job['id']}").json()
+            if job["status"] in {"completed", "failed"}:
+                break
+            time.sleep(0.05)
+
+    assert job["status"] == "completed"
+    assert job["rows_total"] == 1
+    assert job["rows_processed"] == 1
+    assert job["rows_rejected"] == 0
+
+
+def test_bad_rows_are_rejected_and_reported_without_failing_the_import(db):
+    account = _account(db)
+    content = (
+        "account_id,snapshot_date,balance\n"
+        f"{account.id},2024-03-01,100.00\n"
+        f"{account.id},2024-02-30,1.00\n"
+        f"{account.id},2024-03-02,abc\n"
+        f"x,2024-03-02,5\n"
+        f"{account.id},2024-03-03\n"
+        f"{account.id},2024-03-04,120.00\n"
+        "\u00b2,2024-03-05,7\n"  # a Unicode digit that int() can't parse
+    ).encode()
+
+    job = process_csv_import(db, content, "balances", "bank.csv")
+
+    assert job.status == "completed"
+    assert (job.rows_total, job.rows_processed, job.rows_rejected) == (7, 2, 5)
+    assert {(error["column"], tuple(error["rows"])) for error in job.error_report} == {
+        ("*", (5,)),
+        ("account_id", (4, 7)),
+        ("snapshot_date", (2,)),
+        ("balance", (3,)),
+    }
+    db.refresh(account)
+    assert account.current_balance == Decimal("120.00")
+
+
+def test_dry_run_reports_without_writing(db):
+    content = (
+        "account_id,transaction_date,description,amount\n"
+        "1,2024-03-01,Coffee,-4.50\n"
+        "1,03/01/2024,Lunch,-12.00\n"
+        "1,2024-03-01,,-1.00\n"
+    ).encode()
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/imports/csv/dry-run",
+            files={"file": ("card.csv", content, "text/csv")},
+            data={"import_type": "transactions"},
+        )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["rows_total"], report["rows_valid"], report["rows_rejected"]) == (3, 1, 2)
+    assert [(error["column"], error["reason"]) for error in report["errors"]] == [
+        ("transaction_date", "not a YYYY-MM-DD date"),
+        ("description", "empty"),
+    ]
+    assert db.query(Transaction).count() == 0
+
+
+def test_overlapping_transaction_exports_are_deduplicated(db):
+    account = _account(db, "Travel Card", "credit_card")
+    header = "account_id,transaction_date,description,amount\n"
+    coffee = f"{account.id},2024-03-01,Blue  Bottle,-4.50\n"
+    first = (header + coffee + coffee + f"{account.id},2024-03-02,Lunch,-12.00\n").encode()
+    # The next export overlaps the previous one and re-cases a description.
+    second = (header + coffee + f"{account.id},2024-03-01,BLUE BOTTLE,-4.50\n" + f"{account.id},2024-03-03,Taxi,-20\n").encode()
+
+    process_csv_import(db, first, "transactions", "march-1.csv")
+    job = process_csv_import(db, second, "transactions", "march-2.csv")
+
+    assert job.status == "completed"
+    assert (job.rows_processed, job.rows_duplicate, job.rows_rejected) == (1, 2, 0)
+    assert db.query(Transaction).count() == 4
+
+
+def test_import_commits_each_chunk_and_a_retry_after_a_failure_keeps_the_rollup_consistent(db, monkeypatch):
+    from app.db.session import SessionLocal
+    from app.models.import_job import ImportJob
+    from app.models.rollup import SpendingRollup
+    from app.services import csv_import
+
+    account = _account(db, "Travel Card", "credit_card")
+    rows = "".join(f"{account.id},2024-03-0{day},Coffee {day},-4.50\n" for day in range(1, 7))
+    content = ("account_id,transaction_date,description,amount\n" + f"{account.id},bad,Tea,-2\n" + rows).encode()
+    monkeypatch.setattr(csv_import, "BATCH_SIZE", 2)
+    original = csv_import.record_spending
+    seen_mid_run = []
+
+    def record_spending_then_fail(*args, **kwargs):
+        if seen_mid_run:
+            raise RuntimeError("rollup write failed")
+        original(*args, **kwargs)
+        seen_mid_run.append(None)
+
+    def record_spending_and_poll(*args, **kwargs):
+        # Another connection polls while this chunk's transaction is open.
+        with SessionLocal() as poller:
+            job = poller.query(ImportJob).order_by(ImportJob.id.desc()).first()
+            seen_mid_run.append((job.rows_processed, job.rows_rejected))
+        original(*args, **kwargs)
+
+    monkeypatch.setattr(csv_import, "record_spending", record_spending_then_fail)
+    job = process_csv_import(db, content, "transactions", "card.csv")
+
+    assert (job.status, job.rows_processed, job.rows_rejected) == ("failed", 1, 1)
+    assert db.query(Transaction).count() == 1
+
+    monkeypatch.setattr(csv_import, "record_spending", record_spending_and_poll)
+    job = process_csv_import(db, content, "transactions", "card.csv")
+
+    assert seen_mid_run[1:] == [(0, 1), (2, 1), (4, 1)]
+    assert (job.status, job.rows_processed, job.rows_duplicate, job.rows_rejected) == ("completed", 5, 1, 1)
+    assert db.query(Transaction).count() == 6
+    assert sum(row.transaction_count for row in db.query(SpendingRollup)) == 6
+
+
+def test_chunked_import_keeps_row_numbers_ordinals_and_latest_balance_across_chunks(db, monkeypatch):
+    from app.services import csv_import
+
+    monkeypatch.setattr(csv_import, "BATCH_SIZE", 2)
+    card = _account(db, "Travel Card", "credit_card")
+    checking = _account(db)
+    coffee = f"{card.id},2024-03-01,Coffee,-4.50\n"
+    # The two identical coffees straddle the first chunk boundary; both are real charges.
+    lunch = f"{card.id},2024-03-01,Lunch,-12.00\n"
+    rejected = f"{card.id},2024-03-02,,-1.00\nx,2024-03-02,Tea,-2\n"
+    content = ("account_id,transaction_date,description,amount\n" + lunch + coffee + coffee + rejected).encode()
+    job = process_csv_import(db, content, "transactions", "card.csv")
+
+    assert (job.status, job.rows_total, job.rows_processed, job.rows_rejected) == ("completed", 5, 3, 2)
+    assert {(error["column"], tuple(error["rows"])) for error in job.error_report} == {
+        ("description", (4,)),
+        ("account_id", (5,)),
+    }
+    assert process_csv_import(db, content, "transactions", "card.csv").rows_duplicate == 3
+
+    balances = (
+        "account_id,snapshot_date,balance\n"
+        f"{checking.id},2024-03-05,250.00\n"
+        f"{checking.id},2024-03-01,100.00\n"
+        f"{checking.id},bad,1.00\n"
+        f"{checking.id},2024-03-02,175.00\n"
+        f"{checking.id},2024-03-03,{'9' * 100}\n"
+    ).encode()
+    job = process_csv_import(db, balances, "balances", "bank.csv")
+
+    assert (job.rows_processed, job.rows_rejected) == (3, 2)
+    db.refresh(checking)
+    assert checking.current_balance == Decimal("250.00")
+
+
+def test_interrupted_jobs_are_failed_and_orphaned_spool_files_removed(db, monkeypatch, tmp_path):
+    from app.models.import_job import ImportJob
+    from app.services import import_worker
+    from app.services.csv_import import create_import_job
+
+    monkeypatch.setattr(import_worker, "_spool_dir", lambda: tmp_path)
+    queued = create_import_job(db, "balances", "queued.csv")
+    done = create_import_job(db, "balances", "done.csv")
+    done.status = "completed"
+    db.commit()
+    (tmp_path / "left-over.csv").write_text("account_id,snapshot_date,balance\n")
+
+    assert import_worker.recover_interrupted_jobs() == 1
+
+    db.expire_all()
+    assert db.get(ImportJob, queued.id).status == "failed"
+    assert db.get(ImportJob, done.id).status == "completed"
+    assert list(tmp_path.iterdir()) == []
+
+    def failing_create_import_job(*args):
+        raise RuntimeError("database unavailable")
+
+    from app.api import imports
+
+    monkeypatch.setattr(imports, "create_import_job", failing_create_import_job)
+    with TestClient(app, raise_server_exceptions=False) as client:
+        response = client.post(
+            "/imports/csv",
+            files={"file": ("bank.csv", b"account_id,snapshot_date,balance\n", "text/csv")},
+            data={"import_type": "balances"},
+        )
+
+    assert response.status_code == 500
+    assert list(tmp_path.iterdir()) == []
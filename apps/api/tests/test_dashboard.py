@@ -0,0 +1,141 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.account import Account
+from app.models.balance import BalanceSnapshot
+from app.models.rollup import DashboardSummaryRollup, NetWorthDaily
+from app.services.csv_import import process_csv_import
+from app.services.due_dates import resolve_next_due_date
+from app.services.net_worth import latest_snapshot_id, rebuild_net_worth, record_balance_snapshots
+
+
+def test_summary_is_materialized_by_balance_writers(db):
+    with TestClient(app) as client:
+        checking = client.post("/accounts", json={"name": "Checking", "account_type": "checking", "current_balance": 100})
+        client.post("/accounts", json={"name": "Brokerage", "account_type": "investment", "current_balance": 900})
+        card = client.post("/accounts", json={"name": "Card", "account_type": "credit_card", "current_balance": -250})
+        client.post("/cards", json={"account_id": card.json()["id"], "issuer_name": "Chase", "due_day": 20})
+
+        content = f"account_id,snapshot_date,balance\n{checking.json()['id']},2024-03-01,150.25\n".encode()
+        process_csv_import(db, content, "balances", "bank.csv")
+
+        summary = client.get("/dashboard/summary").json()
+
+    assert summary == {
+        "total_cash": 150.25,
+        "total_investments": 900.0,
+        "total_card_debt": 250.0,
+        "upcoming_due_count": 1,
+    }
+    assert db.query(DashboardSummaryRollup).count() == 1
+
+
+def test_due_days_past_month_end_land_on_the_last_day():
+    assert resolve_next_due_date(31, today=date(2024, 2, 10)) == date(2024, 2, 29)
+    assert resolve_next_due_date(30, today=date(2023, 2, 28)) == date(2023, 2, 28)
+    assert resolve_next_due_date(29, today=date(2024, 4, 30)) == date(2024, 5, 29)
+    assert resolve_next_due_date(15, today=date(2024, 12, 16)) == date(2025, 1, 15)
+
+
+def test_past_due_date_overrides_fall_back_to_the_regular_cycle():
+    today = date(2024, 3, 10)
+    assert resolve_next_due_date(15, date(2024, 3, 12), today=today) == date(2024, 3, 12)
+    assert resolve_next_due_date(15, date(2024, 3, 5), today=today) == date(2024, 4, 15)
+    assert resolve_next_due_date(15, date(2024, 2, 20), today=today) == date(2024, 3, 15)
+
+
+def test_due_date_range_covers_every_cycle(db):
+    with TestClient(app) as client:
+        card = client.post("/accounts", json={"name": "Card", "account_type": "credit_card"}).json()
+        client.post("/cards", json={"account_id": card["id"], "issuer_name": "Amex", "due_day": 31})
+
+        response = client.get("/due-dates", params={"from": "2024-01-15", "to": "2024-04-30"})
+
+    assert response.status_code == 200
+    assert [item["due_date"] for item in response.json()] == ["2024-01-31", "2024-02-29", "2024-03-31", "2024-04-30"]
+
+
+def _net_worth_by_brute_force(db, as_of):
+    totals = {"cash": 0.0, "investments": 0.0, "card_debt": 0.0}
+    buckets = {"checking": "cash", "investment": "investments", "credit_card": "card_debt"}
+    for account in db.query(Account):
+        snapshots = [s for s in account.snapshots if s.snapshot_date <= as_of]
+        if snapshots:
+            latest = max(snapshots, key=lambda s: (s.snapshot_date, s.id))
+            balance = float(latest.balance)
+            totals[buckets[account.account_type]] += abs(balance) if account.account_type == "credit_card" else balance
+    return round(totals["cash"] + totals["investments"] - totals["card_debt"], 2)
+
+
+def test_net_worth_rollup_tracks_backdated_and_same_day_imports(db):
+    with TestClient(app) as client:
+        ids = [
+            client.post("/accounts", json={"name": name, "account_type": kind}).json()["id"]
+            for name, kind in [("Checking", "checking"), ("Brokerage", "investment"), ("Card", "credit_card")]
+        ]
+        checking, brokerage, card = ids
+        imports = [
+            [(checking, "2024-01-10", 100), (brokerage, "2024-01-15", 1000), (card, "2024-01-20", -50)],
+            [(checking, "2024-02-01", 300), (card, "2024-02-01", -80)],
+            # Back-dated history and a same-day correction, arriving after later snapshots.
+            [(checking, "2024-01-05", 20), (brokerage, "2024-01-25", 900), (checking, "2024-02-01", 250)],
+        ]
+        for rows in imports:
+            content = "account_id,snapshot_date,balance\n" + "\n".join(f"{a},{d},{b}" for a, d, b in rows)
+            process_csv_import(db, content.encode(), "balances", "bank.csv")
+
+        point = client.get("/dashboard/net-worth?as_of=2024-01-31").json()
+        history = client.get("/dashboard/net-worth/history?from=2024-01-01&to=2024-03-01").json()
+
+    assert point == {"as_of": "2024-01-31", "cash": 100.0, "investments": 900.0, "card_debt": 50.0, "net_worth": 950.0}
+    assert [(p["as_of"], p["net_worth"]) for p in history] == [
+        ("2024-01-01", 0.0),
+        ("2024-01-05", 20.0),
+        ("2024-01-10", 100.0),
+        ("2024-01-15", 1100.0),
+        ("2024-01-20", 1050.0),
+        ("2024-01-25", 950.0),
+        ("2024-02-01", 1070.0),
+    ]
+    for entry in history:
+        assert entry["net_worth"] == _net_worth_by_brute_force(db, date.fromisoformat(entry["as_of"]))
+
+    incremental = db.query(NetWorthDaily).order_by(NetWorthDaily.bucket, NetWorthDaily.day).all()
+    snapshot = [(row.bucket, row.day, float(row.total)) for row in incremental]
+    rebuild_net_worth(db)
+    rebuilt = db.query(NetWorthDaily).order_by(NetWorthDaily.bucket, NetWorthDaily.day).all()
+    assert [(row.bucket, row.day, float(row.total)) for row in rebuilt] == snapshot
+
+
+def test_concurrent_snapshot_writers_fold_each_snapshot_once(db):
+    checking = Account(name="Checking", account_type="checking", current_balance=0)
+    db.add(checking)
+    db.commit()
+
+    def write(session, day, balance):
+        since_id = latest_snapshot_id(session)
+        session.add(BalanceSnapshot(account_id=checking.id, snapshot_date=day, balance=balance))
+        session.flush()
+        record_balance_snapshots(session, since_id)
+        session.commit()
+
+    first = SessionLocal()
+    since_id = latest_snapshot_id(first)
+    # A second writer arrives between the first one reading its mark and inserting.
+    with SessionLocal() as second_session, ThreadPoolExecutor(max_workers=1) as pool:
+        second = pool.submit(write, second_session, date(2024, 1, 2), 150)
+        time.sleep(0.2)
+        first.add(BalanceSnapshot(account_id=checking.id, snapshot_date=date(2024, 1, 1), balance=100))
+        first.flush()
+        record_balance_snapshots(first, since_id)
+        first.commit()
+        first.close()
+        second.result()
+
+    totals = {(row.day, float(row.total)) for row in db.query(NetWorthDaily).filter(NetWorthDaily.bucket == "cash")}
+    assert totals == {(date(2024, 1, 1), 100.0), (date(2024, 1, 2), 150.0)}
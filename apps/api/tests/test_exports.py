@@ -0,0 +1,84 @@
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.account import Account
+from app.services import exports
+from app.services.csv_import import dry_run_csv_import, process_csv_import
+
+TRANSACTIONS_CSV = (
+    "account_id,transaction_date,description,amount,category,merchant\n"
+    "{checking},2026-01-05,\"BLUE BOTTLE, OAKLAND\",-4.50,dining,Blue Bottle\n"
+    "{checking},2026-01-03,PAYROLL,2500.00,,\n"
+    "{card},2026-02-10,UNITED AIRLINES,-420.10,travel,United\n"
+)
+
+
+@pytest.fixture
+def ledger(db, monkeypatch):
+    # Small partitions so the tests go through several yield_per batches.
+    monkeypatch.setattr(exports, "EXPORT_BATCH_SIZE", 2)
+    checking = Account(name="Checking", account_type="checking", current_balance=0)
+    card = Account(name="Card", account_type="credit_card", current_balance=0)
+    db.add_all([checking, card])
+    db.commit()
+    process_csv_import(
+        db, TRANSACTIONS_CSV.format(checking=checking.id, card=card.id).encode(), "transactions", "t.csv"
+    )
+    balances = f"account_id,snapshot_date,balance\n{checking.id},2026-01-31,1200.00\n{card.id},2026-01-31,-300.25\n"
+    process_csv_import(db, balances.encode(), "balances", "b.csv")
+    return checking.id, card.id
+
+
+def test_csv_export_round_trips_through_the_importer(ledger):
+    checking, card = ledger
+    with TestClient(app) as client:
+        response = client.get("/exports/transactions")
+        filtered = client.get("/exports/transactions", params={"account_id": checking, "from": "2026-01-04"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="transactions.csv"' in response.headers["content-disposition"]
+    lines = response.text.splitlines()
+    assert lines[0] == "account_id,transaction_date,description,amount,category,merchant"
+    assert lines[1:] == [
+        f"{checking},2026-01-03,PAYROLL,2500.00,,",
+        f'{checking},2026-01-05,"BLUE BOTTLE, OAKLAND",-4.50,dining,Blue Bottle',
+        f"{card},2026-02-10,UNITED AIRLINES,-420.10,travel,United",
+    ]
+    assert dry_run_csv_import(response.content, "transactions")["rows_valid"] == 3
+    assert filtered.text.splitlines()[1:] == [lines[2]]
+
+
+def test_ndjson_exports(ledger):
+    checking, card = ledger
+    with TestClient(app) as client:
+        ndjson = client.get("/exports/balances", params={"format": "ndjson"})
+        bad_range = client.get("/exports/balances", params={"from": "2026-02-01", "to": "2026-01-01"})
+
+    assert [json.loads(line) for line in ndjson.text.splitlines()] == [
+        {"account_id": checking, "snapshot_date": "2026-01-31", "balance": 1200.0},
+        {"account_id": card, "snapshot_date": "2026-01-31", "balance": -300.25},
+    ]
+    assert bad_range.status_code == 400
+
+
+def test_parquet_exports(ledger):
+    pq = pytest.importorskip("pyarrow.parquet")
+    with TestClient(app) as client:
+        parquet = client.get("/exports/transactions", params={"format": "parquet", "max_amount": 0})
+
+    assert parquet.status_code == 200
+    table = pq.read_table(io.BytesIO(parquet.content))
+    assert table.column_names == ["account_id", "transaction_date", "description", "amount", "category", "merchant"]
+    assert table.column("description").to_pylist() == ["BLUE BOTTLE, OAKLAND", "UNITED AIRLINES"]
+
+
+def test_parquet_without_pyarrow_is_rejected_before_streaming(ledger, monkeypatch):
+    monkeypatch.setattr(exports, "parquet_available", lambda: False)
+    with TestClient(app) as client:
+        response = client.get("/exports/transactions", params={"format": "parquet"})
+    assert response.status_code == 501
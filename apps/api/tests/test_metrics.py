@@ -0,0 +1,56 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.metrics import IMPORT_ROWS, OVER_QUERY_BUDGET, REQUEST_STATEMENTS, MetricsMiddleware
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.account import Account
+from app.services.csv_import import process_csv_import
+
+
+def test_metrics_endpoint_reports_routes_pool_and_imports(db):
+    account = Account(name="Checking", account_type="checking", current_balance=0)
+    db.add(account)
+    db.commit()
+    account_id = account.id
+    rows_before = IMPORT_ROWS.value("transactions")
+    content = f"account_id,transaction_date,description,amount\n{account_id},2026-01-02,COFFEE,-4.50\n"
+    process_csv_import(db, content.encode(), "transactions", "t.csv")
+    with TestClient(app) as client:
+        before = REQUEST_STATEMENTS.count("GET", "/accounts/{account_id}/balances")
+        for _ in range(2):
+            client.get(f"/accounts/{account_id}/balances")
+        client.get("/accounts/999999/balances")
+        response = client.get("/metrics")
+
+    body = response.text
+    assert response.status_code == 200 and response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert REQUEST_STATEMENTS.count("GET", "/accounts/{account_id}/balances") == before + 3
+    series = '{method="GET",route="/accounts/{account_id}/balances",status="200"}'
+    assert f"http_request_duration_seconds_count{series}" in body
+    assert 'route="/accounts/{account_id}/balances",status="404",le="+Inf"}' in body
+    assert 'db_pool_checked_out{engine="primary"}' in body and 'db_pool_checkouts_total{engine="read"}' in body
+    assert IMPORT_ROWS.value("transactions") == rows_before + 1
+    assert 'import_jobs_total{import_type="transactions",status="completed"}' in body
+
+
+def test_requests_over_the_query_budget_are_flagged(db, caplog):
+    probe = FastAPI()
+
+    @probe.get("/items/{item_id}")
+    def item(item_id: int):
+        with SessionLocal() as session:
+            for _ in range(3):
+                session.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    probe.add_middleware(MetricsMiddleware, query_budget=2)
+    flagged = OVER_QUERY_BUDGET.value("GET", "/items/{item_id}")
+    with caplog.at_level(logging.WARNING, logger="app.core.metrics"), TestClient(probe) as client:
+        client.get("/items/1")
+
+    assert OVER_QUERY_BUDGET.value("GET", "/items/{item_id}") == flagged + 1
+    assert "ran 3 SQL statements (budget 2)" in caplog.text
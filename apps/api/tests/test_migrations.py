@@ -0,0 +1,118 @@
+from sqlalchemy import create_engine, func, inspect, select, text
+from sqlalchemy.orm import Session
+
+from app.db.migrations import migration_files, pending_migrations, run_migrations
+from app.models.transaction import Transaction
+from app.services.csv_import import process_csv_import
+
+
+def test_sqlite_migrations_upgrade_an_old_schema_once(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        # accounts as created before Plaid ids existed
+        connection.execute(
+            text(
+                "CREATE TABLE accounts (id INTEGER PRIMARY KEY, institution_id INTEGER, name VARCHAR(120) NOT NULL, "
+                "account_type VARCHAR(50) NOT NULL, currency VARCHAR(8) NOT NULL, current_balance NUMERIC(14, 2) NOT NULL, "
+                "is_active BOOLEAN NOT NULL, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO accounts (name, account_type, currency, current_balance, is_active, created_at, updated_at) "
+                "VALUES ('Checking', 'checking', 'USD', 10, 1, '2026-01-01', '2026-01-01')"
+            )
+        )
+
+    applied = run_migrations(engine)
+
+    inspector = inspect(engine)
+    assert applied == list(migration_files())
+    assert {"plaid_account_id", "plaid_item_id"} <= {column["name"] for column in inspector.get_columns("accounts")}
+    assert "ix_accounts_plaid_account_id" in {index["name"] for index in inspector.get_indexes("accounts")}
+    assert inspector.has_table("transactions") and inspector.has_table("transactions_fts")
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT name FROM accounts")).scalar() == "Checking"
+    assert pending_migrations(engine) == []
+    assert run_migrations(engine) == []
+    engine.dispose()
+
+
+def test_sqlite_migrations_add_progress_columns_to_existing_import_jobs(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        # import_jobs as created before progress tracking
+        connection.execute(
+            text(
+                "CREATE TABLE import_jobs (id INTEGER PRIMARY KEY, source_name VARCHAR(120) NOT NULL, "
+                "import_type VARCHAR(60) NOT NULL, status VARCHAR(40) NOT NULL, message TEXT, "
+                "created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO import_jobs (source_name, import_type, status, created_at, updated_at) "
+                "VALUES ('march.csv', 'transactions', 'completed', '2026-01-01', '2026-01-01')"
+            )
+        )
+
+    run_migrations(engine)
+
+    with engine.connect() as connection:
+        row = connection.execute(
+            text("SELECT status, rows_processed, rows_rejected, rows_duplicate, rows_total FROM import_jobs")
+        ).one()
+    assert tuple(row) == ("completed", 0, 0, 0, None)
+    engine.dispose()
+
+
+def test_sqlite_upgrade_fingerprints_existing_transactions_so_re_imports_dedupe(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        # accounts and transactions as created before fingerprints and Plaid ids existed
+        connection.execute(
+            text(
+                "CREATE TABLE accounts (id INTEGER PRIMARY KEY, institution_id INTEGER, name VARCHAR(120) NOT NULL, "
+                "account_type VARCHAR(50) NOT NULL, currency VARCHAR(8) NOT NULL, current_balance NUMERIC(14, 2) NOT NULL, "
+                "is_active BOOLEAN NOT NULL, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+            )
+        )
+        connection.execute(
+            text(
+                "CREATE TABLE transactions (id INTEGER PRIMARY KEY, account_id INTEGER NOT NULL, "
+                "transaction_date DATE NOT NULL, description VARCHAR(255) NOT NULL, amount NUMERIC(14, 2) NOT NULL, "
+                "category VARCHAR(80), merchant VARCHAR(120), notes TEXT, "
+                "created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL, "
+                "updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO accounts (name, account_type, currency, current_balance, is_active, created_at, updated_at) "
+                "VALUES ('Card', 'credit_card', 'USD', 0, 1, '2026-01-01', '2026-01-01')"
+            )
+        )
+        # Two real same-day coffees and a lunch, loaded from a statement before the upgrade.
+        for description, amount in [("Coffee", -4.5), ("Coffee", -4.5), ("Lunch", -12)]:
+            connection.execute(
+                text(
+                    "INSERT INTO transactions (account_id, transaction_date, description, amount, created_at, updated_at) "
+                    "VALUES (1, '2024-03-01', :description, :amount, '2026-01-01', '2026-01-01')"
+                ),
+                {"description": description, "amount": amount},
+            )
+
+    run_migrations(engine)
+
+    statement = (
+        "account_id,transaction_date,description,amount\n"
+        "1,2024-03-01,Coffee,-4.50\n"
+        "1,2024-03-01,coffee ,-4.50\n"
+        "1,2024-03-01,Lunch,-12.00\n"
+        "1,2024-03-02,Taxi,-20.00\n"
+    ).encode()
+    with Session(engine) as db:
+        job = process_csv_import(db, statement, "transactions", "card.csv")
+        assert (job.status, job.rows_processed, job.rows_duplicate) == ("completed", 1, 3)
+        assert db.scalar(select(func.count()).select_from(Transaction)) == 4
+    engine.dispose()
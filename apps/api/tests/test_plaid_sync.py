@@ -0,0 +1,250 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from types import SimpleNamespace
+
+import plaid
+import pytest
+
+from app.db.session import SessionLocal
+from app.models.account import Account, Institution
+from app.models.plaid_item import PlaidItem
+from app.models.rollup import SpendingRollup
+from app.models.transaction import Transaction
+from app.services import plaid_provider
+
+
+class StubPlaidClient:
+    """Stands in for plaid_api.PlaidApi; serves canned responses per access token."""
+
+    def __init__(self, accounts_by_token=None, failures=None, sync_pages=None):
+        self.accounts_by_token = accounts_by_token or {}
+        self.failures = failures or {}
+        self.sync_pages = sync_pages or {}
+        self.calls = []
+
+    def accounts_get(self, request, _request_timeout=None):
+        token = request.access_token
+        self.calls.append(token)
+        if self.failures.get(token):
+            self.failures[token] -= 1
+            raise plaid.ApiException(status=503, reason="Service Unavailable")
+        return SimpleNamespace(accounts=self.accounts_by_token[token])
+
+    def transactions_sync(self, request, _request_timeout=None):
+        cursor = request.get("cursor")
+        self.calls.append((request.access_token, cursor))
+        return self.sync_pages[(request.access_token, cursor)]
+
+
+def _remote_account(account_id, name, current):
+    return SimpleNamespace(account_id=account_id, name=name, balances=SimpleNamespace(current=current))
+
+
+@pytest.fixture
+def stub_client(monkeypatch):
+    def install(client):
+        monkeypatch.setattr(plaid_provider, "_get_plaid_client", lambda: client)
+        monkeypatch.setattr(plaid_provider, "RETRY_BASE_DELAY", 0)
+        return client
+
+    return install
+
+
+def _link(db, item_id, institution_name, accounts):
+    institution = Institution(name=institution_name, institution_type="bank")
+    db.add(institution)
+    db.flush()
+    db.add(
+        PlaidItem(
+            item_id=item_id,
+            institution_id=institution.id,
+            institution_name=institution_name,
+            access_token_encrypted=f"token-{item_id}",
+        )
+    )
+    for name, account_type in accounts:
+        db.add(Account(institution_id=institution.id, name=name, account_type=account_type, current_balance=0))
+    db.commit()
+
+
+def test_sync_fetches_items_concurrently_and_retries_transient_errors(db, stub_client):
+    _link(db, "item-a", "Bank A", [("Checking", "checking")])
+    _link(db, "item-b", "Bank B", [("Sapphire", "credit_card")])
+    _link(db, "item-c", "Bank C", [("Savings", "savings")])
+    client = stub_client(
+        StubPlaidClient(
+            {
+                "token-item-a": [_remote_account("pa-1", "Checking", 120.5)],
+                "token-item-b": [_remote_account("pb-1", "Sapphire", 300)],
+                "token-item-c": [],
+            },
+            failures={"token-item-b": 1, "token-item-c": 99},
+        )
+    )
+
+    result = plaid_provider.sync_plaid_accounts(db)
+
+    assert result["accounts_updated"] == 2
+    assert [error["item_id"] for error in result["errors"]] == ["item-c"]
+    assert client.calls.count("token-item-b") == 2
+    balances = {account.name: float(account.current_balance) for account in db.query(Account)}
+    assert balances == {"Checking": 120.5, "Sapphire": -300.0, "Savings": 0.0}
+
+
+def test_sync_matches_renamed_accounts_by_plaid_account_id(db, stub_client):
+    _link(db, "item-a", "Bank A", [("Checking", "checking"), ("Savings", "savings")])
+    client = stub_client(
+        StubPlaidClient(
+            {"token-item-a": [_remote_account("pa-1", "Checking", 10), _remote_account("pa-2", "Savings", 20)]}
+        )
+    )
+    plaid_provider.sync_plaid_accounts(db)
+    client.accounts_by_token["token-item-a"] = [
+        _remote_account("pa-1", "Everyday Checking", 15),
+        _remote_account("pa-2", "Checking", 25),
+    ]
+
+    result = plaid_provider.sync_plaid_accounts(db)
+
+    assert result["accounts_updated"] == 2
+    accounts = {account.name: account for account in db.query(Account)}
+    assert accounts["Checking"].plaid_account_id == "pa-1"
+    assert float(accounts["Checking"].current_balance) == 15.0
+    assert float(accounts["Savings"].current_balance) == 25.0
+
+
+def _txn(transaction_id, account_id, day, name, amount, merchant=None, primary=None):
+    return SimpleNamespace(
+        transaction_id=transaction_id,
+        account_id=account_id,
+        date=day,
+        name=name,
+        amount=amount,
+        merchant_name=merchant,
+        personal_finance_category=SimpleNamespace(primary=primary) if primary else None,
+        category=None,
+    )
+
+
+def _page(added=(), modified=(), removed=(), next_cursor=None, has_more=False, accounts=None):
+    return SimpleNamespace(
+        added=list(added),
+        modified=list(modified),
+        removed=[SimpleNamespace(transaction_id=txn_id) for txn_id in removed],
+        accounts=accounts or [_remote_account("pa-1", "Checking", 0)],
+        next_cursor=next_cursor,
+        has_more=has_more,
+    )
+
+
+def test_transactions_sync_applies_only_deltas_since_the_stored_cursor(db, stub_client):
+    _link(db, "item-a", "Bank A", [("Checking", "checking")])
+    token = "token-item-a"
+    client = stub_client(
+        StubPlaidClient(
+            sync_pages={
+                (token, None): _page(
+                    added=[
+                        _txn("t1", "pa-1", date(2024, 3, 1), "Coffee", 4.5, "Blue Bottle", "FOOD_AND_DRINK"),
+                        _txn("t2", "pa-1", date(2024, 3, 2), "Payroll", -2000),
+                    ],
+                    next_cursor="c1",
+                    has_more=True,
+                ),
+                (token, "c1"): _page(added=[_txn("t3", "pa-1", date(2024, 3, 3), "Taxi", 20)], next_cursor="c2"),
+                (token, "c2"): _page(
+                    modified=[_txn("t1", "pa-1", date(2024, 3, 1), "Coffee", 5.25, "Blue Bottle", "FOOD_AND_DRINK")],
+                    removed=["t3"],
+                    next_cursor="c3",
+                ),
+            }
+        )
+    )
+
+    first = plaid_provider.sync_plaid_transactions(db)
+    second = plaid_provider.sync_plaid_transactions(db)
+
+    assert (first["added"], first["errors"]) == (3, [])
+    assert (second["modified"], second["removed"]) == (1, 1)
+    assert [call[1] for call in client.calls] == [None, "c1", "c2"]
+    assert db.query(PlaidItem).one().transactions_cursor == "c3"
+    rows = {row.external_id: row for row in db.query(Transaction)}
+    assert sorted(rows) == ["t1", "t2"]
+    assert float(rows["t1"].amount) == -5.25
+    assert (rows["t1"].merchant, rows["t2"].amount) == ("Blue Bottle", 2000)
+    assert rows["t1"].category == "food_and_drink"
+    spending = {(r.category, r.merchant): (float(r.outflow), r.transaction_count) for r in db.query(SpendingRollup)}
+    assert spending == {("food_and_drink", "Blue Bottle"): (5.25, 1), ("", ""): (0.0, 1)}
+
+
+def test_transactions_sync_creates_new_accounts_and_holds_the_cursor_on_unknown_ones(db, stub_client):
+    _link(db, "item-a", "Bank A", [("Checking", "checking")])
+    token = "token-item-a"
+    accounts = [_remote_account("pa-1", "Checking", 0), _remote_account("pa-2", "New Savings", 50)]
+    stub_client(
+        StubPlaidClient(
+            sync_pages={
+                (token, None): _page(
+                    added=[
+                        _txn("t1", "pa-1", date(2024, 3, 1), "Coffee", 4.5),
+                        _txn("t2", "pa-2", date(2024, 3, 1), "Interest", -1),
+                    ],
+                    next_cursor="c1",
+                    has_more=True,
+                    accounts=accounts,
+                ),
+                # t1 comes back modified on a later page of the same sync.
+                (token, "c1"): _page(
+                    modified=[_txn("t1", "pa-1", date(2024, 3, 1), "Coffee", 5)],
+                    next_cursor="c2",
+                    accounts=accounts,
+                ),
+                (token, "c2"): _page(
+                    added=[_txn("t3", "pa-3", date(2024, 3, 2), "Ghost", 1)], next_cursor="c3", accounts=accounts
+                ),
+            }
+        )
+    )
+
+    first = plaid_provider.sync_plaid_transactions(db)
+    second = plaid_provider.sync_plaid_transactions(db)
+
+    assert (first["skipped"], second["skipped"]) == (0, 1)
+    assert db.query(PlaidItem).one().transactions_cursor == "c2"
+    assert db.query(Account).filter(Account.plaid_account_id == "pa-2").one().name == "New Savings"
+    rows = {row.external_id: float(row.amount) for row in db.query(Transaction)}
+    assert rows == {"t1": -5.0, "t2": 1.0}
+    assert sum(row.transaction_count for row in db.query(SpendingRollup)) == 2
+
+
+def test_concurrent_transaction_syncs_of_one_item_apply_its_deltas_once(db, stub_client):
+    _link(db, "item-a", "Bank A", [("Checking", "checking")])
+    both_fetched = threading.Barrier(2)
+
+    class RacingClient(StubPlaidClient):
+        def transactions_sync(self, request, _request_timeout=None):
+            # Both syncs read the same stored cursor before either applies its deltas.
+            both_fetched.wait(timeout=5)
+            return super().transactions_sync(request, _request_timeout)
+
+    stub_client(
+        RacingClient(
+            sync_pages={
+                ("token-item-a", None): _page(
+                    added=[_txn("t1", "pa-1", date(2024, 3, 1), "Coffee", 4.5, "Blue Bottle")], next_cursor="c1"
+                )
+            }
+        )
+    )
+
+    def sync():
+        with SessionLocal() as session:
+            return plaid_provider.sync_plaid_transactions(session)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(lambda _: sync(), range(2)))
+
+    assert sorted(result["added"] for result in results) == [0, 1]
+    assert db.query(PlaidItem).one().transactions_cursor == "c1"
+    assert [(float(r.outflow), r.transaction_count) for r in db.query(SpendingRollup)] == [(4.5, 1)]
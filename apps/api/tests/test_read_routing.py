@@ -0,0 +1,39 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from app.db.session import ReadSessionLocal, engine, read_engine
+from app.main import app
+
+
+def test_read_routes_use_the_read_only_pool(db):
+    assert read_engine is not engine
+    reads = []
+
+    def record(_conn, _cursor, statement, *_args):
+        reads.append(statement)
+
+    event.listen(read_engine, "before_cursor_execute", record)
+    try:
+        with TestClient(app) as client:
+            client.post("/accounts", json={"name": "Checking", "account_type": "checking", "current_balance": 25})
+            reads.clear()
+            accounts = client.get("/accounts").json()
+            summary = client.get("/dashboard/summary").json()
+    finally:
+        event.remove(read_engine, "before_cursor_execute", record)
+
+    assert [account["name"] for account in accounts] == ["Checking"]
+    assert summary["total_cash"] == 25.0
+    assert any("FROM accounts" in statement for statement in reads)
+
+
+def test_sqlite_profile_pragmas(db):
+    with ReadSessionLocal() as session:
+        assert session.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert session.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert session.execute(text("PRAGMA query_only")).scalar() == 1
+        with pytest.raises(OperationalError):
+            session.execute(text("DELETE FROM accounts"))
+    assert db.execute(text("PRAGMA query_only")).scalar() == 0
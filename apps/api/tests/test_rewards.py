@@ -0,0 +1,105 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.reward import Recommendation, RewardRule
+from app.services.data_versions import REWARDS, bump_versions
+from app.services.csv_import import process_csv_import
+from app.services.recommendation import reward_index
+
+
+def _card(client, name):
+    return client.post("/accounts", json={"name": name, "account_type": "credit_card"}).json()["id"]
+
+
+def test_best_card_index_follows_rule_and_offer_writes(db):
+    reward_index.invalidate()
+    with TestClient(app) as client:
+        travel_card = _card(client, "Travel Card")
+        cash_card = _card(client, "Cash Card")
+        client.post("/rewards/rules", json={"account_id": travel_card, "category": "Travel", "multiplier": 3})
+        client.post("/rewards/rules", json={"account_id": cash_card, "category": "travel", "multiplier": 2})
+
+        first = client.get("/recommendations/best-card", params={"category": "travel", "amount": 200}).json()
+        client.post("/rewards/offers", json={"account_id": cash_card, "title": "Summer", "category": "travel", "bonus_multiplier": 1.5})
+        second = client.get("/recommendations/best-card", params={"category": "travel", "amount": 200}).json()
+        client.post("/rewards/offers", json={"account_id": travel_card, "title": "Any spend", "bonus_multiplier": 1})
+        third = client.get("/recommendations/best-card", params={"category": "travel", "amount": 200}).json()
+        missing = client.get("/recommendations/best-card", params={"category": "groceries"})
+
+    assert (first["card_name"], first["expected_return"]) == ("Travel Card", 600.0)
+    assert (second["card_name"], second["expected_return"]) == ("Cash Card", 700.0)
+    assert (third["card_name"], third["expected_return"]) == ("Travel Card", 800.0)
+    assert missing.status_code == 404
+
+
+def test_best_card_index_reloads_after_writes_from_another_worker(db):
+    reward_index.invalidate()
+    with TestClient(app) as client:
+        travel_card = _card(client, "Travel Card")
+        cash_card = _card(client, "Cash Card")
+        client.post("/rewards/rules", json={"account_id": travel_card, "category": "travel", "multiplier": 2})
+        first = client.get("/recommendations/best-card", params={"category": "travel"}).json()
+
+        # Written the way another worker would: the index in this process is never told.
+        db.add(RewardRule(account_id=cash_card, category="travel", multiplier=4))
+        bump_versions(db, REWARDS)
+        db.commit()
+        second = client.get("/recommendations/best-card", params={"category": "travel"}).json()
+
+    assert (first["card_name"], second["card_name"]) == ("Travel Card", "Cash Card")
+
+
+def test_batch_recommendations_keep_input_order(db):
+    reward_index.invalidate()
+    with TestClient(app) as client:
+        card = _card(client, "Everyday Card")
+        client.post("/rewards/rules", json={"account_id": card, "category": "groceries", "multiplier": 3})
+        client.post("/rewards/rules", json={"account_id": card, "category": "gas", "multiplier": 2})
+
+        response = client.post(
+            "/recommendations/best-card/batch",
+            json={
+                "items": [
+                    {"category": "gas", "amount": 40},
+                    {"category": "jewelry", "amount": 500},
+                    {"category": " Groceries ", "amount": 120.5},
+                ]
+            },
+        )
+
+    assert response.status_code == 200
+    gas, jewelry, groceries = response.json()
+    assert (gas["category"], gas["expected_return"]) == ("gas", 80.0)
+    assert jewelry is None
+    assert (groceries["category"], groceries["expected_return"]) == ("groceries", 361.5)
+
+
+def test_reward_replay_totals_missed_rewards(db):
+    reward_index.invalidate()
+    with TestClient(app) as client:
+        travel_card = _card(client, "Travel Card")
+        cash_card = _card(client, "Cash Card")
+        client.post("/rewards/rules", json={"account_id": travel_card, "category": "travel", "multiplier": 3})
+        client.post("/rewards/rules", json={"account_id": cash_card, "category": "travel", "multiplier": 1})
+        client.post("/rewards/rules", json={"account_id": cash_card, "category": "dining", "multiplier": 2})
+        content = (
+            "account_id,transaction_date,description,amount,category\n"
+            f"{cash_card},2024-01-05,Flight,-100.00,Travel\n"
+            f"{travel_card},2024-01-20,Hotel,-200.00,travel\n"
+            f"{travel_card},2024-02-02,Dinner,-50.00,dining\n"
+            f"{travel_card},2024-02-03,Refund,25.00,dining\n"
+            f"{cash_card},2024-02-04,Books,-10.00,books\n"
+        ).encode()
+        process_csv_import(db, content, "transactions", "ledger.csv")
+
+        report = client.post("/analytics/reward-replay", params={"persist": True}).json()
+
+    assert (report["transactions"], report["reward_earned"], report["reward_optimal"]) == (3, 700.0, 1000.0)
+    assert report["reward_missed"] == 300.0
+    assert [(m["month"], m["reward_missed"]) for m in report["by_month"]] == [("2024-01", 200.0), ("2024-02", 100.0)]
+    assert {c["category"]: c["best_card_name"] for c in report["by_category"]} == {
+        "dining": "Cash Card",
+        "travel": "Travel Card",
+    }
+    assert {c["card_name"]: c["reward_missed"] for c in report["by_card"]} == {"Cash Card": 200.0, "Travel Card": 100.0}
+    assert {(r.category, r.account_id) for r in db.query(Recommendation)} == {("dining", cash_card), ("travel", travel_card)}
@@ -0,0 +1,59 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.rollup import SpendingRollup
+from app.services.csv_import import process_csv_import
+from app.services.spending import rebuild_spending
+
+LEDGER = [
+    ("2024-01-05", -40.00, "groceries", "Safeway"),
+    ("2024-01-20", -10.00, "groceries", "Safeway"),
+    ("2024-01-25", 2000.00, "", ""),
+    ("2024-02-03", -60.00, "groceries", "Trader Joe's"),
+    ("2024-02-14", -80.00, "dining", "Nopa"),
+    ("2024-03-02", -15.00, "dining", ""),
+    ("2024-03-28", -5.00, "groceries", "Safeway"),
+]
+
+
+def _import(db, account_id, rows):
+    lines = [f"{account_id},{day},Purchase {i},{amount},{category},{merchant}" for i, (day, amount, category, merchant) in enumerate(rows)]
+    content = "account_id,transaction_date,description,amount,category,merchant\n" + "\n".join(lines)
+    process_csv_import(db, content.encode(), "transactions", "bank.csv")
+
+
+def _by_brute_force(start, end, key):
+    totals = {}
+    for day, amount, category, merchant in LEDGER:
+        if start <= date.fromisoformat(day) <= end and amount < 0:
+            name = key(day, category, merchant)
+            totals[name] = round(totals.get(name, 0.0) - amount, 2)
+    return totals
+
+
+def test_spending_is_served_from_the_rollup_for_any_date_range(db):
+    with TestClient(app) as client:
+        account = client.post("/accounts", json={"name": "Checking", "account_type": "checking"}).json()["id"]
+        _import(db, account, LEDGER[:4])
+        _import(db, account, LEDGER[4:])
+
+        by_category = client.get("/analytics/spending?group_by=category").json()
+        partial = client.get("/analytics/spending?group_by=month&group_by=category&from=2024-01-10&to=2024-03-15").json()
+        safeway = client.get("/analytics/spending?group_by=merchant&category=groceries&merchant=Safeway").json()
+        bad = client.get("/analytics/spending?group_by=weekday")
+
+    assert db.query(SpendingRollup).count() == 6
+    assert {row["category"]: row["outflow"] for row in by_category} == {"groceries": 115.0, "dining": 95.0, None: 0.0}
+    assert next(row for row in by_category if row["category"] is None)["inflow"] == 2000.0
+    assert {(row["month"], row["category"]): row["outflow"] for row in partial if row["outflow"]} == _by_brute_force(
+        date(2024, 1, 10), date(2024, 3, 15), lambda day, category, _: (day[:7], category)
+    )
+    assert [(row["merchant"], row["outflow"], row["transaction_count"]) for row in safeway] == [("Safeway", 55.0, 3)]
+    assert bad.status_code == 400
+
+    incremental = sorted((r.account_id, r.month, r.category, r.merchant, float(r.amount), r.transaction_count) for r in db.query(SpendingRollup))
+    rebuild_spending(db)
+    rebuilt = sorted((r.account_id, r.month, r.category, r.merchant, float(r.amount), r.transaction_count) for r in db.query(SpendingRollup))
+    assert rebuilt == incremental
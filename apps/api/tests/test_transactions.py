@@ -0,0 +1,71 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.csv_import import process_csv_import
+
+
+def _pages(client, url):
+    rows, cursor = [], None
+    while True:
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        assert response.status_code == 200
+        rows.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return rows
+
+
+def test_transactions_page_newest_first_with_filters(db):
+    with TestClient(app) as client:
+        account = client.post("/accounts", json={"name": "Checking", "account_type": "checking"}).json()
+        lines = [
+            f"{account['id']},2024-03-{day:02d},Purchase {day},-{day}.00,{'food' if day % 2 else 'travel'},Shop"
+            for day in range(1, 8)
+        ]
+        lines.append(f"{account['id']},2024-03-07,Second on the 7th,-70.00,food,Shop")
+        content = ("account_id,transaction_date,description,amount,category,merchant\n" + "\n".join(lines)).encode()
+        process_csv_import(db, content, "transactions", "bank.csv")
+
+        everything = _pages(client, "/transactions?limit=3")
+        food = _pages(client, "/transactions?limit=2&category=food&from=2024-03-02&max_amount=-4")
+        bad = client.get("/transactions?cursor=not-a-cursor")
+
+    assert [row["transaction_date"] for row in everything] == [f"2024-03-{day:02d}" for day in (7, 7, 6, 5, 4, 3, 2, 1)]
+    assert len({row["id"] for row in everything}) == 8
+    assert [row["amount"] for row in food] == [-70.0, -7.0, -5.0]
+    assert bad.status_code == 400
+
+
+def test_accounts_page_by_id(db):
+    with TestClient(app) as client:
+        for name in "ABCDE":
+            client.post("/accounts", json={"name": name, "account_type": "checking"})
+        first = client.get("/accounts?limit=2")
+        rest = client.get(f"/accounts?limit=10&after_id={first.headers['X-Next-Cursor']}")
+
+    assert [row["name"] for row in first.json()] == ["A", "B"]
+    assert [row["name"] for row in rest.json()] == ["C", "D", "E"]
+    assert "X-Next-Cursor" not in rest.headers
+
+
+def test_search_matches_word_prefixes_across_fields(db):
+    with TestClient(app) as client:
+        account = client.post("/accounts", json={"name": "Checking", "account_type": "checking"}).json()
+        lines = [
+            f"{account['id']},2024-03-01,POS BLUE BOTTLE #12,-4.50,,Blue Bottle Coffee",
+            f"{account['id']},2024-03-02,Coffee beans,-18.00,,Whole Foods",
+            f"{account['id']},2024-03-03,Bottle deposit refund,0.25,,",
+            f"{account['id']},2024-03-04,Café Résumé,-7.00,,",
+        ]
+        content = ("account_id,transaction_date,description,amount,category,merchant\n" + "\n".join(lines)).encode()
+        process_csv_import(db, content, "transactions", "bank.csv")
+
+        coffee = client.get("/transactions/search?q=coff").json()
+        bottle = client.get("/transactions/search?q=blue%20bot").json()
+        accents = client.get("/transactions/search?q=cafe").json()
+        punctuation = client.get('/transactions/search?q="*').json()
+
+    assert sorted(row["description"] for row in coffee) == ["Coffee beans", "POS BLUE BOTTLE #12"]
+    assert [row["description"] for row in bottle] == ["POS BLUE BOTTLE #12"]
+    assert [row["description"] for row in accents] == ["Café Résumé"]
+    assert punctuation == []
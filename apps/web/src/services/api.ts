@@ -5,14 +5,28 @@ const api = axios.create({
   baseURL: import.meta.env.VITE_API_URL ?? "http://localhost:8000",
 });
 
+// Largest page the API serves; list endpoints are paged with after_id and X-Next-Cursor.
+const PAGE_SIZE = 1000;
+
+async function fetchAllPages<T>(path: string): Promise<T[]> {
+  const items: T[] = [];
+  let afterId: string | undefined;
+  do {
+    const response = await api.get<T[]>(path, { params: { limit: PAGE_SIZE, after_id: afterId } });
+    items.push(...response.data);
+    const next = response.headers["x-next-cursor"];
+    afterId = typeof next === "string" && next ? next : undefined;
+  } while (afterId);
+  return items;
+}
+
 export async function fetchSummary(): Promise<DashboardSummary> {
   const { data } = await api.get("/dashboard/summary");
   return data;
 }
 
 export async function fetchAccounts(): Promise<Account[]> {
-  const { data } = await api.get("/accounts");
-  return data;
+  return fetchAllPages<Account>("/accounts");
 }
 
 export async function createAccount(payload: {
@@ -26,8 +40,7 @@ export async function createAccount(payload: {
 }
 
 export async function fetchCards(): Promise<Card[]> {
-  const { data } = await api.get("/cards");
-  return data;
+  return fetchAllPages<Card>("/cards");
 }
 
 export async function createCard(payload: {
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""Latency percentiles and SQL query counts for every API route and for CSV imports. Run from project root:
+
+    python scripts/benchmark.py --sizes small,medium --output benchmarks/baseline.json
+    python scripts/benchmark.py --sizes small,medium --compare benchmarks/baseline.json
+
+Each size runs in a fresh interpreter against its own SQLite file (or BENCH_DATABASE_URL_<SIZE>,
+e.g. an empty Postgres database), filled by scripts/synthetic_data.py. Requests go through
+FastAPI's TestClient, so numbers are server time without network. GET routes behind the response
+cache are measured warm after the first call; pass --cold to clear the cache before every request.
+`--compare` exits non-zero when a route runs more queries than the baseline, or when its p95 is
+slower by more than --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "apps" / "api"))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+DEFAULT_ITERATIONS = 20
+# Routes that scan the whole ledger get fewer iterations.
+HEAVY_ITERATIONS = 3
+CSV_IMPORT_ROWS = 10_000
+# p95 differences below this are noise whatever the ratio.
+NOISE_FLOOR_MS = 2.0
+
+
+@dataclass
+class Context:
+    account_ids: list[int]
+    spending_ids: list[int]
+    job_id: int | None = None
+    counter: int = 0
+
+    def next(self) -> int:
+        self.counter += 1
+        return self.counter
+
+
+@dataclass
+class Case:
+    method: str
+    path: str  # the route's path template, as registered
+    request: Callable = lambda client, ctx: {}  # untimed; returns kwargs for client.request (may set "url")
+    label: str = ""  # tells several cases for one route apart
+    heavy: bool = False
+    after: Callable | None = None  # untimed; e.g. waits for background work to settle
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path}" + (f" [{self.label}]" if self.label else "")
+
+
+def _csv(rows: list[dict]) -> bytes:
+    header = list(rows[0])
+    lines = [",".join(header)] + [",".join(str(row[column] or "") for column in header) for row in rows]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def transactions_csv(ctx: Context, rows: int, seed: int) -> bytes:
+    """A recent-month statement in the import schema, fresh rows for each seed."""
+    import numpy as np
+    from synthetic_data import transaction_columns
+
+    rng = np.random.default_rng(10_000 + seed)
+    first = np.datetime64(date.today() - timedelta(days=30))
+    chunk = transaction_columns(rng, np.array(ctx.spending_ids), first, 30, rows)
+    columns = ("account_id", "transaction_date", "description", "amount", "category", "merchant")
+    return _csv([dict(zip(columns, values)) for values in zip(*(chunk[column] for column in columns))])
+
+
+def _wait_for_import(client, response) -> None:
+    job_id = response.json()["id"]
+    while client.get(f"/imports/{job_id}").json()["status"] in ("queued", "processing"):
+        time.sleep(0.05)
+
+
+def _credit_card_payload(client, ctx: Context) -> dict:
+    account = client.post(
+        "/accounts", json={"name": f"Bench card {ctx.next()}", "account_type": "credit_card", "current_balance": 0}
+    ).json()
+    return {"json": {"account_id": account["id"], "issuer_name": "Chase", "statement_day": 3, "due_day": 25}}
+
+
+def _rule_to_delete(client, ctx: Context) -> dict:
+    rule = client.post("/merchant-rules", json={"pattern": f"delete me {ctx.next()}", "merchant": "Bench"}).json()
+    return {"url": f"/merchant-rules/{rule['id']}"}
+
+
+def cases() -> list[Case]:
+    """Read routes first, so writes don't keep invalidating the response cache under them."""
+    today = date.today()
+    return [
+        Case("GET", "/health"),
+        Case("GET", "/plaid/status"),
+        Case("GET", "/accounts"),
+        Case("GET", "/cards"),
+        Case("GET", "/accounts/balances", lambda client, ctx: {"params": {"account_id": ctx.account_ids[:5]}}),
+        Case(
+            "GET",
+            "/accounts/{account_id}/balances",
+            lambda client, ctx: {"url": f"/accounts/{ctx.account_ids[0]}/balances", "params": {"bucket": "week"}},
+        ),
+        Case("GET", "/dashboard/summary"),
+        Case("GET", "/dashboard/net-worth"),
+        Case("GET", "/dashboard/net-worth/history"),
+        Case("GET", "/due-dates/upcoming"),
+        Case("GET", "/due-dates"),
+        Case("GET", "/analytics/spending", lambda client, ctx: {"params": {"group_by": ["month", "category"]}}),
+        Case("GET", "/transactions"),
+        Case(
+            "GET",
+            "/transactions",
+            lambda client, ctx: {
+                "params": {"account_id": ctx.spending_ids[0], "from": (today - timedelta(days=90)).isoformat()}
+            },
+            label="one account, last 90 days",
+        ),
+        Case("GET", "/transactions/search", lambda client, ctx: {"params": {"q": "blue bottle"}}),
+        Case("GET", "/merchant-rules"),
+        Case("GET", "/recommendations/best-card", lambda client, ctx: {"params": {"category": "dining"}}),
+        Case("GET", "/imports/{job_id}", lambda client, ctx: {"url": f"/imports/{ctx.job_id}"}),
+        Case("GET", "/exports/transactions", heavy=True),
+        Case("GET", "/exports/balances", lambda client, ctx: {"params": {"format": "ndjson"}}, heavy=True),
+        Case("GET", "/metrics"),
+        Case(
+            "POST",
+            "/recommendations/best-card/batch",
+            lambda client, ctx: {"json": {"items": [{"category": "dining"}, {"category": "travel", "amount": 450}] * 50}},
+        ),
+        Case(
+            "POST",
+            "/imports/csv/dry-run",
+            lambda client, ctx: {
+                "files": {"file": ("bench.csv", transactions_csv(ctx, 1000, ctx.next()), "text/csv")},
+                "data": {"import_type": "transactions"},
+            },
+        ),
+        Case(
+            "POST",
+            "/accounts",
+            lambda client, ctx: {"json": {"name": f"Bench {ctx.next()}", "account_type": "checking", "current_balance": 100}},
+        ),
+        Case("POST", "/cards", _credit_card_payload),
+        Case(
+            "POST",
+            "/rewards/rules",
+            lambda client, ctx: {"json": {"account_id": ctx.spending_ids[0], "category": "dining", "multiplier": 3}},
+        ),
+        Case(
+            "POST",
+            "/rewards/offers",
+            lambda client, ctx: {"json": {"account_id": ctx.spending_ids[0], "title": "Bench offer", "merchant": "Costco"}},
+        ),
+        Case(
+            "POST",
+            "/merchant-rules",
+            lambda client, ctx: {"json": {"pattern": f"bench rule {ctx.next()}", "merchant": "Bench"}},
+        ),
+        Case(
+            "PUT",
+            "/merchant-rules",
+            lambda client, ctx: {
+                "json": {"items": [{"pattern": f"bench batch {ctx.next()}", "merchant": "Bench"} for _ in range(100)]}
+            },
+        ),
+        Case("DELETE", "/merchant-rules/{rule_id}", _rule_to_delete),
+        Case(
+            "POST",
+            "/imports/csv",
+            lambda client, ctx: {
+                "files": {"file": ("bench.csv", transactions_csv(ctx, 1000, ctx.next()), "text/csv")},
+                "data": {"import_type": "transactions"},
+            },
+            after=_wait_for_import,
+        ),
+        Case("POST", "/merchant-rules/recategorize", heavy=True),
+        Case("POST", "/analytics/reward-replay", heavy=True),
+    ]
+
+
+# Routes without a case because they call out to a third party.
+SKIPPED_PREFIXES = {"/plaid/": "needs Plaid credentials"}
+
+
+class QueryCounter:
+    """Counts statements on every engine the app uses."""
+
+    def __init__(self, engines):
+        from sqlalchemy import event
+
+        self.count = 0
+        self.engines = list({id(engine): engine for engine in engines}.values())
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *_args) -> None:
+        self.count += 1
+
+
+def _summary(latencies: list[float], queries: list[int]) -> dict:
+    import numpy as np
+
+    ms = np.array(latencies) * 1000
+    return {
+        "iterations": len(latencies),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "max_ms": round(float(ms.max()), 3),
+        "queries": int(np.median(queries)),
+    }
+
+
+def _measure(counter: QueryCounter, iterations: int, prepare: Callable, call: Callable, after: Callable | None) -> dict:
+    latencies, queries, result = [], [], None
+    for _ in range(iterations):
+        arguments = prepare()
+        before = counter.count
+        started = time.perf_counter()
+        result = call(arguments)
+        latencies.append(time.perf_counter() - started)
+        queries.append(counter.count - before)
+        if after:
+            after(result)
+    return {**_summary(latencies, queries), "result": result}
+
+
+def run_worker(size: str, iterations: int, csv_rows: int, cold: bool, output: Path) -> None:
+    """Generate one data set and benchmark against it; runs in its own process (see main)."""
+    from fastapi.routing import APIRoute
+    from fastapi.testclient import TestClient
+    from sqlalchemy import select
+
+    from app.api.caching import response_cache
+    from app.db import session as db_session
+    from app.db.migrations import run_migrations
+    from app.main import app
+    from app.models.account import Account
+    from app.services.csv_import import process_csv_import
+    from synthetic_data import SIZES, generate
+
+    run_migrations(db_session.engine)
+    with db_session.SessionLocal() as db:
+        data = generate(db, SIZES[size])
+        accounts = db.execute(select(Account.id, Account.account_type).order_by(Account.id)).all()
+    ctx = Context(
+        account_ids=[account_id for account_id, _ in accounts],
+        spending_ids=[account_id for account_id, kind in accounts if kind in ("checking", "credit_card")],
+    )
+    counter = QueryCounter([db_session.engine, db_session.read_engine])
+    results: dict = {"data": data, "routes": {}, "skipped": {}, "uncovered": []}
+
+    def import_once(content: bytes):
+        with db_session.SessionLocal() as db:
+            return process_csv_import(db, content, "transactions", "bench.csv")
+
+    imported = _measure(
+        counter,
+        max(1, min(iterations, HEAVY_ITERATIONS)),
+        lambda: transactions_csv(ctx, csv_rows, ctx.next()),
+        import_once,
+        None,
+    )
+    job = imported.pop("result")
+    ctx.job_id = job.id
+    results["process_csv_import"] = {**imported, "rows": csv_rows, "status": job.status}
+
+    with TestClient(app) as client:
+        registered = {
+            (method, route.path)
+            for route in app.routes
+            if isinstance(route, APIRoute) and route.endpoint.__module__.startswith("app.api.")
+            for method in route.methods
+        }
+        covered = set()
+        for case in cases():
+            covered.add((case.method, case.path))
+
+            def prepare(case=case):
+                if cold:
+                    response_cache.clear()
+                return {"url": case.path, **case.request(client, ctx)}
+
+            measured = _measure(
+                counter,
+                min(iterations, HEAVY_ITERATIONS) if case.heavy else iterations,
+                prepare,
+                lambda arguments, case=case: client.request(case.method, **arguments),
+                (lambda response, case=case: case.after(client, response)) if case.after else None,
+            )
+            response = measured.pop("result")
+            results["routes"][case.name] = {**measured, "status": response.status_code}
+
+    for method, path in sorted(registered - covered):
+        reason = next((why for prefix, why in SKIPPED_PREFIXES.items() if path.startswith(prefix)), None)
+        if reason:
+            results["skipped"][f"{method} {path}"] = reason
+        else:
+            results["uncovered"].append(f"{method} {path}")
+    output.write_text(json.dumps(results))
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_sizes(sizes: list[str], iterations: int, csv_rows: int, cold: bool) -> dict:
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "cold": cold,
+        },
+        "sizes": {},
+    }
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix=f"bench_{size}_") as workdir:
+            output = Path(workdir) / "results.json"
+            env = {
+                **os.environ,
+                "DATABASE_URL": os.environ.get(f"BENCH_DATABASE_URL_{size.upper()}", f"sqlite:///{workdir}/bench.db"),
+                "IMPORT_SPOOL_DIR": workdir,
+            }
+            env.pop("READ_DATABASE_URL", None)
+            command = [sys.executable, __file__, "--worker", size, "--iterations", str(iterations)]
+            command += ["--csv-rows", str(csv_rows), "--worker-output", str(output)] + (["--cold"] if cold else [])
+            print(f"[{size}] generating data and running benchmarks...", file=sys.stderr)
+            subprocess.run(command, env=env, cwd=ROOT / "apps" / "api", check=True)
+            report["sizes"][size] = json.loads(output.read_text())
+    return report
+
+
+def print_report(report: dict) -> None:
+    for size, results in report["sizes"].items():
+        data = results["data"]
+        print(f"\n== {size}: {data['transactions']:,} transactions, {data['balance_snapshots']:,} balance snapshots")
+        print(f"{'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'queries':>8}  case")
+        rows = {"process_csv_import" + f" [{results['process_csv_import']['rows']} rows]": results["process_csv_import"]}
+        rows.update(results["routes"])
+        for name, row in rows.items():
+            print(f"{row['p50_ms']:>10.2f} {row['p95_ms']:>10.2f} {row['p99_ms']:>10.2f} {row['queries']:>8}  {name}")
+        for name, reason in results["skipped"].items():
+            print(f"{'skipped':>43}  {name} ({reason})")
+        for name in results["uncovered"]:
+            print(f"{'NO CASE':>43}  {name}")
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """Human-readable regressions of `report` against `baseline`."""
+    regressions = []
+    for size, results in report["sizes"].items():
+        previous = baseline.get("sizes", {}).get(size)
+        if previous is None:
+            continue
+        current_rows = {"process_csv_import": results["process_csv_import"], **results["routes"]}
+        previous_rows = {"process_csv_import": previous["process_csv_import"], **previous["routes"]}
+        for name, row in current_rows.items():
+            before = previous_rows.get(name)
+            if before is None:
+                continue
+            if row["queries"] > before["queries"]:
+                regressions.append(f"[{size}] {name}: {before['queries']} -> {row['queries']} queries")
+            if row["p95_ms"] > before["p95_ms"] * threshold and row["p95_ms"] - before["p95_ms"] > NOISE_FLOOR_MS:
+                regressions.append(f"[{size}] {name}: p95 {before['p95_ms']:.2f} -> {row['p95_ms']:.2f} ms")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark API routes and CSV imports on synthetic data.")
+    parser.add_argument("--sizes", default="small", help="comma-separated presets from synthetic_data.SIZES")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--csv-rows", type=int, default=CSV_IMPORT_ROWS, help="rows per process_csv_import run")
+    parser.add_argument("--cold", action="store_true", help="clear the response cache before every request")
+    parser.add_argument("--output", type=Path, help="write results here, e.g. a new baseline")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="allowed p95 slowdown ratio (default 1.25)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.iterations, args.csv_rows, args.cold, args.worker_output)
+        return
+
+    report = run_sizes([size.strip() for size in args.sizes.split(",") if size.strip()], args.iterations, args.csv_rows, args.cold)
+    print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nWrote {args.output}")
+    if args.compare:
+        regressions = compare(report, json.loads(args.compare.read_text()), args.threshold)
+        print(f"\nCompared with {args.compare}: {len(regressions)} regression(s)")
+        for line in regressions:
+            print(f"  {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
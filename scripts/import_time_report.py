@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Show where the API's cold-start import time goes. Run from project root: python scripts/import_time_report.py
+
+Imports the target module in a fresh interpreter with `-X importtime` and prints the time spent
+in each top-level package (summed self time) and the slowest individual modules.
+"""
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parent.parent / "apps" / "api"
+
+
+def parse_importtime(stderr: str) -> list[tuple[int, int, int, str]]:
+    """(self_us, cumulative_us, depth, module) for each `import time:` line."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("module", nargs="?", default="app.main", help="module to import (default: app.main)")
+    parser.add_argument("--top", type=int, default=15, help="rows per table")
+    args = parser.parse_args()
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {args.module}"],
+        cwd=API_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(result.stderr)
+    rows = parse_importtime(result.stderr)
+
+    # Self times never overlap, so summing them per top-level package attributes the whole total.
+    by_package: dict[str, int] = defaultdict(int)
+    for self_us, _cumulative_us, _depth, name in rows:
+        by_package[name.split(".")[0]] += self_us
+    total_us = sum(by_package.values())
+
+    print(f"import {args.module}: {total_us / 1000:.1f} ms across {len(rows)} modules\n")
+    print(f"{'self ms':>14}  {'share':>6}  package")
+    for package, package_us in sorted(by_package.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"{package_us / 1000:>14.1f}  {package_us / total_us:>6.1%}  {package}")
+
+    print(f"\n{'self ms':>14}  module")
+    for self_us, _cumulative_us, _depth, name in sorted(rows, key=lambda row: -row[0])[: args.top]:
+        print(f"{self_us / 1000:>14.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
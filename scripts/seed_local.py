@@ -8,16 +8,15 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "apps" / "api"))
 
 from sqlalchemy.orm import Session
 
-from app.db import base  # noqa: F401 - loads all models for create_all
+from app.db.migrations import run_migrations
 from app.db.session import SessionLocal, engine
-from app.models.base import Base
 from app.models.account import Account
 from app.models.card import CreditCardDetail
 from app.models.reward import RewardRule
 
 
 def seed():
-    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
     db = SessionLocal()
     try:
         if db.query(Account).count() > 0:
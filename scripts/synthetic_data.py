@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""Generate a synthetic ledger at a chosen scale. Run from project root:
+
+    python scripts/synthetic_data.py --size medium
+    python scripts/synthetic_data.py --size large --transactions 5000000 --years 8
+
+Writes to DATABASE_URL (default: the local SQLite file). Rows go in through bulk inserts in
+date-ordered chunks, then the rollups and the search index are rebuilt once at the end.
+"""
+import argparse
+import sys
+import time
+from dataclasses import asdict, dataclass, replace
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "apps" / "api"))
+
+import numpy as np
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.db.migrations import run_migrations
+from app.db.session import SessionLocal, engine
+from app.models.account import Account, Institution
+from app.models.balance import BalanceSnapshot
+from app.models.card import CreditCardDetail
+from app.models.merchant_rule import MerchantRule
+from app.models.reward import Offer, RewardRule
+from app.models.transaction import Transaction
+from app.services.categorizer import normalize_pattern
+from app.services.data_versions import ACCOUNTS, BALANCES, CARDS, MERCHANT_RULES, REWARDS, TRANSACTIONS, bump_versions
+from app.services.fingerprint import transaction_fingerprints
+from app.services.net_worth import rebuild_net_worth
+from app.services.search import drop_search_triggers, ensure_search_index
+from app.services.spending import rebuild_spending
+from app.services.summary import refresh_dashboard_summary
+
+
+@dataclass(frozen=True)
+class Volumes:
+    institutions: int
+    accounts: int
+    cards: int  # credit_card accounts (with card details), counted within `accounts`
+    reward_rules: int
+    offers: int
+    years: int  # daily balance snapshots per account, and the span transactions are spread over
+    transactions: int
+
+
+SIZES = {
+    "small": Volumes(institutions=3, accounts=8, cards=3, reward_rules=12, offers=10, years=1, transactions=10_000),
+    "medium": Volumes(institutions=8, accounts=40, cards=12, reward_rules=60, offers=50, years=3, transactions=250_000),
+    "large": Volumes(
+        institutions=20, accounts=200, cards=60, reward_rules=300, offers=200, years=5, transactions=2_000_000
+    ),
+}
+
+# (merchant, category, description prefix); roughly a third of rows arrive without a merchant
+# or category so the categorizer has something to do.
+MERCHANTS = [
+    ("Blue Bottle Coffee", "dining", "SQ *BLUE BOTTLE COFFEE"),
+    ("Starbucks", "dining", "STARBUCKS STORE"),
+    ("Chipotle", "dining", "CHIPOTLE ONLINE"),
+    ("Sweetgreen", "dining", "SWEETGREEN"),
+    ("DoorDash", "dining", "DOORDASH*ORDER"),
+    ("Whole Foods", "groceries", "WHOLEFDS MKT"),
+    ("Trader Joe's", "groceries", "TRADER JOE S"),
+    ("Safeway", "groceries", "SAFEWAY STORE"),
+    ("Costco", "groceries", "COSTCO WHSE"),
+    ("Shell", "gas", "SHELL OIL"),
+    ("Chevron", "gas", "CHEVRON"),
+    ("Uber", "travel", "UBER *TRIP"),
+    ("Lyft", "travel", "LYFT *RIDE"),
+    ("United Airlines", "travel", "UNITED AIRLINES"),
+    ("Delta", "travel", "DELTA AIR LINES"),
+    ("Marriott", "travel", "MARRIOTT HOTEL"),
+    ("Airbnb", "travel", "AIRBNB * HM"),
+    ("Amazon", "shopping", "AMZN MKTP US"),
+    ("Target", "shopping", "TARGET T-"),
+    ("Best Buy", "shopping", "BEST BUY"),
+    ("Apple", "shopping", "APPLE.COM/BILL"),
+    ("Netflix", "entertainment", "NETFLIX.COM"),
+    ("Spotify", "entertainment", "SPOTIFY USA"),
+    ("AMC Theatres", "entertainment", "AMC THEATRES"),
+    ("PG&E", "utilities", "PGANDE WEB ONLINE"),
+    ("Comcast", "utilities", "COMCAST CABLE"),
+    ("Verizon", "utilities", "VERIZON WRLS"),
+    ("CVS", "health", "CVS/PHARMACY"),
+    ("Walgreens", "health", "WALGREENS"),
+    ("Equinox", "health", "EQUINOX FITNESS"),
+]
+REWARD_CATEGORIES = sorted({category for _, category, _ in MERCHANTS})
+ISSUERS = ["Chase", "American Express", "Capital One", "Citi", "Discover", "Wells Fargo", "Bank of America"]
+CASH_TYPES = ["checking", "checking", "savings", "investment", "retirement"]
+INCOME_SHARE = 0.03
+UNLABELLED_SHARE = 0.35
+# Transactions per insert chunk. Chunks cover disjoint date ranges, so fingerprint keys
+# (which include the date) can't collide between chunks.
+CHUNK_SIZE = 100_000
+INSERT_BATCH_SIZE = 5000
+
+
+def _insert(db: Session, table, rows: list[dict]) -> None:
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        db.execute(insert(table), rows[start : start + INSERT_BATCH_SIZE])
+
+
+def _columns_to_rows(columns: dict[str, list]) -> list[dict]:
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
+def _generate_accounts(db: Session, rng: np.random.Generator, volumes: Volumes) -> tuple[list[int], list[int], list[int]]:
+    """Returns (all account ids, credit card account ids, spending account ids)."""
+    _insert(
+        db,
+        Institution.__table__,
+        [
+            {"name": f"{ISSUERS[i % len(ISSUERS)]} {i // len(ISSUERS) + 1}", "institution_type": "bank"}
+            for i in range(volumes.institutions)
+        ],
+    )
+    institution_ids = list(db.scalars(select(Institution.id).order_by(Institution.id)))
+    cards = min(volumes.cards, volumes.accounts)
+    account_types = ["credit_card"] * cards + [CASH_TYPES[i % len(CASH_TYPES)] for i in range(volumes.accounts - cards)]
+    _insert(
+        db,
+        Account.__table__,
+        [
+            {
+                "institution_id": institution_ids[i % len(institution_ids)] if institution_ids else None,
+                "name": f"{account_type.replace('_', ' ').title()} {i + 1}",
+                "account_type": account_type,
+                "currency": "USD",
+                "current_balance": 0,
+                "is_active": True,
+            }
+            for i, account_type in enumerate(account_types)
+        ],
+    )
+    accounts = db.execute(select(Account.id, Account.account_type).order_by(Account.id)).all()
+    card_ids = [account_id for account_id, account_type in accounts if account_type == "credit_card"]
+    _insert(
+        db,
+        CreditCardDetail.__table__,
+        [
+            {
+                "account_id": account_id,
+                "issuer_name": ISSUERS[i % len(ISSUERS)],
+                "apr": round(float(rng.uniform(15, 29)), 2),
+                "statement_day": int(rng.integers(1, 28)),
+                "due_day": int(rng.integers(1, 28)),
+                "min_payment_due": round(float(rng.uniform(25, 150)), 2),
+            }
+            for i, account_id in enumerate(card_ids)
+        ],
+    )
+    spending_ids = [account_id for account_id, account_type in accounts if account_type in ("credit_card", "checking")]
+    return [account_id for account_id, _ in accounts], card_ids, spending_ids
+
+
+def _generate_rewards(db: Session, rng: np.random.Generator, volumes: Volumes, card_ids: list[int]) -> None:
+    if not card_ids:
+        return
+    _insert(
+        db,
+        RewardRule.__table__,
+        [
+            {
+                "account_id": card_ids[i % len(card_ids)],
+                "category": REWARD_CATEGORIES[int(rng.integers(len(REWARD_CATEGORIES)))],
+                "multiplier": float(rng.choice([1, 1.5, 2, 3, 4, 5])),
+                "point_currency": "points",
+            }
+            for i in range(volumes.reward_rules)
+        ],
+    )
+    _insert(
+        db,
+        Offer.__table__,
+        [
+            {
+                "account_id": card_ids[int(rng.integers(len(card_ids)))],
+                "title": f"Extra points at {merchant}",
+                "merchant": merchant,
+                "category": category,
+                "bonus_multiplier": float(rng.choice([1, 2, 3])),
+            }
+            for merchant, category, _ in (MERCHANTS[int(rng.integers(len(MERCHANTS)))] for _ in range(volumes.offers))
+        ],
+    )
+    _insert(
+        db,
+        MerchantRule.__table__,
+        [
+            {"pattern": normalize_pattern(prefix), "merchant": merchant, "category": category}
+            for merchant, category, prefix in MERCHANTS
+        ],
+    )
+
+
+def _generate_balances(db: Session, rng: np.random.Generator, volumes: Volumes, account_ids: list[int]) -> int:
+    """A daily random walk per account; current_balance is set to the last point."""
+    end = date.today()
+    days = np.arange(np.datetime64(end - timedelta(days=365 * volumes.years)), np.datetime64(end) + 1)
+    kinds = dict(db.execute(select(Account.id, Account.account_type).where(Account.id.in_(account_ids))).all())
+    latest = []
+    written = 0
+    for account_id in account_ids:
+        if kinds[account_id] == "credit_card":
+            walk = -np.abs(np.cumsum(rng.normal(0, 60, len(days))) - 500)
+        elif kinds[account_id] in ("investment", "retirement"):
+            walk = 20_000 * np.cumprod(1 + rng.normal(0.0003, 0.01, len(days)))
+        else:
+            walk = np.maximum(3000 + np.cumsum(rng.normal(5, 150, len(days))), 0)
+        balances = np.round(walk, 2)
+        _insert(
+            db,
+            BalanceSnapshot.__table__,
+            _columns_to_rows(
+                {
+                    "account_id": [account_id] * len(days),
+                    "snapshot_date": days.astype(object).tolist(),
+                    "balance": balances.tolist(),
+                }
+            ),
+        )
+        latest.append({"id": account_id, "current_balance": float(balances[-1])})
+        written += len(days)
+    db.execute(update(Account), latest)
+    return written
+
+
+def transaction_columns(
+    rng: np.random.Generator, spending_ids: np.ndarray, first_day: np.datetime64, day_count: int, size: int
+) -> dict[str, list]:
+    days = np.sort(first_day + rng.integers(0, day_count, size).astype("timedelta64[D]"))
+    account_ids = rng.choice(spending_ids, size)
+    picks = rng.integers(0, len(MERCHANTS), size)
+    amounts = -np.round(rng.lognormal(3.3, 0.9, size), 2)
+    store_numbers = rng.integers(1, 9999, size)
+    descriptions = np.array(
+        [f"{MERCHANTS[pick][2]} {store:04d}" for pick, store in zip(picks.tolist(), store_numbers.tolist())], dtype=object
+    )
+    merchants = np.array([MERCHANTS[pick][0] for pick in picks.tolist()], dtype=object)
+    categories = np.array([MERCHANTS[pick][1] for pick in picks.tolist()], dtype=object)
+
+    income = rng.random(size) < INCOME_SHARE
+    amounts[income] = np.round(rng.uniform(1500, 4500, int(income.sum())), 2)
+    descriptions[income] = "PAYROLL ACME CORP DIR DEP"
+    merchants[income] = "Acme Corp"
+    categories[income] = "income"
+
+    unlabelled = rng.random(size) < UNLABELLED_SHARE
+    merchants[unlabelled] = None
+    categories[unlabelled] = None
+
+    return {
+        "account_id": account_ids.tolist(),
+        "transaction_date": days.astype(object).tolist(),
+        "description": descriptions.tolist(),
+        "amount": amounts.tolist(),
+        "category": categories.tolist(),
+        "merchant": merchants.tolist(),
+        "fingerprint": transaction_fingerprints(account_ids, days.astype(object), amounts, descriptions).tolist(),
+    }
+
+
+def _generate_transactions(db: Session, rng: np.random.Generator, volumes: Volumes, spending_ids: list[int]) -> int:
+    if not spending_ids or not volumes.transactions:
+        return 0
+    total_days = 365 * volumes.years
+    chunks = max(1, -(-volumes.transactions // CHUNK_SIZE))
+    day_edges = np.linspace(0, total_days, chunks + 1).astype(int)
+    first = np.datetime64(date.today() - timedelta(days=total_days))
+    written = 0
+    for index in range(chunks):
+        size = volumes.transactions // chunks + (1 if index < volumes.transactions % chunks else 0)
+        day_count = max(1, int(day_edges[index + 1] - day_edges[index]))
+        chunk = transaction_columns(rng, np.array(spending_ids), first + int(day_edges[index]), day_count, size)
+        _insert(db, Transaction.__table__, _columns_to_rows(chunk))
+        written += size
+    return written
+
+
+def generate(db: Session, volumes: Volumes, seed: int = 0) -> dict:
+    """Load a full synthetic data set into an empty database and rebuild everything derived from it."""
+    if db.execute(select(Account.id).limit(1)).first():
+        raise RuntimeError("Database already has accounts; generate into an empty database.")
+    rng = np.random.default_rng(seed)
+    timings = {}
+    started = time.perf_counter()
+
+    account_ids, card_ids, spending_ids = _generate_accounts(db, rng, volumes)
+    _generate_rewards(db, rng, volumes, card_ids)
+    timings["accounts_and_rewards"] = time.perf_counter() - started
+
+    mark = time.perf_counter()
+    snapshots = _generate_balances(db, rng, volumes, account_ids)
+    timings["balance_snapshots"] = time.perf_counter() - mark
+
+    db.commit()  # the trigger DDL below runs on its own connection
+
+    mark = time.perf_counter()
+    drop_search_triggers(engine)
+    try:
+        transactions = _generate_transactions(db, rng, volumes, spending_ids)
+        db.commit()
+    finally:
+        # Put the triggers back even when the load fails: once migrations are applied, startup
+        # no longer calls ensure_search_index, so nothing else would repair them. The rollback
+        # releases a failed load's write lock and is a no-op after the commit.
+        db.rollback()
+        ensure_search_index(engine)
+    timings["transactions_and_search_index"] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    rebuild_net_worth(db)
+    rebuild_spending(db)
+    refresh_dashboard_summary(db)
+    bump_versions(db, ACCOUNTS, BALANCES, CARDS, MERCHANT_RULES, REWARDS, TRANSACTIONS)
+    db.commit()
+    timings["rollups"] = time.perf_counter() - mark
+
+    return {
+        "volumes": asdict(volumes),
+        "balance_snapshots": snapshots,
+        "transactions": transactions,
+        "seconds": {name: round(value, 2) for name, value in timings.items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic ledger.")
+    parser.add_argument("--size", choices=SIZES, default="small", help="preset volumes (default: small)")
+    for name in Volumes.__dataclass_fields__:
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, help=f"override the preset's {name}")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    overrides = {name: getattr(args, name) for name in Volumes.__dataclass_fields__ if getattr(args, name) is not None}
+    volumes = replace(SIZES[args.size], **overrides)
+    run_migrations(engine)
+    with SessionLocal() as db:
+        try:
+            report = generate(db, volumes, seed=args.seed)
+        except RuntimeError as exc:
+            sys.exit(str(exc))
+    print(f"Generated {report['transactions']:,} transactions and {report['balance_snapshots']:,} balance snapshots")
+    for step, seconds in report["seconds"].items():
+        print(f"  {step}: {seconds}s")
+
+
+if __name__ == "__main__":
+    main()